@@ -0,0 +1,59 @@
+import json
+import platform
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Dict, List
+
+import pytest
+
+pytest_plugins = ["pytester"]
+
+RESULTS_KEY = pytest.StashKey[List[Dict[str, Any]]]()
+
+
+def pytest_addoption(parser):
+    parser.addoption('--bench-sizes', default='1000',
+                     help='comma separated sizes of the synthetic suites (default: 1000), e.g. 1000,10000,100000')
+    parser.addoption('--bench-noop-reporters', type=int, default=5,
+                     help='number of no-op reporters in the noop_reporters configuration (default: 5)')
+    parser.addoption('--bench-output', default='benchmark-results.json',
+                     help='where the JSON results are written (default: benchmark-results.json)')
+
+
+def pytest_configure(config):
+    config.stash[RESULTS_KEY] = []
+
+
+def pytest_generate_tests(metafunc):
+    if 'size' in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption('bench_sizes').split(',')]
+        metafunc.parametrize('size', sizes, ids=[f'{size}_tests' for size in sizes])
+
+
+@pytest.fixture
+def results(request):
+    return request.config.stash[RESULTS_KEY]
+
+
+def _package_version(name):
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
+
+
+def pytest_unconfigure(config):
+    results = config.stash.get(RESULTS_KEY, [])
+    if not results:
+        return
+    baselines = {r['size']: r['wall_time'] for r in results if r['configuration'] == 'disabled'}
+    for result in results:
+        baseline = baselines.get(result['size'])
+        result['overhead_per_test'] = None if baseline is None else (result['wall_time'] - baseline) / result['size']
+    report = {
+        'python': platform.python_version(),
+        'pytest': _package_version('pytest'),
+        'pytest_stats': _package_version('pytest-stats'),
+        'results': results,
+    }
+    with open(config.getoption('bench_output'), 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
@@ -0,0 +1,78 @@
+from typing import Dict
+
+TESTS_PER_MODULE = 1000
+PARAMS = 10
+
+CONFTEST = '''
+import json
+import os
+import resource
+import sys
+
+import pytest
+
+from pytest_stats.reporters_registry import ResultsReporter
+
+
+class NoopReporter(ResultsReporter):
+    def report_session_start(self, session_data):
+        pass
+
+    def report_session_finish(self, session_data):
+        pass
+
+    def report_test(self, test_data):
+        pass
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'slow: synthetic mark')
+    config.addinivalue_line('markers', 'owner(name): synthetic mark with kwargs')
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_stats_register_reporters(reporters):
+    for _ in range(int(os.getenv('BENCH_NOOP_REPORTERS', '0'))):
+        reporters.register(NoopReporter())
+
+
+def pytest_unconfigure(config):
+    # ru_maxrss is in kilobytes on linux, in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+    with open(os.environ['BENCH_PEAK_RSS_FILE'], 'w', encoding='utf-8') as f:
+        json.dump(peak, f)
+'''
+
+
+def _module(index: int, tests: int) -> str:
+    """ a mix of plain, marked, parametrized, failing and chatty tests """
+    lines = ['import pytest', '']
+    written = number = 0
+    while written < tests:
+        number += 1
+        kind = number % 20
+        if kind == 0 and tests - written >= PARAMS:
+            lines += [f'@pytest.mark.parametrize("value", range({PARAMS}))',
+                      f'def test_param_{index}_{number}(value):', '    assert value >= 0', '']
+            written += PARAMS
+            continue
+        if kind == 1:
+            lines += [f'def test_failing_{index}_{number}():', '    assert 1 == 2', '']
+        elif kind in (2, 3):
+            lines += [f'def test_output_{index}_{number}():', f'    print("output of test {number}" * 5)', '']
+        elif kind in (4, 5, 6):
+            lines += ['@pytest.mark.slow', f'@pytest.mark.owner(name="team{number % 3}")',
+                      f'def test_marked_{index}_{number}():', '    pass', '']
+        else:
+            lines += [f'def test_plain_{index}_{number}():', '    pass', '']
+        written += 1
+    return '\n'.join(lines)
+
+
+def synthetic_suite(size: int) -> Dict[str, str]:
+    """ the test modules of a suite of `size` tests, by module name """
+    modules = {}
+    for index in range(0, size, TESTS_PER_MODULE):
+        modules[f'test_synthetic_{index // TESTS_PER_MODULE}'] = _module(index // TESTS_PER_MODULE,
+                                                                         min(TESTS_PER_MODULE, size - index))
+    return modules
@@ -0,0 +1,40 @@
+import json
+import time
+
+import pytest
+from _pytest.pytester import Pytester
+
+from benchmarks.synthetic_suite import CONFTEST, synthetic_suite
+
+CONFIGURATIONS = {
+    'disabled': ['-p', 'no:pytest_stats'],
+    'installed': [],
+    'default_reporter': ['--collect-stats'],
+    'no_text_reporter': ['--collect-stats', '--disable-default-text-reporter'],
+    'noop_reporters': ['--disable-default-text-reporter'],
+}
+
+
+@pytest.mark.parametrize('configuration', CONFIGURATIONS)
+def test_overhead(pytester: Pytester, monkeypatch, results, size, configuration, request):
+    pytester.makeconftest(CONFTEST)
+    pytester.makepyfile(**synthetic_suite(size))
+    peak_rss_file = pytester.path / 'peak_rss.json'
+    monkeypatch.setenv('BENCH_PEAK_RSS_FILE', str(peak_rss_file))
+    noop_reporters = request.config.getoption('bench_noop_reporters') if configuration == 'noop_reporters' else 0
+    monkeypatch.setenv('BENCH_NOOP_REPORTERS', str(noop_reporters))
+
+    start = time.perf_counter()
+    res = pytester.runpytest_subprocess('-q', '-p', 'no:cacheprovider', *CONFIGURATIONS[configuration])
+    wall_time = time.perf_counter() - start
+
+    outcomes = res.parseoutcomes()
+    assert outcomes.get('passed', 0) + outcomes.get('failed', 0) == size
+    results.append({
+        'size': size,
+        'configuration': configuration,
+        'noop_reporters': noop_reporters,
+        'wall_time': wall_time,
+        'peak_rss': json.loads(peak_rss_file.read_text(encoding='utf-8')),
+        'outcomes': outcomes,
+    })
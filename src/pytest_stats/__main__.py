@@ -0,0 +1,87 @@
+import argparse
+import json
+import math
+import sqlite3
+import sys
+from typing import Any, Dict, List, Optional
+
+from pytest_stats.compare import Comparison, compare, format_comparison, read_sessions
+from pytest_stats.duration_stats import PHASES
+from pytest_stats.history import iter_history
+
+FAIL_ON = ('regressions', 'slowdowns', 'failures', 'never')
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m pytest_stats')
+    commands = parser.add_subparsers(dest='command', required=True)
+    compare_parser = commands.add_parser(
+        'compare', help='compare the test durations and outcomes of recorded sessions')
+    compare_parser.add_argument('paths', nargs='+', metavar='PATH',
+                                help='SQLite databases (--stats-sqlite) or JSON Lines files (--stats-jsonl)')
+    compare_parser.add_argument('--candidate', action='append', metavar='SESSION_ID',
+                                help='a session to compare, default: the latest one. may be given more than once')
+    compare_parser.add_argument('--baseline', action='append', metavar='SESSION_ID',
+                                help='a session to compare against, default: all the others. '
+                                     'may be given more than once')
+    compare_parser.add_argument('--phase', default='total', choices=('total',) + PHASES,
+                                help='the test duration to compare, default: total')
+    compare_parser.add_argument('--threshold', type=float, default=3.0,
+                                help='the t score a slowdown must reach to be significant, when the baseline has more '
+                                     'than one run of the test, default: 3')
+    compare_parser.add_argument('--min-delta', type=float, default=0.1,
+                                help='the seconds a slowdown must take to be significant, default: 0.1')
+    compare_parser.add_argument('--min-ratio', type=float, default=0.2,
+                                help='the fraction of the baseline duration a slowdown must take to be significant, '
+                                     'default: 0.2')
+    compare_parser.add_argument('--top', type=int, default=20, help='the number of tests to list, default: 20')
+    compare_parser.add_argument('--json', action='store_true', help='print the comparison as JSON')
+    compare_parser.add_argument('--fail-on', default='regressions', choices=FAIL_ON,
+                                help='exit with 1 on significant slowdowns, new failures or both (regressions), '
+                                     'default: regressions')
+    return parser
+
+
+def _finite(value: Any) -> Any:
+    """ JSON has no NaN or Infinity - a score or ratio that can't be told becomes null """
+    return value if not isinstance(value, float) or math.isfinite(value) else None
+
+
+def _as_json(comparison: Comparison, top: int) -> Dict[str, Any]:
+    record = comparison._asdict()
+    for field in ('tests', 'modules', 'slowdowns'):
+        record[field] = [{key: _finite(value) for (key, value) in row._asdict().items()} for row in record[field][:top]]
+    return record
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parser().parse_args(argv)
+    try:
+        sessions = read_sessions((record for path in args.paths for record in iter_history(path)), phase=args.phase)
+    except (OSError, ValueError, sqlite3.DatabaseError) as e:
+        print(f'failed to read the history: {e}', file=sys.stderr)
+        return 2
+    if len(sessions) < 2 and not (args.candidate and args.baseline):
+        print(f'expected at least two sessions, found {len(sessions)}', file=sys.stderr)
+        return 2
+    try:
+        comparison = compare(sessions, candidates=args.candidate, baselines=args.baseline, threshold=args.threshold,
+                             min_delta=args.min_delta, min_ratio=args.min_ratio)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    if args.json:
+        print(json.dumps(_as_json(comparison, args.top), allow_nan=False))
+    else:
+        print('\n'.join(format_comparison(comparison, top=args.top)))
+    failed = {
+        'regressions': comparison.slowdowns or comparison.new_failures,
+        'slowdowns': comparison.slowdowns,
+        'failures': comparison.new_failures,
+        'never': False,
+    }[args.fail_on]
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
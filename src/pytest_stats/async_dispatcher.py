@@ -0,0 +1,129 @@
+import logging
+import pickle
+import queue
+import tempfile
+import threading
+from copy import copy
+from typing import TYPE_CHECKING, Callable, Optional, List, IO
+
+from pytest_stats.options import BACKPRESSURE_POLICIES
+
+if TYPE_CHECKING:
+    from pytest_stats.test_item_data import TestItemData
+
+logger = logging.getLogger(__name__)
+
+
+class DispatcherCounters:
+    submitted: int
+    dispatched: int
+    dropped: int
+    spilled: int
+    depth: int
+    max_depth: int
+
+    def __init__(self) -> None:
+        self.submitted = 0
+        self.dispatched = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.depth = 0
+        self.max_depth = 0
+
+    def __str__(self: 'DispatcherCounters') -> str:
+        return f'<{self.__class__.__name__}: {str(vars(self))}>'
+
+
+class AsyncDispatcher:
+    """
+    Hands test results over to worker threads, so a slow reporter doesn't delay the next test.
+    When the queue is full the results are either waited for (block), discarded (drop) or pickled to a temporary
+    file (spill) which is replayed on flush.
+    """
+
+    def __init__(self, dispatch: Callable[['TestItemData'], None], max_size: int = 1000, workers: int = 1,
+                 backpressure: str = 'block') -> None:
+        if backpressure not in BACKPRESSURE_POLICIES:
+            raise ValueError(f'unknown backpressure policy {backpressure}, expected one of {BACKPRESSURE_POLICIES}')
+        self._dispatch = dispatch
+        self._backpressure = backpressure
+        self._queue: 'queue.Queue[Optional[TestItemData]]' = queue.Queue(maxsize=max_size)
+        self._spill_file: Optional[IO[bytes]] = None
+        self._lock = threading.Lock()
+        self.counters = DispatcherCounters()
+        self._threads: List[threading.Thread] = [
+            threading.Thread(target=self._work, name=f'pytest-stats-dispatcher-{i}', daemon=True)
+            for i in range(max(workers, 1))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, test_data: 'TestItemData') -> None:
+        snapshot = copy(test_data)
+        with self._lock:
+            self.counters.submitted += 1
+        if self._backpressure == 'block':
+            self._queue.put(snapshot)
+        else:
+            try:
+                self._queue.put_nowait(snapshot)
+            except queue.Full:
+                self._overflow(snapshot)
+                return
+        with self._lock:
+            self.counters.depth = self._queue.qsize()
+            self.counters.max_depth = max(self.counters.max_depth, self.counters.depth)
+
+    def flush(self) -> None:
+        self._queue.join()
+        self._replay_spilled()
+        self.counters.depth = self._queue.qsize()
+
+    def close(self) -> None:
+        self.flush()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        logger.debug('async dispatcher closed: %s', self.counters)
+
+    def _overflow(self, snapshot: 'TestItemData') -> None:
+        with self._lock:
+            if self._backpressure == 'drop':
+                self.counters.dropped += 1
+                return
+            if self._spill_file is None:
+                self._spill_file = tempfile.TemporaryFile()  # pylint:disable=consider-using-with
+            pickle.dump(snapshot, self._spill_file)
+            self.counters.spilled += 1
+
+    def _replay_spilled(self) -> None:
+        with self._lock:
+            spill_file, self._spill_file = self._spill_file, None
+        if spill_file is None:
+            return
+        with spill_file:
+            spill_file.seek(0)
+            while True:
+                try:
+                    test_data = pickle.load(spill_file)
+                except EOFError:
+                    break
+                self._dispatch(test_data)
+                with self._lock:
+                    self.counters.dispatched += 1
+
+    def _work(self) -> None:
+        while True:
+            test_data = self._queue.get()
+            try:
+                if test_data is None:
+                    return
+                self._dispatch(test_data)
+                with self._lock:
+                    self.counters.dispatched += 1
+            except Exception:  # pylint:disable=broad-exception-caught
+                logger.exception('failed to dispatch %s', test_data)
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,58 @@
+import logging
+import os
+from typing import TYPE_CHECKING
+
+from pytest_stats.default_text_reporter import DefaultTextReporter
+
+if TYPE_CHECKING:
+    from _pytest.config import Config
+    from pytest_stats.reporters_registry import ReportersRegistry
+
+logger = logging.getLogger(__name__)
+
+
+def init_reporters(reporters_registry: 'ReportersRegistry', config: 'Config') -> None:
+    """ adds the builtin reporters to the reporters registered at configure """
+    option = config.option
+    if option.stats_xdist_aggregate and hasattr(config, 'workerinput'):
+        logger.debug('--stats-xdist-aggregate flag was used - reporting through the xdist controller')
+        # the controller's reporters aren't known here
+        reporters_registry.require_fields(None)
+        return
+    if option.use_default_text_reporter:
+        output_path = option.stats_text_report_file
+        reporters_registry.register(DefaultTextReporter(stream=option.stats_text_report_mode == 'stream',
+                                                        output_path=worker_path(output_path) if output_path else None,
+                                                        chunk_size=option.stats_text_report_chunk))
+    else:
+        logger.debug('--disable-default-text-reporter flag was used - not using default reporter')
+    if option.stats_jsonl:
+        from pytest_stats.jsonl_reporter import JsonLinesReporter  # pylint:disable=import-outside-toplevel
+        reporters_registry.register(JsonLinesReporter(
+            worker_path(option.stats_jsonl), flush_every=option.stats_jsonl_flush_every,
+            flush_interval=option.stats_jsonl_flush_interval, fsync=option.stats_jsonl_fsync,
+            max_bytes=option.stats_jsonl_max_bytes, compress=option.stats_jsonl_gzip))
+    if option.stats_sqlite:
+        from pytest_stats.sqlite_reporter import SqliteReporter  # pylint:disable=import-outside-toplevel
+        reporters_registry.register(SqliteReporter(option.stats_sqlite))
+    if option.stats_chrome_trace:
+        from pytest_stats.chrome_trace_reporter import ChromeTraceReporter  # pylint:disable=import-outside-toplevel
+        reporters_registry.register(ChromeTraceReporter(worker_path(option.stats_chrome_trace)))
+    reporters_registry.set_circuit_breaker(max_failures=option.stats_reporter_max_failures,
+                                           latency_budget=option.stats_reporter_latency_budget)
+    reporters_registry.set_batch_window(max_size=option.stats_batch_size, max_interval=option.stats_batch_interval)
+    if option.stats_async_reporting:
+        reporters_registry.enable_async_dispatch(max_size=option.stats_queue_size, workers=option.stats_queue_workers,
+                                                 backpressure=option.stats_backpressure)
+
+
+def worker_path(path: str) -> str:
+    """ xdist workers each get their own file - stats.jsonl becomes stats.gw0.jsonl """
+    worker_id = os.getenv('PYTEST_XDIST_WORKER')
+    if worker_id is None:
+        return path
+    root, ext = os.path.splitext(path)
+    if ext == '.gz':
+        root, inner_ext = os.path.splitext(root)
+        ext = inner_ext + ext
+    return f'{root}.{worker_id}{ext}'
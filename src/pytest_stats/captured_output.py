@@ -0,0 +1,22 @@
+from typing import Iterable, List, Tuple
+
+# section title (e.g. 'Captured stdout call'), captured text
+Section = Tuple[str, str]
+
+
+def truncate_middle(text: str, max_size: int) -> str:
+    """ keeps the head and the tail of the text, max_size 0 keeps all of it """
+    if not max_size or len(text) <= max_size:
+        return text
+    head = max_size // 2
+    tail = max_size - head
+    return f'{text[:head]}\n... [{len(text) - max_size} characters truncated] ...\n{text[len(text) - tail:]}'
+
+
+def capture_sections(sections: Iterable[Section], max_size: int = 0) -> List[Section]:
+    """ the captured sections of a report, every one of them truncated to max_size characters """
+    return [(title, truncate_middle(text, max_size)) for (title, text) in sections]
+
+
+def render_sections(sections: Iterable[Section]) -> str:
+    return '\n'.join(f'----- {title} -----\n{text}' for (title, text) in sections)
@@ -0,0 +1,142 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Generator, List, Optional
+
+import pytest
+from _pytest.config import ExitCode, create_terminal_writer
+
+from pytest_stats.builtin_reporters import init_reporters
+from pytest_stats.jsonl_writer import JsonLinesWriter
+from pytest_stats.sampling import keeps_detail
+from pytest_stats.serialization import item_from_values, item_values, session_record
+from pytest_stats.stash import get_test_item_data, get_test_session_data
+from pytest_stats.test_session_data import TestSessionData
+
+if TYPE_CHECKING:
+    from _pytest.config import Config
+    from _pytest.main import Session
+    from _pytest.nodes import Item
+    from pytest_stats.reporters_registry import ReportersRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class Checkpoint:
+    """
+    Appends the running session to a JSON Lines checkpoint log - its start, every test as it completes and a
+    TestSessionData heartbeat every heartbeat seconds. Every record is flushed to the OS as it's written, so it
+    survives the process being killed.
+    The log is removed once the session finishes - a log that's left behind belongs to a session that died, and
+    recover() replays it through the reporters
+    """
+
+    def __init__(self, path: str, heartbeat: float) -> None:
+        self.path = path
+        self._heartbeat = heartbeat
+        self._writer: Optional[JsonLinesWriter] = None
+        self._session_data: Optional[TestSessionData] = None
+        self._stopped = threading.Event()
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionstart(self, session: 'Session') -> None:
+        if os.path.exists(self.path):
+            os.replace(self.path, f'{self.path}.orphaned')
+            logger.warning('%s was left by a session that did not finish, moved it to %s.orphaned - replay it with '
+                           '--stats-recover', self.path, self.path)
+        self._session_data = get_test_session_data(session)
+        self._writer = JsonLinesWriter(self.path, flush_every=1)
+        self._writer.write(session_record(self._session_data, 'session_start'))
+        if self._heartbeat > 0:
+            threading.Thread(target=self._beat, name='pytest-stats-heartbeat', daemon=True).start()
+
+    @pytest.hookimpl(hookwrapper=True, tryfirst=True)
+    def pytest_runtest_protocol(self, item: 'Item') -> Generator[None, Any, None]:
+        # the outermost wrapper - the collector is done with the test by the time it's written
+        yield
+        test_data = get_test_item_data(item)
+        if self._writer is not None and keeps_detail(item.session, test_data):
+            self._writer.write({'type': 'test', 'values': item_values(test_data)})
+
+    def pytest_keyboard_interrupt(self) -> None:
+        if self._writer is not None:
+            self._writer.write({'type': 'interrupted', 'time': time.time()})
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self) -> None:
+        self._stopped.set()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            os.remove(self.path)
+
+    def _beat(self) -> None:
+        while not self._stopped.wait(self._heartbeat):
+            writer, session_data = self._writer, self._session_data
+            if writer is None or session_data is None:
+                return
+            try:
+                writer.write({**session_record(session_data, 'heartbeat'), 'time': time.time()})
+            except Exception:  # pylint:disable=broad-exception-caught
+                logger.exception('failed to write a heartbeat to %s', self.path)
+
+
+def recover(path: str, registry: 'ReportersRegistry') -> str:
+    """
+    Replays the checkpoint log of a session that died through the reporters, and returns the status it was finished
+    with: INTERRUPTED when the session got a keyboard interrupt, CRASHED otherwise
+    """
+    session_data = TestSessionData()
+    tests: List[List[Any]] = []
+    status = 'CRASHED'
+    last_seen: Optional[float] = None
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record: Dict[str, Any] = json.loads(line)
+            except ValueError:
+                logger.warning('skipping a truncated checkpoint record in %s', path)
+                continue
+            record_type = record.pop('type', None)
+            if record_type in ('session_start', 'heartbeat'):
+                last_seen = record.pop('time', last_seen)
+                for field, value in record.items():
+                    setattr(session_data, field, value)
+            elif record_type == 'test':
+                tests.append(record['values'])
+            elif record_type == 'interrupted':
+                status = 'INTERRUPTED'
+                last_seen = record['time']
+    registry.report_session_start(session_data=session_data)
+    failed = 0
+    for values in tests:
+        test_data = item_from_values(values)
+        failed += test_data.outcome in ('failed', 'error')
+        last_seen = max(last_seen or 0.0, getattr(test_data, 'test_end_protocol', None) or 0.0)
+        registry.report_test(test_data=test_data)
+    registry.flush()
+    session_data.status = status
+    session_data.failed_tests = failed
+    session_data.end_time = last_seen if last_seen is not None else session_data.start_time
+    registry.report_session_finish(session_data=session_data)
+    return status
+
+
+def recover_session(config: 'Config') -> int:
+    """ --stats-recover entry point - replays a checkpoint log through the configured reporters instead of running """
+    path = config.option.stats_recover
+    if not os.path.exists(path):
+        logger.error('no checkpoint log at %s', path)
+        return ExitCode.USAGE_ERROR
+    config._do_configure()  # pylint:disable=protected-access
+    try:
+        registry: 'ReportersRegistry' = config.stash['reporters']  # type: ignore[index]
+        init_reporters(registry, config)
+        status = recover(path, registry)
+    finally:
+        config._ensure_unconfigure()  # pylint:disable=protected-access
+    os.replace(path, f'{path}.recovered')
+    create_terminal_writer(config).line(f'replayed {path} as a {status} session, moved it to {path}.recovered')
+    return ExitCode.OK
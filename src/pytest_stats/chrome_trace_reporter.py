@@ -0,0 +1,96 @@
+import json
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Optional, TextIO
+
+from pytest_stats.reporters_registry import ResultsReporter
+from pytest_stats.serialization import to_json_value
+
+if TYPE_CHECKING:
+    from pytest_stats.test_item_data import TestItemData
+    from pytest_stats.test_session_data import TestSessionData
+
+logger = logging.getLogger(__name__)
+
+_PID = 1
+_PHASES = ('setup', 'call', 'teardown')
+
+
+def _microseconds(seconds: float) -> float:
+    return round(seconds * 1_000_000, 3)
+
+
+class ChromeTraceReporter(ResultsReporter):
+    """
+    Writes the session as Chrome Trace Event JSON (the array format), loadable in Perfetto or chrome://tracing.
+    Every xdist worker gets a track, with a span per test protocol and the setup, call, teardown and fixture spans
+    nested in it, and a 'tests in flight' counter per worker. Events are written as tests are reported, so the trace is
+    never held in memory
+    """
+    required_fields = frozenset({'fixtures'})
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file: Optional[TextIO] = None
+        self._first = True
+        self._tracks: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    def report_session_start(self, session_data: 'TestSessionData') -> None:
+        logger.debug('writing a chrome trace to %s', self.path)
+        self._write({'name': 'process_name', 'ph': 'M', 'pid': _PID,
+                     'args': {'name': f'pytest {session_data.session_id}'}})
+
+    def report_test(self, test_data: 'TestItemData') -> None:
+        worker_id = getattr(test_data, 'xdist_worker_id', None) or 'master'
+        tid = self._track(worker_id)
+        start, end = getattr(test_data, 'test_start_protocol', None), getattr(test_data, 'test_end_protocol', None)
+        if start is not None and end is not None:
+            self._span(tid, test_data.name, category='test', start=start, duration=end - start,
+                       args={'fullname': test_data.fullname, 'outcome': test_data.outcome})
+            self._write({'name': 'tests in flight', 'ph': 'C', 'pid': _PID, 'ts': _microseconds(start),
+                         'args': {worker_id: 1}})
+            self._write({'name': 'tests in flight', 'ph': 'C', 'pid': _PID, 'ts': _microseconds(end),
+                         'args': {worker_id: 0}})
+        for when in _PHASES:
+            phase_start = getattr(test_data, f'test_start_{when}', None)
+            phase_end = getattr(test_data, f'test_end_{when}', None)
+            if phase_start is not None and phase_end is not None:
+                self._span(tid, when, category='phase', start=phase_start, duration=phase_end - phase_start,
+                           args={'result': getattr(test_data, f'result_{when}', None)})
+        for fixture in getattr(test_data, 'fixtures', None) or ():
+            if fixture['start'] is not None and not fixture['cached']:
+                self._span(tid, fixture['name'], category='fixture', start=fixture['start'],
+                           duration=fixture['duration'], args={'scope': fixture['scope'], 'phase': fixture['phase']})
+
+    def report_session_finish(self, session_data: 'TestSessionData') -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write('\n]\n')
+            self._file.close()
+            self._file = None
+
+    def _track(self, worker_id: str) -> int:
+        with self._lock:
+            if worker_id not in self._tracks:
+                self._tracks[worker_id] = len(self._tracks) + 1
+                self._write({'name': 'thread_name', 'ph': 'M', 'pid': _PID, 'tid': self._tracks[worker_id],
+                             'args': {'name': worker_id}})
+            return self._tracks[worker_id]
+
+    def _span(self, tid: int, name: str, *, category: str, start: float, duration: float,
+              args: Dict[str, Any]) -> None:
+        self._write({'name': name, 'cat': category, 'ph': 'X', 'pid': _PID, 'tid': tid, 'ts': _microseconds(start),
+                     'dur': _microseconds(duration), 'args': args})
+
+    def _write(self, event: Dict[str, Any]) -> None:
+        line = json.dumps(event, default=to_json_value)
+        with self._lock:
+            if self._file is None:
+                self._file = open(  # pylint:disable=consider-using-with
+                    self.path, 'w', encoding='utf-8', buffering=1 << 16)
+                self._file.write('[\n')
+                self._first = True
+            self._file.write(line if self._first else ',\n' + line)
+            self._first = False
@@ -0,0 +1,85 @@
+import time
+from typing import TYPE_CHECKING, Any, Dict, Generator, List, Optional
+
+import pytest
+
+from pytest_stats.stash import CONFTEST_LOAD_KEY, get_test_session_data, reporters
+
+if TYPE_CHECKING:
+    from _pytest.main import Session
+    from _pytest.nodes import Collector
+    from _pytest.reports import CollectReport
+
+SLOWEST_COUNT = 5
+
+
+class CollectionProfiler:
+    """
+    Times the collection of every collector (directories, packages, modules and classes) into a record of nodeid,
+    path, node_type, duration, import_duration (modules only), items and outcome. The duration of a collector doesn't
+    include its children, which are collected later.
+    At the end of the collection the records are reported through ResultsReporter.report_collection, and summed up
+    into TestSessionData.collection
+    """
+
+    def __init__(self) -> None:
+        self._collection_start = time.perf_counter()
+        self._start = 0.0
+        self._importing: Optional['Collector'] = None
+        self._import_duration: Optional[float] = None
+        self._records: List[Dict[str, Any]] = []
+
+    def pytest_collectstart(self, collector: 'Collector') -> None:
+        if isinstance(collector, pytest.Session):
+            self._collection_start = time.perf_counter()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_make_collect_report(self, collector: 'Collector') -> Generator[None, Any, None]:
+        if isinstance(collector, pytest.Session):
+            yield
+            return
+        self._importing = collector if isinstance(collector, pytest.Module) else None
+        self._import_duration = None
+        self._start = time.perf_counter()
+        outcome = yield
+        duration = time.perf_counter() - self._start
+        report: 'CollectReport' = outcome.get_result()
+        if self._importing is not None:
+            # a module that made no items (e.g. it failed to import) spent its whole collection importing
+            self._import_duration = duration
+            self._importing = None
+        self._records.append({
+            'nodeid': collector.nodeid,
+            'path': str(collector.path),
+            'node_type': type(collector).__name__,
+            'duration': duration,
+            'import_duration': self._import_duration,
+            'items': sum(1 for node in report.result if isinstance(node, pytest.Item)),
+            'outcome': report.outcome,
+        })
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_pycollect_makeitem(self, collector: 'Collector') -> None:
+        # the first item a module makes comes right after the module was imported
+        if collector is self._importing:
+            self._import_duration = time.perf_counter() - self._start
+            self._importing = None
+
+    def pytest_collection_finish(self, session: 'Session') -> None:
+        get_test_session_data(session).collection = collection_summary(
+            self._records, duration=time.perf_counter() - self._collection_start,
+            conftest_duration=session.config.stash.get(CONFTEST_LOAD_KEY, None))  # type: ignore[arg-type]
+        reporters(session).report_collection(collectors=self._records)
+
+
+def collection_summary(records: List[Dict[str, Any]], *, duration: float,
+                       conftest_duration: Optional[float]) -> Dict[str, Any]:
+    """ total durations, collectors and items, and the nodeids of the slowest collectors """
+    return {
+        'duration': duration,
+        'import_duration': sum(record['import_duration'] or 0.0 for record in records),
+        'conftest_duration': conftest_duration,
+        'collectors': len(records),
+        'items': sum(record['items'] for record in records),
+        'slowest': [record['nodeid'] for record in sorted(records, key=lambda r: -r['duration'])[:SLOWEST_COUNT]],
+    }
@@ -0,0 +1,168 @@
+import logging
+import os
+from datetime import datetime
+from typing import Optional, TYPE_CHECKING, Union, Any
+
+import pytest
+from _pytest.config import ExitCode
+
+from pytest_stats.builtin_reporters import init_reporters
+from pytest_stats.captured_output import capture_sections
+from pytest_stats.failures import dedupe_failure, failure_table
+from pytest_stats.marks import get_marks
+from pytest_stats.reporters_registry import ReportersRegistry
+from pytest_stats.sampling import SAMPLER_KEY, Sampler, keeps_detail, sampler
+from pytest_stats.stack_traces import capture_options, capture_stack_trace
+from pytest_stats.stash import TEST_DATA_KEY, get_test_item_data, get_test_session_data, reporters
+from pytest_stats.test_item_data import TestItemData
+from pytest_stats.test_session_data import TestSessionData
+from pytest_stats.utilization import utilization
+
+if TYPE_CHECKING:
+    from _pytest.config import Config
+    from _pytest.nodes import Item, Collector
+    from _pytest.reports import TestReport, CollectReport
+    from _pytest.runner import CallInfo
+    from _pytest.main import Session
+
+logger = logging.getLogger(__name__)
+PLUGIN_NAME = 'pytest_stats_collector'
+
+
+# noinspection PyUnusedLocal
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(  # type: ignore[return]
+        item: 'Item', nextitem: "Optional[Item]"  # pylint:disable=unused-argument
+) -> Optional[object]:
+    # noinspection PyTypeChecker
+    test_data = get_test_item_data(item)
+    # noinspection PyTypeChecker
+    item.stash[TEST_DATA_KEY] = test_data  # type: ignore[index]
+    test_data.session_id = session_id(item.config)
+    test_data.name = item.name
+    session_sampler = sampler(item.session)
+    if session_sampler is None and reporters(item.session).collects('marks'):
+        test_data.marks = get_marks(item)
+    test_data.test_start_protocol = datetime.timestamp(datetime.now())
+    test_data.xdist_worker_id = get_test_session_data(item.session).xdist_worker_id
+    yield
+    test_data.test_end_protocol = datetime.timestamp(datetime.now())
+    utilization(item.session).add(test_data)
+    if session_sampler is None or _kept(item, test_data, session_sampler):
+        reporters(item.session).report_test(test_data=test_data)
+
+
+def _kept(item: 'Item', test_data: TestItemData, session_sampler: Sampler) -> bool:
+    """ summarizes the tests the sampler doesn't keep - the kept ones only get their marks once they're known """
+    if not session_sampler.keep(test_data):
+        session_sampler.summarize(test_data)
+        return False
+    session_sampler.summary['detailed'] += 1
+    if reporters(item.session).collects('marks'):
+        test_data.marks = get_marks(item)
+    return True
+
+
+def _report_session_start(session: 'Session') -> None:
+    session_data: TestSessionData = get_test_session_data(session=session)
+    session_data.session_id = session_id(session.config)
+    session_data.xdist_worker_id = os.getenv('PYTEST_XDIST_WORKER', None)
+    session_data.fail_msg = None
+    session_data.stack_trace = None
+    session_data.workers = None
+    session_data.fixtures = None
+    session_data.reporter_stats = None
+    session_data.failure_signatures = None
+    session_data.collection = None
+    session_data.utilization = None
+    session_sampler = sampler(session)
+    session_data.sampling = session_sampler.summary if session_sampler is not None else None
+    session_data.start_time = datetime.timestamp(datetime.now())
+    reporters(session).report_session_start(session_data=session_data)
+
+
+def pytest_sessionstart(session: 'Session') -> None:
+    session_data = TestSessionData()
+    # noinspection PyTypeChecker
+    session.stash['session_data'] = session_data  # type: ignore[index]
+    reporters_registry: ReportersRegistry = session.config.stash['reporters']  # type: ignore[index]
+    session.config.hook.pytest_stats_env_data(session_data=session_data)
+    session.stash['stats_reporters'] = reporters_registry  # type: ignore[index]
+    init_reporters(reporters_registry, session.config)
+    if session.config.option.stats_sample_rate < 1.0:
+        session.stash[SAMPLER_KEY] = Sampler(session.config.option.stats_sample_rate,  # type: ignore[index]
+                                             slow_threshold=session.config.option.stats_sample_slow)
+    _report_session_start(session)
+
+
+def pytest_sessionfinish(session: 'Session', exitstatus: int) -> None:
+    # noinspection PyTypeChecker
+    session_data: TestSessionData = get_test_session_data(session)
+    session_data.status = ExitCode(exitstatus).name
+    session_data.collected_tests = session.testscollected
+    session_data.failed_tests = session.testsfailed
+    session_data.end_time = datetime.timestamp(datetime.now())
+    reporters(session).flush()
+    session_data.reporter_stats = reporters(session).reporter_stats()
+    session_data.failure_signatures = failure_table(session).signature_counts()
+    session_data.utilization = utilization(session).summary()
+    reporters(session).report_session_finish(session_data=session_data)
+
+
+def session_id(config: 'Config') -> str:
+    if hasattr(config, 'workerinput'):
+        return config.workerinput["testrunuid"]
+    return config.stash['stats_session_id']  # type: ignore[index]
+
+
+@pytest.hookimpl(hookwrapper=True, tryfirst=True)
+def pytest_runtest_makereport(item: "Item", call: "CallInfo[None]") -> Optional["TestReport"]:  # type: ignore[misc]
+    output = yield
+    test_state = output.get_result()
+    # noinspection PyTypeChecker
+    test_data: TestItemData = item.stash[TEST_DATA_KEY]  # type: ignore[index]
+    test_data.set_step_status(
+        when=call.when,
+        start=call.start,
+        end=call.stop,
+        duration=call.duration,
+        outcome=test_state.outcome)
+
+    if test_state.when == 'setup':
+        rerun_number = item.execution_count - 1 if hasattr(item, 'execution_count') else 0
+        test_data.fullname = item.nodeid
+        test_data.id = f'{item.nodeid}-{rerun_number}'
+        test_data.rerun_number = rerun_number
+
+    elif test_state.when == 'teardown' and reporters(item.session).collects('test_output'):
+        _capture_output(item, test_data, test_state)
+
+
+def _capture_output(item: 'Item', test_data: TestItemData, report: 'TestReport') -> None:
+    mode = item.config.option.stats_output_capture
+    if mode == 'all' and not keeps_detail(item.session, test_data):
+        return
+    if mode == 'all' or (mode == 'failures' and test_data.outcome in ('failed', 'error')):
+        test_data.set_output(capture_sections(report.sections, item.config.option.stats_output_max_size))
+
+
+# noinspection PyUnusedLocal
+def pytest_exception_interact(
+        node: Union["Item", "Collector"],
+        call: "CallInfo[Any]",
+        report: Union["CollectReport", "TestReport"],  # pylint:disable=unused-argument
+) -> None:
+    if call.excinfo is None:
+        return
+    if call.when == 'collect':
+        logger.debug('Got exception during collection, reporting error in session')
+        session_data = get_test_session_data(session=node.session)
+        session_data.fail_msg = str(call.excinfo.value)
+        session_data.stack_trace = capture_stack_trace(call.excinfo, **capture_options(node.config)).render()
+    else:
+        logger.debug('Collecting exception information for test')
+        # noinspection PyTypeChecker
+        test_data = node.stash[TEST_DATA_KEY]  # type: ignore[index]
+        test_data.set_failure(call.excinfo, with_stack_trace=reporters(node.session).collects('stack_trace'),
+                              **capture_options(node.config))
+        dedupe_failure(node.session, test_data)
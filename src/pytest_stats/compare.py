@@ -0,0 +1,177 @@
+import math
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from pytest_stats.duration_stats import PHASES, _numpy
+
+# per session: fullname -> (duration, failed) of the test's last run in the session
+SessionRuns = Dict[str, Tuple[float, bool]]
+
+
+class TestDelta(NamedTuple):
+    fullname: str
+    baseline: float
+    candidate: float
+    delta: float
+    ratio: float
+    # (Welch's) t statistic of the slowdown - inf when the runs don't vary, nan without enough runs to tell
+    score: float
+    baseline_runs: int
+    candidate_runs: int
+
+
+class ModuleDelta(NamedTuple):
+    module: str
+    baseline: float
+    candidate: float
+    delta: float
+
+
+class Comparison(NamedTuple):
+    baseline_sessions: List[str]
+    candidate_sessions: List[str]
+    tests: List[TestDelta]
+    modules: List[ModuleDelta]
+    slowdowns: List[TestDelta]
+    new_failures: List[str]
+    fixed: List[str]
+    added: int
+    removed: int
+
+
+def read_sessions(records: Iterable[Mapping[str, Any]], phase: str = 'total') -> Dict[str, SessionRuns]:
+    """ the runs of every recorded session (see pytest_stats.history.iter_history), ordered by session start """
+    if phase not in PHASES + ('total',):
+        raise ValueError(f'unknown phase {phase}, expected total or one of {PHASES}')
+    duration_keys = tuple(f'test_duration_{when}' for when in (PHASES if phase == 'total' else (phase,)))
+    result_keys = tuple(f'result_{when}' for when in PHASES)
+    sessions: Dict[str, SessionRuns] = {}
+    starts: Dict[str, float] = {}
+    names: Dict[str, str] = {}
+    session_id, runs = None, {}
+    for record in records:
+        durations = [record.get(key) for key in duration_keys]
+        if durations.count(None) == len(durations):
+            continue
+        if record['session_id'] != session_id:
+            session_id = record['session_id']
+            if session_id not in sessions:
+                sessions[session_id] = {}
+                starts[session_id] = record.get('session_start') or 0.0
+            runs = sessions[session_id]
+        # the same fullname string is shared by the sessions
+        fullname = names.setdefault(record['fullname'], record['fullname'])
+        runs[fullname] = (sum(duration for duration in durations if duration is not None),
+                          'failed' in [record.get(key) for key in result_keys])
+    return {session_id: sessions[session_id] for session_id in sorted(sessions, key=lambda s: starts[s])}
+
+
+def _moments(rows: Sequence[Sequence[float]]) -> Tuple[List[int], List[float], List[float]]:
+    """ runs, mean and sample standard deviation of every row (nan for a missing run), in bulk with numpy """
+    numpy = _numpy()
+    if numpy is not None and rows:
+        values = numpy.array(rows, dtype=float)
+        present = ~numpy.isnan(values)
+        counts = present.sum(axis=1)
+        means = numpy.nansum(values, axis=1) / numpy.maximum(counts, 1)
+        squares = numpy.nansum((values - means[:, None]) ** 2, axis=1)
+        return counts.tolist(), means.tolist(), numpy.sqrt(squares / numpy.maximum(counts - 1, 1)).tolist()
+    counts, means, stdevs = [], [], []
+    for row in rows:
+        present = [value for value in row if not math.isnan(value)]
+        mean = sum(present) / max(len(present), 1)
+        counts.append(len(present))
+        means.append(mean)
+        stdevs.append(math.sqrt(sum((value - mean) ** 2 for value in present) / max(len(present) - 1, 1)))
+    return counts, means, stdevs
+
+
+def _score(delta: float, baseline: Tuple[int, float], candidate: Tuple[int, float]) -> float:
+    """ Welch's t statistic, or the candidate's z score against the baseline runs when it ran once """
+    (baseline_runs, baseline_stdev), (candidate_runs, candidate_stdev) = baseline, candidate
+    if baseline_runs < 2:
+        return math.nan
+    error = math.sqrt(baseline_stdev ** 2 / baseline_runs
+                      + (candidate_stdev ** 2 / candidate_runs if candidate_runs > 1 else baseline_stdev ** 2))
+    if error == 0:
+        return math.inf if delta > 0 else 0.0
+    return delta / error
+
+
+def compare(sessions: Dict[str, SessionRuns], *, candidates: Optional[Sequence[str]] = None,
+            baselines: Optional[Sequence[str]] = None, threshold: float = 3.0, min_delta: float = 0.1,
+            min_ratio: float = 0.2) -> Comparison:
+    """
+    compares the candidate sessions (default: the latest one) with the baseline sessions (default: all the others).
+    a slowdown is significant when it's at least min_delta seconds and min_ratio of the baseline, and its score is
+    at least threshold (when the baseline has enough runs to tell)
+    """
+    candidates = list(candidates or list(sessions)[-1:])
+    baselines = list(baselines or [session_id for session_id in sessions if session_id not in candidates])
+    for session_id in candidates + baselines:
+        if session_id not in sessions:
+            raise ValueError(f'unknown session {session_id}')
+    baseline_names = {name for session_id in baselines for name in sessions[session_id]}
+    candidate_names = {name for session_id in candidates for name in sessions[session_id]}
+    tests = _deltas(sessions, sorted(baseline_names & candidate_names), baselines, candidates)
+    modules: Dict[str, List[float]] = {}
+    for test in tests:
+        totals = modules.setdefault(test.fullname.split('::', 1)[0], [0.0, 0.0])
+        totals[0] += test.baseline
+        totals[1] += test.candidate
+    return Comparison(
+        baseline_sessions=baselines, candidate_sessions=candidates, tests=tests,
+        modules=sorted((ModuleDelta(module, base, cand, cand - base) for (module, (base, cand)) in modules.items()),
+                       key=lambda module: -module.delta),
+        slowdowns=[test for test in tests if test.delta >= min_delta and test.ratio >= 1 + min_ratio
+                   and not test.score < threshold],
+        new_failures=sorted(name for name in candidate_names
+                            if _last(sessions, candidates, name) and not _last(sessions, baselines, name)),
+        fixed=sorted(name for name in candidate_names
+                     if _last(sessions, baselines, name) and not _last(sessions, candidates, name)),
+        added=len(candidate_names - baseline_names), removed=len(baseline_names - candidate_names))
+
+
+def _deltas(sessions: Dict[str, SessionRuns], names: Sequence[str], baselines: Sequence[str],
+            candidates: Sequence[str]) -> List[TestDelta]:
+    """ the duration delta of every test, slowest first """
+    base, cand = (
+        _moments([[sessions[s][name][0] if name in sessions[s] else math.nan for s in group] for name in names])
+        for group in (baselines, candidates))
+    tests = []
+    for i, name in enumerate(names):
+        delta = cand[1][i] - base[1][i]
+        tests.append(TestDelta(name, base[1][i], cand[1][i], delta, cand[1][i] / base[1][i] if base[1][i] else math.inf,
+                               _score(delta, (base[0][i], base[2][i]), (cand[0][i], cand[2][i])),
+                               base[0][i], cand[0][i]))
+    return sorted(tests, key=lambda test: -test.delta)
+
+
+def _last(sessions: Dict[str, SessionRuns], group: Sequence[str], name: str) -> bool:
+    """ whether the last run of the test in the group of sessions failed """
+    for session_id in reversed(group):
+        if name in sessions[session_id]:
+            return sessions[session_id][name][1]
+    return False
+
+
+def format_comparison(comparison: Comparison, top: int = 20) -> List[str]:
+    lines = [f"baseline {', '.join(comparison.baseline_sessions)} -> "
+             f"candidate {', '.join(comparison.candidate_sessions)}: "
+             f'{len(comparison.tests)} tests compared, {comparison.added} added, {comparison.removed} removed']
+    sections = (
+        ('significant slowdowns', comparison.slowdowns[:top]),
+        ('slowest changes', [test for test in comparison.tests[:top] if test.delta > 0]),
+        ('fastest changes', [test for test in reversed(comparison.tests[-top:]) if test.delta < 0]),
+    )
+    for title, tests in sections:
+        lines.append(f'--- {title} ---')
+        lines.append(f"{'baseline':>9} {'candidate':>9} {'delta':>9} {'ratio':>7} {'score':>7}  test")
+        lines.extend(f'{t.baseline:9.3f} {t.candidate:9.3f} {t.delta:+9.3f} {t.ratio:7.2f} {t.score:7.2f}  {t.fullname}'
+                     for t in tests)
+    lines.append('--- modules ---')
+    lines.append(f"{'baseline':>9} {'candidate':>9} {'delta':>9}  module")
+    lines.extend(f'{m.baseline:9.3f} {m.candidate:9.3f} {m.delta:+9.3f}  {m.module}' for m in comparison.modules[:top])
+    for title, names in (('new failures', comparison.new_failures), ('fixed', comparison.fixed)):
+        lines.append(f'--- {title} ({len(names)}) ---')
+        lines.extend(names[:top])
+    return lines
@@ -1,7 +1,9 @@
 import logging
-from typing import TYPE_CHECKING, Optional, List
+from typing import TYPE_CHECKING, Optional, List, TextIO
 
 from pytest_stats.reporters_registry import ResultsReporter
+from pytest_stats.run_summary import RunSummary
+from pytest_stats.utilization import format_utilization
 
 if TYPE_CHECKING:
     from pytest_stats.test_item_data import TestItemData
@@ -11,24 +13,70 @@ logger = logging.getLogger(__name__)
 
 
 class DefaultTextReporter(ResultsReporter):
-    def __init__(self) -> None:
-        self._tests: List['TestItemData'] = []
+    """
+    Logs all the tests at the end of the session.
+    In streaming mode the tests aren't kept - their lines are emitted in chunks of chunk_size lines while the session
+    runs (to output_path when given, otherwise to the log), and the end of session report only holds the summary.
+    """
+    required_fields = frozenset({'marks', 'stack_trace'})
+
+    def __init__(self, stream: bool = False, output_path: Optional[str] = None, chunk_size: int = 100) -> None:
+        self._tests: Optional[List['TestItemData']] = None if stream else []
         self._session_data: Optional['TestSessionData'] = None
+        self._summary = RunSummary()
+        self._output_path = output_path
+        self._output: Optional[TextIO] = None
+        self._chunk: List[str] = []
+        self._chunk_size = chunk_size
 
     def report_session_start(self, session_data: 'TestSessionData') -> None:
         logger.debug('Starting session with: %s', session_data)
         self._session_data = session_data
+        if self._tests is None and self._output_path is not None:
+            self._output = open(self._output_path, 'w', encoding='utf-8')  # pylint:disable=consider-using-with
 
     def report_session_finish(self, session_data: 'TestSessionData') -> None:
         self._session_data = session_data
+        self._flush_chunk()
         self._print_report()
+        if self._output is not None:
+            self._output.close()
+            self._output = None
 
     def report_test(self, test_data: 'TestItemData') -> None:
-        self._tests.append(test_data)
+        self._summary.add(test_data)
+        if self._tests is not None:
+            self._tests.append(test_data)
+            return
+        self._chunk.append(str(test_data))
+        if len(self._chunk) >= self._chunk_size:
+            self._flush_chunk()
+
+    def _flush_chunk(self) -> None:
+        if not self._chunk:
+            return
+        if self._output is not None:
+            self._output.write('\n'.join(self._chunk) + '\n')
+            self._output.flush()
+        else:
+            logger.info('Tests:\r\n %s', '\r\n'.join(self._chunk))
+        self._chunk = []
 
     def _print_report(self) -> None:
+        utilization = getattr(self._session_data, 'utilization', None)
+        summary = str(self._summary)
+        if utilization is not None:
+            summary += f'\r\nUtilization:\r\n {format_utilization(utilization)}'
+        if self._tests is None:
+            logger.info(
+                "----------TEST STATS----------\r\n"
+                "Session Data\r\n %s\r\n"
+                "Summary:\r\n %s", self._session_data, summary
+            )
+            return
         logger.info(
             "----------TEST STATS----------\r\n"
             "Session Data\r\n %s\r\n"
-            "Tests:\r\n %s", self._session_data, '\r\n'.join([str(x) for x in self._tests])
+            "Summary:\r\n %s\r\n"
+            "Tests:\r\n %s", self._session_data, summary, '\r\n'.join([str(x) for x in self._tests])
         )
@@ -0,0 +1,65 @@
+import heapq
+import logging
+import os
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple, TypeVar
+
+import pytest
+
+from pytest_stats.duration_stats import DurationStatsEngine
+from pytest_stats.history import iter_history
+
+if TYPE_CHECKING:
+    from _pytest.nodes import Item
+
+logger = logging.getLogger(__name__)
+T = TypeVar('T')
+GROUP_PREFIX = 'stats_lpt_'
+
+
+def lpt_partition(durations: Sequence[Tuple[T, float]], bins: int) -> List[List[T]]:
+    """ longest processing time first - every job goes to the least loaded bin, longest jobs first """
+    loads = [(0.0, index) for index in range(bins)]
+    partitions: List[List[T]] = [[] for _ in range(bins)]
+    for job, duration in sorted(durations, key=lambda job_duration: job_duration[1], reverse=True):
+        load, index = heapq.heappop(loads)
+        partitions[index].append(job)
+        heapq.heappush(loads, (load + duration, index))
+    return partitions
+
+
+class DurationOrdering:
+    """
+    Reorders the collected tests longest first, by their mean duration in the recorded history, so the slow tests
+    don't end up in the tail of the run. Tests without history are expected to take the mean of the known tests.
+    With xdist_groups, the tests are also packed into one xdist_group per worker (LPT), for --dist loadgroup.
+    """
+
+    def __init__(self, history_path: str, xdist_groups: bool = False, window: int = 20) -> None:
+        self._history_path = history_path
+        self._xdist_groups = xdist_groups
+        self._window = window
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection_modifyitems(self, items: List['Item']) -> None:
+        expected = self.expected_durations(items)
+        if not expected:
+            return
+        items.sort(key=lambda item: expected[item.nodeid], reverse=True)
+        workers = int(os.getenv('PYTEST_XDIST_WORKER_COUNT', '0'))
+        if self._xdist_groups and workers > 0:
+            ungrouped = [(item, expected[item.nodeid]) for item in items
+                         if item.get_closest_marker('xdist_group') is None]
+            for index, group in enumerate(lpt_partition(ungrouped, workers)):
+                for item in group:
+                    item.add_marker(pytest.mark.xdist_group(f'{GROUP_PREFIX}{index}'))
+
+    def expected_durations(self, items: Sequence['Item']) -> Dict[str, float]:
+        try:
+            stats = DurationStatsEngine(window=self._window).add_all(iter_history(self._history_path)).stats()
+        except FileNotFoundError:
+            logger.warning('no test history at %s, keeping the collection order', self._history_path)
+            return {}
+        # xdist --dist loadgroup suffixes the node ids with their group - recorded runs are matched without it
+        means = {fullname.partition(f'@{GROUP_PREFIX}')[0]: s.mean for fullname, s in stats.items()}
+        default = sum(means.values()) / len(means) if means else 0.0
+        return {item.nodeid: means.get(item.nodeid, default) for item in items}
@@ -0,0 +1,152 @@
+import math
+import sqlite3
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Set, TYPE_CHECKING
+
+from _pytest.config import ExitCode, create_terminal_writer
+
+from pytest_stats.history import iter_history
+from pytest_stats.options import STATS_KEYS
+
+if TYPE_CHECKING:
+    from _pytest.config import Config
+
+PHASES = ('setup', 'call', 'teardown')
+
+
+class DurationStats(NamedTuple):
+    fullname: str
+    runs: int
+    mean: float
+    variance: float
+    p50: float
+    p90: float
+    p99: float
+    failure_rate: float
+    last: float
+
+
+def _numpy() -> Any:
+    """ numpy is optional, and only imported once statistics are computed """
+    try:
+        import numpy  # pylint:disable=import-outside-toplevel
+        return numpy
+    except ImportError:
+        return None
+
+
+def _percentile(sorted_values: Sequence[float], percent: float) -> float:
+    """ linear interpolation, same as numpy's default """
+    position = percent / 100 * (len(sorted_values) - 1)
+    low = math.floor(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+class DurationStatsEngine:
+    """
+    Per test duration statistics over the last `window` runs of every test.
+    Records are added incrementally (e.g. from pytest_stats.history.iter_history); only tests that got new runs since
+    the last call to stats() are recomputed, in batches of equally sized windows when numpy is available.
+    """
+
+    def __init__(self, window: int = 20, phase: str = 'total') -> None:
+        if phase not in PHASES + ('total',):
+            raise ValueError(f'unknown phase {phase}, expected total or one of {PHASES}')
+        self.window = window
+        self.phase = phase
+        self._durations: Dict[str, Deque[float]] = {}
+        self._failures: Dict[str, Deque[bool]] = {}
+        self._dirty: Set[str] = set()
+        self._stats: Dict[str, DurationStats] = {}
+
+    def add(self, record: Mapping[str, Any]) -> None:
+        duration = self._duration(record)
+        if duration is None:
+            return
+        fullname = record['fullname']
+        if fullname not in self._durations:
+            self._durations[fullname] = deque(maxlen=self.window)
+            self._failures[fullname] = deque(maxlen=self.window)
+        self._durations[fullname].append(duration)
+        self._failures[fullname].append(any(record.get(f'result_{when}') == 'failed' for when in PHASES))
+        self._dirty.add(fullname)
+
+    def add_all(self, records: Iterable[Mapping[str, Any]]) -> 'DurationStatsEngine':
+        for record in records:
+            self.add(record)
+        return self
+
+    def stats(self) -> Dict[str, DurationStats]:
+        if self._dirty:
+            numpy = _numpy()
+            if numpy is not None:
+                self._compute_vectorized(numpy, self._dirty)
+            else:
+                for fullname in self._dirty:
+                    self._stats[fullname] = self._compute(fullname)
+            self._dirty = set()
+        return self._stats
+
+    def top(self, key: str = 'p90', count: int = 20) -> List[DurationStats]:
+        if key not in STATS_KEYS:
+            raise ValueError(f'unknown key {key}, expected one of {STATS_KEYS}')
+        return sorted(self.stats().values(), key=lambda s: getattr(s, key), reverse=True)[:count]
+
+    def _duration(self, record: Mapping[str, Any]) -> Optional[float]:
+        if self.phase != 'total':
+            return record.get(f'test_duration_{self.phase}')
+        durations = [record.get(f'test_duration_{when}') for when in PHASES]
+        if all(duration is None for duration in durations):
+            return None
+        return sum(duration for duration in durations if duration is not None)
+
+    def _compute(self, fullname: str) -> DurationStats:
+        durations = list(self._durations[fullname])
+        ordered = sorted(durations)
+        mean = sum(durations) / len(durations)
+        return DurationStats(
+            fullname=fullname, runs=len(durations), mean=mean,
+            variance=sum((d - mean) ** 2 for d in durations) / len(durations),
+            p50=_percentile(ordered, 50), p90=_percentile(ordered, 90), p99=_percentile(ordered, 99),
+            failure_rate=sum(self._failures[fullname]) / len(durations), last=durations[-1])
+
+    def _compute_vectorized(self, numpy: Any, fullnames: Iterable[str]) -> None:
+        by_runs: Dict[int, List[str]] = {}
+        for fullname in fullnames:
+            by_runs.setdefault(len(self._durations[fullname]), []).append(fullname)
+        for names in by_runs.values():
+            durations = numpy.array([self._durations[name] for name in names], dtype=float)
+            failure_rates = numpy.array([self._failures[name] for name in names], dtype=float).mean(axis=1)
+            p50, p90, p99 = numpy.percentile(durations, [50, 90, 99], axis=1)
+            means, variances = durations.mean(axis=1), durations.var(axis=1)
+            for i, name in enumerate(names):
+                self._stats[name] = DurationStats(
+                    fullname=name, runs=durations.shape[1], mean=float(means[i]), variance=float(variances[i]),
+                    p50=float(p50[i]), p90=float(p90[i]), p99=float(p99[i]),
+                    failure_rate=float(failure_rates[i]), last=float(durations[i, -1]))
+
+
+def format_stats(stats: Sequence[DurationStats]) -> List[str]:
+    lines = [f"{'p50':>9} {'p90':>9} {'p99':>9} {'mean':>9} {'stdev':>9} {'last':>9} {'fail%':>6} {'runs':>5}  test"]
+    for s in stats:
+        lines.append(f'{s.p50:9.3f} {s.p90:9.3f} {s.p99:9.3f} {s.mean:9.3f} {math.sqrt(s.variance):9.3f} '
+                     f'{s.last:9.3f} {s.failure_rate * 100:6.1f} {s.runs:5d}  {s.fullname}')
+    return lines
+
+
+def show_summary(config: 'Config') -> int:
+    """ --stats-summary entry point - prints the slowest tests of the recorded history instead of running tests """
+    option = config.option
+    engine = DurationStatsEngine(window=option.stats_summary_window, phase=option.stats_summary_phase)
+    writer = create_terminal_writer(config)
+    try:
+        engine.add_all(iter_history(option.stats_summary))
+    except (OSError, sqlite3.DatabaseError) as e:
+        writer.line(f'failed to read the history at {option.stats_summary}: {e}', red=True)
+        return ExitCode.USAGE_ERROR
+    writer.sep('=', f'slowest tests by {option.stats_summary_sort} ({option.stats_summary_phase} duration, '
+                    f'last {engine.window} runs)')
+    for line in format_stats(engine.top(key=option.stats_summary_sort, count=option.stats_summary_top)):
+        writer.line(line)
+    return 0
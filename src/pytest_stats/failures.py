@@ -0,0 +1,90 @@
+import hashlib
+import threading
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Tuple, Union
+
+from pytest_stats.stack_traces import StackTrace
+from pytest_stats.stash import reporters
+
+if TYPE_CHECKING:
+    from _pytest.main import Session
+    from pytest_stats.test_item_data import TestItemData
+
+FAILURES_KEY = 'stats_failures'
+
+
+def failure_digest(fail_msg: Optional[str], stack_trace: Union[str, StackTrace, None]) -> str:
+    """ content address of a failure - equal messages and stack traces (or frames, when not rendered) share a digest """
+    trace = stack_trace.key if isinstance(stack_trace, StackTrace) else stack_trace
+    content = f'{fail_msg}\0{trace}'.encode('utf-8', 'replace')
+    return hashlib.blake2b(content, digest_size=8).hexdigest()
+
+
+class Failure:
+    """ a unique failure text of the session, and the number of tests that failed with it """
+    __slots__ = ('digest', 'fail_msg', 'stack_trace_source', 'count')
+
+    def __init__(self, digest: str, fail_msg: Optional[str], stack_trace: Union[str, StackTrace, None]) -> None:
+        self.digest = digest
+        self.fail_msg = fail_msg
+        self.stack_trace_source = stack_trace
+        self.count = 0
+
+    @property
+    def stack_trace(self) -> Optional[str]:
+        source = self.stack_trace_source
+        return source.render() if isinstance(source, StackTrace) else source
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__}: {self.digest} x{self.count} {self.fail_msg!r}>'
+
+
+class FailureTable:
+    """ the session's failures by digest - every failure text is kept once, however many tests share it """
+
+    def __init__(self) -> None:
+        self._failures: Dict[str, Failure] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._failures)
+
+    def __iter__(self) -> Iterator[Failure]:
+        return iter(list(self._failures.values()))
+
+    def get(self, digest: str) -> Optional[Failure]:
+        return self._failures.get(digest)
+
+    def add(self, fail_msg: Optional[str], stack_trace: Union[str, StackTrace, None]) -> Tuple[Failure, bool]:
+        """ the failure of this text, and whether it's new to the session """
+        digest = failure_digest(fail_msg, stack_trace)
+        with self._lock:
+            failure = self._failures.get(digest)
+            new = failure is None
+            if failure is None:
+                failure = self._failures[digest] = Failure(digest, fail_msg, stack_trace)
+            failure.count += 1
+        return failure, new
+
+    def signature_counts(self) -> Dict[str, int]:
+        return {digest: failure.count for digest, failure in self._failures.items()}
+
+
+def failure_table(session: 'Session') -> FailureTable:
+    table = session.stash.get(FAILURES_KEY, None)  # type: ignore[arg-type]
+    if table is None:
+        table = session.stash[FAILURES_KEY] = FailureTable()  # type: ignore[index]
+    return table
+
+
+def dedupe_failure(session: 'Session', test_data: 'TestItemData') -> None:
+    """
+    points the failure text of the test at the session's single copy and sets its failure_digest.
+    failures that are new to the session are reported once, through ResultsReporter.report_failure
+    """
+    failure, new = failure_table(session).add(getattr(test_data, 'fail_msg', None), test_data.stack_trace_source)
+    test_data.fail_msg = failure.fail_msg
+    if failure.stack_trace_source is not None:
+        test_data.set_stack_trace(failure.stack_trace_source)
+    test_data.failure_digest = failure.digest
+    if new:
+        reporters(session).report_failure(failure=failure)
@@ -0,0 +1,83 @@
+import time
+from typing import TYPE_CHECKING, Any, Dict, Generator, Optional
+
+import pytest
+
+from pytest_stats.stash import get_test_item_data, get_test_session_data, reporters
+
+if TYPE_CHECKING:
+    from _pytest.fixtures import FixtureDef
+    from _pytest.nodes import Item
+    from pytest_stats.test_item_data import TestItemData
+    from pytest_stats.test_session_data import TestSessionData
+
+
+class FixtureTiming:
+    """
+    Times the setup and teardown of every fixture into TestItemData.fixtures, as records of
+    name, scope, phase (setup / teardown), start, duration and cached. Fixtures a test uses without setting them up
+    (higher scoped fixtures set up by an earlier test) are recorded as cached setups.
+    The fixtures that aren't function scoped are also summed up per session into TestSessionData.fixtures.
+    """
+
+    def __init__(self) -> None:
+        self._test_data: Optional['TestItemData'] = None
+        self._session_data: Optional['TestSessionData'] = None
+        self._scopes: Dict[str, str] = {}
+        self._teardown_starts: Dict['FixtureDef[Any]', float] = {}
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item: 'Item') -> None:
+        if not reporters(item.session).collects('fixtures'):
+            self._test_data = None
+            return
+        self._test_data = get_test_item_data(item)
+        self._test_data.fixtures = []
+        self._session_data = get_test_session_data(item.session)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_call(self, item: 'Item') -> None:
+        if self._test_data is None:
+            return
+        set_up = {record['name'] for record in self._test_data.fixtures}
+        for name in item.fixturenames:  # type: ignore[attr-defined]
+            if name not in set_up and name in self._scopes:
+                self._record(name, self._scopes[name], 'setup', start=None, duration=0.0, cached=True)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef: 'FixtureDef[Any]') -> Generator[None, Any, None]:
+        if self._test_data is None:
+            yield
+            return
+        start, started = time.time(), time.perf_counter()
+        yield
+        self._record(fixturedef.argname, fixturedef.scope, 'setup', start=start, duration=time.perf_counter() - started)
+        self._scopes[fixturedef.argname] = fixturedef.scope
+        # finalizers run last in first out - this one runs before the fixture's own teardown
+        fixturedef.addfinalizer(lambda: self._teardown_starts.__setitem__(fixturedef, time.perf_counter()))
+
+    def pytest_fixture_post_finalizer(self, fixturedef: 'FixtureDef[Any]') -> None:
+        started = self._teardown_starts.pop(fixturedef, None)
+        if started is None or self._test_data is None:
+            return
+        duration = time.perf_counter() - started
+        self._record(fixturedef.argname, fixturedef.scope, 'teardown', start=time.time() - duration, duration=duration)
+
+    def _record(self, name: str, scope: str, phase: str, *, start: Optional[float], duration: float,
+                cached: bool = False) -> None:
+        assert self._test_data is not None
+        self._test_data.fixtures.append(
+            {'name': name, 'scope': scope, 'phase': phase, 'start': start, 'duration': duration, 'cached': cached})
+        if scope == 'function' or self._session_data is None:
+            return
+        if self._session_data.fixtures is None:
+            self._session_data.fixtures = {}
+        totals = self._session_data.fixtures.setdefault(
+            name, {'scope': scope, 'setups': 0, 'cached_hits': 0, 'setup_duration': 0.0, 'teardown_duration': 0.0})
+        if cached:
+            totals['cached_hits'] += 1
+        elif phase == 'setup':
+            totals['setups'] += 1
+            totals['setup_duration'] += duration
+        else:
+            totals['teardown_duration'] += duration
@@ -0,0 +1,54 @@
+import gzip
+import json
+import sqlite3
+from contextlib import closing
+from typing import Any, Dict, Iterator, TextIO
+
+HISTORY_FIELDS = (
+    'session_id', 'session_start', 'fullname', 'xdist_worker_id',
+    'test_duration_setup', 'test_duration_call', 'test_duration_teardown',
+    'result_setup', 'result_call', 'result_teardown', 'test_start_protocol', 'test_end_protocol',
+)
+
+
+def iter_history(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Streams the recorded tests of a SQLite database (see --stats-sqlite) or JSON Lines file (see --stats-jsonl,
+    plain or gzipped), ordered by session. Every record holds the HISTORY_FIELDS.
+    """
+    if _is_sqlite(path):
+        return _iter_sqlite(path)
+    return _iter_jsonl(path)
+
+
+def _is_sqlite(path: str) -> bool:
+    with open(path, 'rb') as f:
+        return f.read(16) == b'SQLite format 3\x00'
+
+
+def _iter_sqlite(path: str) -> Iterator[Dict[str, Any]]:
+    with closing(sqlite3.connect(f'file:{path}?mode=ro', uri=True)) as connection:
+        cursor = connection.execute(
+            f"SELECT {', '.join(HISTORY_FIELDS)} FROM tests ORDER BY session_start, session_ref, id")
+        for row in cursor:
+            yield dict(zip(HISTORY_FIELDS, row))
+
+
+def _open(path: str) -> TextIO:
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, encoding='utf-8')  # pylint:disable=consider-using-with
+
+
+def _iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    session_starts: Dict[str, Any] = {}
+    with _open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get('type') == 'session_start':
+                session_starts[record.get('session_id')] = record.get('start_time')
+            elif record.get('type') == 'test':
+                record['session_start'] = session_starts.get(record.get('session_id'))
+                yield {field: record.get(field) for field in HISTORY_FIELDS}
@@ -2,9 +2,8 @@ import typing
 
 import pytest
 
-from pytest_stats.reporters_registry import ReportersRegistry
-
 if typing.TYPE_CHECKING:
+    from pytest_stats.reporters_registry import ReportersRegistry
     from pytest_stats.test_session_data import TestSessionData
 
 
@@ -17,4 +16,4 @@ def pytest_stats_env_data(session_data: 'TestSessionData') -> None:  # pylint:di
 # noinspection PyUnusedLocal
 @pytest.hookspec()
 def pytest_stats_register_reporters(reporters: 'ReportersRegistry') -> None:  # pylint:disable=unused-argument
-    """called on session start to get the environment details """
+    """called once on configure to register the reporters of the session """
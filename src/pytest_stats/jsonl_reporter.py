@@ -0,0 +1,47 @@
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Sequence
+
+from pytest_stats.jsonl_writer import JsonLinesWriter
+from pytest_stats.reporters_registry import ResultsReporter
+from pytest_stats.serialization import item_record, session_record
+
+if TYPE_CHECKING:
+    from pytest_stats.failures import Failure
+    from pytest_stats.test_item_data import TestItemData
+    from pytest_stats.test_session_data import TestSessionData
+
+logger = logging.getLogger(__name__)
+
+
+class JsonLinesReporter(ResultsReporter):
+    """
+    Writes a session_start record, a collector record per collector, a test record per test and a session_finish
+    record as JSON Lines. Stack traces are written once, in a failure record per unique failure, and tests reference
+    them by failure_digest.
+    All the keyword arguments are passed to the JsonLinesWriter.
+    """
+
+    def __init__(self, path: str, **writer_options: Any) -> None:
+        self._writer = JsonLinesWriter(path, **writer_options)
+
+    def report_session_start(self, session_data: 'TestSessionData') -> None:
+        logger.debug('writing stats to %s', self._writer.path)
+        self._writer.write(session_record(session_data, 'session_start'))
+
+    def report_test(self, test_data: 'TestItemData') -> None:
+        record = item_record(test_data)
+        if record['failure_digest'] is not None:
+            record['stack_trace'] = None
+        self._writer.write(record)
+
+    def report_failure(self, failure: 'Failure') -> None:
+        self._writer.write({'type': 'failure', 'digest': failure.digest, 'fail_msg': failure.fail_msg,
+                            'stack_trace': failure.stack_trace})
+
+    def report_collection(self, collectors: Sequence[Dict[str, Any]]) -> None:
+        for record in collectors:
+            self._writer.write({'type': 'collector', **record})
+
+    def report_session_finish(self, session_data: 'TestSessionData') -> None:
+        self._writer.write(session_record(session_data, 'session_finish'))
+        self._writer.close()
@@ -0,0 +1,105 @@
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, TextIO
+
+from pytest_stats.serialization import to_json_value
+
+logger = logging.getLogger(__name__)
+
+
+class JsonLinesWriter:  # pylint:disable=too-many-instance-attributes
+    """
+    Buffered JSON Lines writer.
+    The buffer is flushed every flush_every records or flush_interval seconds (and fsync-ed when asked to), and once
+    the file grows beyond max_bytes it is rotated to <path>.1 ... <path>.<backups>.
+    While records are pending, a daemon thread flushes them every flush_interval seconds even when nothing else is
+    written, so a hanging or killed run doesn't lose them.
+    """
+
+    def __init__(self, path: str, *, flush_every: int = 100, flush_interval: float = 5.0, fsync: bool = False,
+                 max_bytes: int = 0, backups: int = 5, compress: bool = False) -> None:
+        self.path = path
+        self._flush_every = flush_every
+        self._flush_interval = flush_interval
+        self._fsync = fsync
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._compress = compress
+        self._file: Optional[TextIO] = None
+        self._pending = 0
+        self._written = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._stop_flusher: Optional[threading.Event] = None
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, default=to_json_value) + '\n'
+        with self._lock:
+            if self._file is None:
+                self._file = self._open()
+            self._file.write(line)
+            self._pending += 1
+            self._written += len(line.encode('utf-8'))
+            if self._pending >= self._flush_every or time.monotonic() - self._last_flush >= self._flush_interval:
+                self._flush()
+            if self._max_bytes and self._written >= self._max_bytes:
+                self._rotate()
+            if self._pending and self._stop_flusher is None and self._flush_interval > 0:
+                self._stop_flusher = threading.Event()
+                threading.Thread(target=self._flush_periodically, args=(self._stop_flusher,),
+                                 name='pytest-stats-jsonl-flush', daemon=True).start()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._stop_flusher is not None:
+                self._stop_flusher.set()
+                self._stop_flusher = None
+            if self._file is not None:
+                self._flush()
+                self._file.close()
+                self._file = None
+
+    def _open(self) -> TextIO:
+        self._written = os.path.getsize(self.path) if os.path.exists(self.path) and not self._compress else 0
+        if self._compress:
+            return gzip.open(self.path, 'at', encoding='utf-8')
+        return open(self.path, 'a', encoding='utf-8', buffering=1 << 16)  # pylint:disable=consider-using-with
+
+    def _flush_periodically(self, stopped: threading.Event) -> None:
+        while not stopped.wait(self._flush_interval):
+            try:
+                with self._lock:
+                    if self._file is not None and self._pending:
+                        self._flush()
+            except Exception:  # pylint:disable=broad-exception-caught
+                logger.exception('failed to flush %s', self.path)
+
+    def _flush(self) -> None:
+        assert self._file is not None
+        self._file.flush()
+        if self._fsync:
+            os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def _rotate(self) -> None:
+        assert self._file is not None
+        self._flush()
+        self._file.close()
+        self._file = None
+        for index in range(self._backups - 1, 0, -1):
+            if os.path.exists(f'{self.path}.{index}'):
+                os.replace(f'{self.path}.{index}', f'{self.path}.{index + 1}')
+        if self._backups > 0:
+            os.replace(self.path, f'{self.path}.1')
+        else:
+            os.remove(self.path)
@@ -0,0 +1,75 @@
+import sys
+from typing import TYPE_CHECKING, Dict, FrozenSet, Tuple
+
+import pytest
+
+if TYPE_CHECKING:
+    from _pytest.config import Config
+    from _pytest.mark import Mark
+    from _pytest.nodes import Item, Node
+
+_NODE_MARKS_KEY = pytest.StashKey[FrozenSet[str]]()
+
+
+# noinspection PyUnusedLocal
+def create_mark_string(m: 'Mark') -> str:
+    if not m.args and not m.kwargs:
+        return m.name
+    args = [str(arg) for arg in m.args]
+    kwargs = [f'{key}={str(val)}' for (key, val) in m.kwargs.items()]
+    return f'{m.name}({", ".join(args + kwargs)})'
+
+
+class MarkCache:
+    """
+    Marks rendered once per mark object, and equal mark sets shared as a single frozenset.
+    The session's cache lives in the config stash (see mark_cache), so it goes away with the config
+    """
+
+    def __init__(self) -> None:
+        # by id of the mark - the mark itself is kept to make sure the id wasn't reused
+        self._rendered: Dict[int, Tuple['Mark', str]] = {}
+        self._sets: Dict[FrozenSet[str], FrozenSet[str]] = {}
+
+    def render(self, mark: 'Mark') -> str:
+        """ create_mark_string, rendered once per mark object and interned """
+        rendered = self._rendered.get(id(mark))
+        if rendered is None or rendered[0] is not mark:
+            rendered = (mark, sys.intern(create_mark_string(mark)))
+            self._rendered[id(mark)] = rendered
+        return rendered[1]
+
+    def intern(self, marks: FrozenSet[str]) -> FrozenSet[str]:
+        """ equal mark sets share a single frozenset """
+        return self._sets.setdefault(marks, marks)
+
+
+_MARK_CACHE_KEY = pytest.StashKey[MarkCache]()
+
+
+def mark_cache(config: 'Config') -> MarkCache:
+    cache = config.stash.get(_MARK_CACHE_KEY, None)
+    if cache is None:
+        cache = config.stash[_MARK_CACHE_KEY] = MarkCache()
+    return cache
+
+
+def _collector_marks(node: 'Node', cache: MarkCache) -> FrozenSet[str]:
+    """ the marks of a collector (module, class...) and its parents, rendered once for all of its items """
+    marks = node.stash.get(_NODE_MARKS_KEY, None)
+    if marks is None:
+        marks = frozenset(cache.render(m) for m in node.own_markers)
+        if node.parent is not None:
+            marks = marks.union(_collector_marks(node.parent, cache))
+        marks = cache.intern(marks)
+        node.stash[_NODE_MARKS_KEY] = marks
+    return marks
+
+
+def get_marks(item: 'Item') -> FrozenSet[str]:
+    """ the rendered marks of the item and all of its parents, same as iterating item.iter_markers() """
+    cache = mark_cache(item.config)
+    inherited = _collector_marks(item.parent, cache) if item.parent is not None else frozenset()
+    if not item.own_markers:
+        return inherited
+    return cache.intern(inherited.union(cache.render(m) for m in item.own_markers))
@@ -0,0 +1,102 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from _pytest.config.argparsing import Parser
+
+BACKPRESSURE_POLICIES = ('block', 'drop', 'spill')
+OUTPUT_CAPTURE_MODES = ('none', 'failures', 'all')
+STATS_KEYS = ('mean', 'variance', 'p50', 'p90', 'p99', 'failure_rate', 'last', 'runs')
+# any of these turns stats collection on
+ENABLING_OPTIONS = ('collect_stats', 'stats_jsonl', 'stats_sqlite', 'stats_text_report_file', 'stats_resource_usage',
+                    'stats_xdist_aggregate', 'stats_checkpoint', 'stats_chrome_trace')
+
+
+def add_options(parser: 'Parser') -> None:
+    parser.addoption('--collect-stats', action='store_true', dest='collect_stats',
+                     help='collect test stats, even when no reporter is registered')
+    parser.addoption('--disable-default-text-reporter', action='store_false', dest='use_default_text_reporter')
+    parser.addoption('--stats-async-reporting', action='store_true', dest='stats_async_reporting',
+                     help='dispatch test results to the reporters from background threads')
+    parser.addoption('--stats-queue-size', type=int, default=1000, dest='stats_queue_size',
+                     help='max number of test results waiting for the async reporters (default: 1000)')
+    parser.addoption('--stats-queue-workers', type=int, default=1, dest='stats_queue_workers',
+                     help='number of threads dispatching to the async reporters (default: 1)')
+    parser.addoption('--stats-backpressure', choices=BACKPRESSURE_POLICIES, default='block', dest='stats_backpressure',
+                     help='what to do with a test result when the async queue is full (default: block)')
+    parser.addoption('--stats-reporter-max-failures', type=int, default=5, dest='stats_reporter_max_failures',
+                     help='detach a reporter after N failed or too slow calls in a row (default: 5, 0: never)')
+    parser.addoption('--stats-reporter-latency-budget', type=float, default=None, dest='stats_reporter_latency_budget',
+                     help='seconds a single reporter call may take before it counts as a failure (default: no budget)')
+    parser.addoption('--stats-batch-size', type=int, default=100, dest='stats_batch_size',
+                     help='max number of tests handed to report_tests at once (default: 100)')
+    parser.addoption('--stats-batch-interval', type=float, default=10.0, dest='stats_batch_interval',
+                     help='max seconds a test waits in a report_tests batch (default: 10)')
+    parser.addoption('--stats-text-report-mode', choices=('buffered', 'stream'), default='buffered',
+                     dest='stats_text_report_mode',
+                     help='stream: the default text reporter writes every test as it finishes instead of keeping it')
+    parser.addoption('--stats-text-report-file', default=None, dest='stats_text_report_file',
+                     help='in stream mode, write the test lines to this file instead of the log')
+    parser.addoption('--stats-text-report-chunk', type=int, default=100, dest='stats_text_report_chunk',
+                     help='in stream mode, number of test lines written at once (default: 100)')
+    parser.addoption('--stats-jsonl', default=None, dest='stats_jsonl',
+                     help='write the session and test records as JSON Lines to this file')
+    parser.addoption('--stats-jsonl-flush-every', type=int, default=100, dest='stats_jsonl_flush_every',
+                     help='flush the JSON Lines file every N records (default: 100)')
+    parser.addoption('--stats-jsonl-flush-interval', type=float, default=5.0, dest='stats_jsonl_flush_interval',
+                     help='flush the JSON Lines file at least every N seconds (default: 5)')
+    parser.addoption('--stats-jsonl-fsync', action='store_true', dest='stats_jsonl_fsync',
+                     help='fsync the JSON Lines file on every flush')
+    parser.addoption('--stats-jsonl-max-bytes', type=int, default=0, dest='stats_jsonl_max_bytes',
+                     help='rotate the JSON Lines file once it grows beyond N bytes (default: 0, never)')
+    parser.addoption('--stats-jsonl-gzip', action='store_true', dest='stats_jsonl_gzip',
+                     help='gzip the JSON Lines file')
+    parser.addoption('--stats-sqlite', default=None, dest='stats_sqlite',
+                     help='keep the session and test history in this SQLite database')
+    parser.addoption('--stats-chrome-trace', default=None, dest='stats_chrome_trace',
+                     help='write a Chrome Trace Event timeline of the session to this file (Perfetto, '
+                          'chrome://tracing)')
+    parser.addoption('--stats-xdist-aggregate', action='store_true', dest='stats_xdist_aggregate',
+                     help='xdist workers send their tests to the controller, which is the only one running reporters')
+    parser.addoption('--stats-summary', default=None, dest='stats_summary',
+                     help='print duration statistics of the history recorded in this SQLite/JSON Lines file and exit')
+    parser.addoption('--stats-summary-window', type=int, default=20, dest='stats_summary_window',
+                     help='number of most recent runs of every test the statistics are computed over (default: 20)')
+    parser.addoption('--stats-summary-phase', choices=('total', 'setup', 'call', 'teardown'), default='total',
+                     dest='stats_summary_phase', help='which duration the statistics are computed for (default: total)')
+    parser.addoption('--stats-summary-sort', choices=STATS_KEYS, default='p90', dest='stats_summary_sort',
+                     help='statistic the tests are sorted by (default: p90)')
+    parser.addoption('--stats-summary-top', type=int, default=20, dest='stats_summary_top',
+                     help='number of tests shown (default: 20)')
+    parser.addoption('--stats-order-by-duration', default=None, dest='stats_order_by_duration',
+                     help='run the tests longest first, by their durations in this SQLite/JSON Lines history')
+    parser.addoption('--stats-xdist-lpt-groups', action='store_true', dest='stats_xdist_lpt_groups',
+                     help='with --stats-order-by-duration and --dist loadgroup, pack the tests into one xdist_group '
+                          'per worker by expected duration')
+    parser.addoption('--stats-resource-usage', action='store_true', dest='stats_resource_usage',
+                     help='sample the CPU time, RSS, GC collections and pauses (and traced memory, when tracemalloc '
+                          'is tracing) of every test')
+    parser.addoption('--stats-tracemalloc', action='store_true', dest='stats_tracemalloc',
+                     help='with --stats-resource-usage, start tracemalloc to sample the peak traced memory of '
+                          'every test')
+    parser.addoption('--stats-stack-depth', type=int, default=0, dest='stats_stack_depth',
+                     help='keep only the innermost N frames of the stack traces of failures (default: 0, all)')
+    parser.addoption('--stats-stack-cut-internal', action='store_true', dest='stats_stack_cut_internal',
+                     help='drop the pytest and pluggy frames from the stack traces of failures')
+    parser.addoption('--stats-failure-max-size', type=int, default=0, dest='stats_failure_max_size',
+                     help='truncate failure messages and stack traces to N characters (default: 0, no limit)')
+    parser.addoption('--stats-output-capture', choices=OUTPUT_CAPTURE_MODES, default='all',
+                     dest='stats_output_capture', help='tests whose captured output is kept (default: all)')
+    parser.addoption('--stats-output-max-size', type=int, default=0, dest='stats_output_max_size',
+                     help='keep the head and tail N characters of every captured output section (default: 0, all)')
+    parser.addoption('--stats-checkpoint', default=None, dest='stats_checkpoint',
+                     help='append the running session to this checkpoint log, removed once the session finishes')
+    parser.addoption('--stats-checkpoint-heartbeat', type=float, default=30.0, dest='stats_checkpoint_heartbeat',
+                     help='seconds between the session heartbeats written to the checkpoint log (default: 30, 0: none)')
+    parser.addoption('--stats-recover', default=None, dest='stats_recover',
+                     help='replay the checkpoint log of a session that died through the reporters and exit')
+    parser.addoption('--stats-sample-rate', type=float, default=1.0, dest='stats_sample_rate',
+                     help='fraction of the passing tests reported in full, the same ones in every run - the others '
+                          'are only counted in TestSessionData.sampling (default: 1, all of them)')
+    parser.addoption('--stats-sample-slow', type=float, default=1.0, dest='stats_sample_slow',
+                     help='with --stats-sample-rate, tests slower than N seconds are always reported in full '
+                          '(default: 1)')
@@ -0,0 +1,39 @@
+# pylint: disable=import-outside-toplevel
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from _pytest.config import Config
+
+
+def register_plugins(config: 'Config', collect: bool) -> None:
+    """
+    registers the collection engine when collect is set, along with its optional parts, only importing the ones
+    enabled by their options
+    """
+    option = config.option
+    if option.stats_order_by_duration:
+        from pytest_stats.duration_ordering import DurationOrdering
+        config.pluginmanager.register(
+            DurationOrdering(option.stats_order_by_duration, xdist_groups=option.stats_xdist_lpt_groups),
+            'pytest_stats_duration_ordering')
+    if not collect:
+        return
+    from pytest_stats import collector
+    config.pluginmanager.register(collector, collector.PLUGIN_NAME)
+    from pytest_stats.collection_profiling import CollectionProfiler
+    config.pluginmanager.register(CollectionProfiler(), 'pytest_stats_collection_profiler')
+    from pytest_stats.fixture_timing import FixtureTiming
+    config.pluginmanager.register(FixtureTiming(), 'pytest_stats_fixture_timing')
+    if option.stats_xdist_aggregate:
+        from pytest_stats import xdist_aggregation
+        xdist_aggregation.register(config)
+    if option.stats_checkpoint:
+        from pytest_stats.builtin_reporters import worker_path
+        from pytest_stats.checkpoint import Checkpoint
+        config.pluginmanager.register(Checkpoint(worker_path(option.stats_checkpoint),
+                                                 heartbeat=option.stats_checkpoint_heartbeat),
+                                      'pytest_stats_checkpoint')
+    if option.stats_resource_usage:
+        from pytest_stats.resource_usage import ResourceUsage
+        config.pluginmanager.register(ResourceUsage(tracemalloc=option.stats_tracemalloc),
+                                      'pytest_stats_resource_usage')
@@ -0,0 +1,40 @@
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from pytest_stats.reporters_registry import ResultsReporter
+    from pytest_stats.test_item_data import TestItemData
+
+
+class ReportBatcher:
+    """
+    Collects tests per reporter, and hands over a batch once it reached max_size items or once its oldest item has
+    waited max_interval seconds
+    """
+
+    def __init__(self, max_size: int = 100, max_interval: float = 10.0,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_size = max_size
+        self.max_interval = max_interval
+        self._clock = clock
+        self._batches: Dict['ResultsReporter', List['TestItemData']] = {}
+        self._opened_at: Dict['ResultsReporter', float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, reporter: 'ResultsReporter', test_data: 'TestItemData') -> Optional[List['TestItemData']]:
+        with self._lock:
+            batch = self._batches.setdefault(reporter, [])
+            now = self._clock()
+            if not batch:
+                self._opened_at[reporter] = now
+            batch.append(test_data)
+            if len(batch) >= self.max_size or now - self._opened_at[reporter] >= self.max_interval:
+                return self._batches.pop(reporter)
+            return None
+
+    def drain(self) -> List[Tuple['ResultsReporter', List['TestItemData']]]:
+        with self._lock:
+            batches = [(reporter, batch) for (reporter, batch) in self._batches.items() if batch]
+            self._batches.clear()
+            return batches
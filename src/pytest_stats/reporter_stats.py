@@ -0,0 +1,30 @@
+from typing import Any, Dict, Optional
+
+
+class ReporterStats:
+    """ time spent in a single reporter, and the reason it was detached by the circuit breaker (if it was) """
+    __slots__ = ('calls', 'total', 'max', 'errors', 'consecutive_failures', 'detached')
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.detached: Optional[str] = None
+
+    def record(self, duration: float, failed: bool, latency_budget: Optional[float]) -> None:
+        """ a failure is a call that raised, or that took longer than the latency budget """
+        self.calls += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        if failed:
+            self.errors += 1
+        if failed or (latency_budget is not None and duration > latency_budget):
+            self.consecutive_failures += 1
+        else:
+            self.consecutive_failures = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {'calls': self.calls, 'total': self.total, 'max': self.max, 'errors': self.errors,
+                'detached': self.detached}
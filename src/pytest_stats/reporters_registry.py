@@ -1,15 +1,28 @@
+import itertools
 import logging
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Set
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence
+
+from pytest_stats.report_batcher import ReportBatcher
+from pytest_stats.reporter_stats import ReporterStats
 
 if TYPE_CHECKING:
+    from pytest_stats.async_dispatcher import AsyncDispatcher, DispatcherCounters
+    from pytest_stats.failures import Failure
     from pytest_stats.test_session_data import TestSessionData
     from pytest_stats.test_item_data import TestItemData
 
 logger = logging.getLogger(__name__)
+OPTIONAL_FIELDS = ('marks', 'test_output', 'stack_trace', 'fixtures')
 
 
 class ResultsReporter(ABC):
+    # the OPTIONAL_FIELDS this reporter reads - the ones no registered reporter requires aren't collected.
+    # None means all of them
+    required_fields: Optional[FrozenSet[str]] = None
+
     @abstractmethod
     def report_session_start(self, session_data: 'TestSessionData') -> None:
         pass
@@ -22,33 +35,165 @@ class ResultsReporter(ABC):
     def report_test(self, test_data: 'TestItemData') -> None:
         pass
 
+    def report_tests(self, batch: Sequence['TestItemData']) -> None:
+        """
+        Optional bulk alternative to report_test. Reporters overriding it get their tests in batches, bounded by
+        --stats-batch-size and --stats-batch-interval, instead of one call per test
+        """
+        for test_data in batch:
+            self.report_test(test_data=test_data)
+
+    def report_failure(self, failure: 'Failure') -> None:
+        """
+        Optional - called once for every unique failure text of the session, before the first test that references it
+        by its failure_digest
+        """
+
+    def report_collection(self, collectors: Sequence[Dict[str, Any]]) -> None:
+        """ Optional - called once the tests were collected, with the timing record of every collector """
+
+    @classmethod
+    def supports_batches(cls) -> bool:
+        return cls.report_tests is not ResultsReporter.report_tests
+
+
+class _Registration(NamedTuple):
+    reporter: ResultsReporter
+    priority: int
+    name: str
+    stats: ReporterStats
+    lock: threading.Lock
+
 
 # noinspection PyBroadException
 class ReportersRegistry:
+    """
+    The session's reporters, called by descending priority and then by registration order.
+    Calls to a reporter are serialized, even when several async dispatch workers report tests at once.
+    The time spent in every reporter is measured, and a circuit breaker detaches reporters that fail (raise or exceed
+    the latency budget) max_failures times in a row
+    """
+
     def __init__(self) -> None:
-        self._reporters: Set[ResultsReporter] = set()
+        self._registrations: List[_Registration] = []
+        self._dispatcher: Optional['AsyncDispatcher'] = None
+        self._batcher = ReportBatcher()
+        self._required_fields: Optional[FrozenSet[str]] = frozenset()
+        self._max_failures = 5
+        self._latency_budget: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._registrations)
+
+    @property
+    def reporters(self) -> List[ResultsReporter]:
+        return [registration.reporter for registration in self._registrations]
+
+    def register(self, reporter: ResultsReporter, priority: int = 0) -> None:
+        """ reporters with a higher priority are called first """
+        name = type(reporter).__name__
+        taken = {registration.name for registration in self._registrations}
+        if name in taken:
+            name = next(f'{name}#{i}' for i in itertools.count(2) if f'{name}#{i}' not in taken)
+        self._registrations.append(_Registration(reporter, priority, name, ReporterStats(), threading.Lock()))
+        self._registrations.sort(key=lambda registration: -registration.priority)
+        self.require_fields(reporter.required_fields if isinstance(reporter, ResultsReporter) else None)
+        logger.debug('registered reporter %s with priority %s', reporter, priority)
+
+    def set_circuit_breaker(self, max_failures: int, latency_budget: Optional[float]) -> None:
+        """ max_failures 0 never detaches a reporter, latency_budget is in seconds per call (None for no budget) """
+        self._max_failures = max_failures
+        self._latency_budget = latency_budget
+
+    def reporter_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {registration.name: registration.stats.as_dict() for registration in self._registrations}
+
+    def require_fields(self, fields: Optional[Iterable[str]]) -> None:
+        """ optional fields to collect regardless of the registered reporters - None for all of them """
+        if fields is None:
+            self._required_fields = None
+        elif self._required_fields is not None:
+            self._required_fields = self._required_fields.union(fields)
 
-    def register(self, reporter: ResultsReporter) -> None:
-        self._reporters.add(reporter)
-        logger.debug('registered reporter %s', reporter)
+    def collects(self, field: str) -> bool:
+        return self._required_fields is None or field in self._required_fields
+
+    def enable_async_dispatch(self, max_size: int = 1000, workers: int = 1, backpressure: str = 'block') -> None:
+        from pytest_stats.async_dispatcher import AsyncDispatcher  # pylint: disable=import-outside-toplevel
+        self._dispatcher = AsyncDispatcher(self._dispatch_test, max_size=max_size, workers=workers,
+                                           backpressure=backpressure)
+        logger.debug('reporting tests asynchronously with %s workers, backpressure: %s', workers, backpressure)
+
+    def set_batch_window(self, max_size: int, max_interval: float) -> None:
+        self._batcher.max_size = max_size
+        self._batcher.max_interval = max_interval
+
+    @property
+    def dispatcher_counters(self) -> Optional['DispatcherCounters']:
+        return self._dispatcher.counters if self._dispatcher is not None else None
+
+    def flush(self) -> None:
+        if self._dispatcher is not None:
+            self._dispatcher.close()
+            logger.info('async reporting done: %s', self._dispatcher.counters)
+        batches = dict(self._batcher.drain())
+        for registration in self._registrations:
+            if registration.reporter in batches:
+                self._report_batch(registration, batches[registration.reporter])
 
     def report_test(self, test_data: 'TestItemData') -> None:
-        for reporter in self._reporters:
-            try:
-                reporter.report_test(test_data=test_data)
-            except Exception:  # pylint:disable=broad-exception-caught
-                logger.exception('failed to report test to %s', reporter)
+        if self._dispatcher is not None:
+            self._dispatcher.submit(test_data)
+        else:
+            self._dispatch_test(test_data)
+
+    def _dispatch_test(self, test_data: 'TestItemData') -> None:
+        for registration in self._registrations:
+            reporter = registration.reporter
+            if registration.stats.detached is not None:
+                continue
+            if isinstance(reporter, ResultsReporter) and reporter.supports_batches():
+                batch = self._batcher.add(reporter, test_data)
+                if batch is not None:
+                    self._report_batch(registration, batch)
+                continue
+            self._call(registration, 'report test', reporter.report_test, test_data=test_data)
+
+    def _report_batch(self, registration: _Registration, batch: Sequence['TestItemData']) -> None:
+        if registration.stats.detached is None:
+            self._call(registration, f'report {len(batch)} tests', registration.reporter.report_tests, batch=batch)
 
     def report_session_start(self, session_data: 'TestSessionData') -> None:
-        for reporter in self._reporters:
-            try:
-                reporter.report_session_start(session_data=session_data)
-            except Exception:  # pylint:disable=broad-exception-caught
-                logger.exception('failed to report session start to %s', reporter)
+        self._broadcast('report_session_start', session_data=session_data)
 
     def report_session_finish(self, session_data: 'TestSessionData') -> None:
-        for reporter in self._reporters:
+        self._broadcast('report_session_finish', session_data=session_data)
+
+    def report_failure(self, failure: 'Failure') -> None:
+        self._broadcast('report_failure', optional=True, failure=failure)
+
+    def report_collection(self, collectors: Sequence[Dict[str, Any]]) -> None:
+        self._broadcast('report_collection', optional=True, collectors=collectors)
+
+    def _broadcast(self, method: str, optional: bool = False, **kwargs: Any) -> None:
+        """ optional methods are only called on ResultsReporter subclasses """
+        for registration in self._registrations:
+            reporter = registration.reporter
+            if registration.stats.detached is None and (isinstance(reporter, ResultsReporter) or not optional):
+                self._call(registration, method.replace('_', ' '), getattr(reporter, method), **kwargs)
+
+    def _call(self, registration: _Registration, action: str, method: Callable[..., None], **kwargs: Any) -> None:
+        with registration.lock:
+            started = time.perf_counter()
+            failed = False
             try:
-                reporter.report_session_finish(session_data=session_data)
+                method(**kwargs)
             except Exception:  # pylint:disable=broad-exception-caught
-                logger.exception('failed to report session finish to %s', reporter)
+                failed = True
+                logger.exception('failed to %s to %s', action, registration.reporter)
+            stats = registration.stats
+            stats.record(time.perf_counter() - started, failed, self._latency_budget)
+            if 0 < self._max_failures <= stats.consecutive_failures and stats.detached is None:
+                stats.detached = 'errors' if failed else 'latency'
+                logger.warning('detached reporter %s after %s failures in a row (%s)', registration.reporter,
+                               stats.consecutive_failures, stats.detached)
@@ -0,0 +1,106 @@
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from typing import TYPE_CHECKING, Any, Dict, Generator, Optional, Tuple
+
+import pytest
+
+from pytest_stats.stash import get_test_item_data
+
+try:
+    import resource
+except ImportError:  # not available on windows
+    resource = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from _pytest.main import Session
+    from _pytest.nodes import Item
+    from _pytest.runner import CallInfo
+
+_STATM = '/proc/self/statm'
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+# ru_maxrss is in kilobytes on linux, in bytes on macOS
+_MAXRSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+
+
+def current_rss() -> Optional[int]:
+    """ resident set size of this process in bytes, where /proc is available """
+    try:
+        with open(_STATM, 'rb') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+class GcMonitor:
+    """ counts the garbage collections and sums their pauses through gc.callbacks """
+
+    def __init__(self) -> None:
+        self.collections = 0
+        self.pause = 0.0
+        self._started: Optional[float] = None
+
+    def __call__(self, phase: str, info: Dict[str, Any]) -> None:  # pylint:disable=unused-argument
+        if phase == 'start':
+            self._started = time.perf_counter()
+        elif self._started is not None:
+            self.collections += 1
+            self.pause += time.perf_counter() - self._started
+            self._started = None
+
+
+class ResourceUsage:
+    """
+    Samples the resources every test used, from the start of its protocol to its teardown report: user and system CPU
+    time (resource.getrusage), the RSS delta and peak RSS, the peak traced memory when tracemalloc is tracing, and the
+    number and total pause of the garbage collections.
+    The sample is finished at the teardown report, before --stats-xdist-aggregate sends the test to the controller
+    """
+
+    def __init__(self, tracemalloc: bool = False) -> None:  # pylint:disable=redefined-outer-name
+        self._start_tracemalloc = tracemalloc
+        self._gc = GcMonitor()
+        self._sample: Optional[Tuple[Any, Optional[int], int, float, bool]] = None
+
+    def pytest_sessionstart(self, session: 'Session') -> None:  # pylint:disable=unused-argument
+        if self._start_tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        gc.callbacks.append(self._gc)
+
+    def pytest_sessionfinish(self, session: 'Session') -> None:  # pylint:disable=unused-argument
+        if self._gc in gc.callbacks:
+            gc.callbacks.remove(self._gc)
+        if self._start_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @pytest.hookimpl(hookwrapper=True, trylast=True)
+    def pytest_runtest_protocol(self) -> Generator[None, Any, None]:
+        tracing = tracemalloc.is_tracing() and hasattr(tracemalloc, 'reset_peak')
+        if tracing:
+            tracemalloc.reset_peak()
+        self._sample = (resource.getrusage(resource.RUSAGE_SELF) if resource is not None else None, current_rss(),
+                        self._gc.collections, self._gc.pause, tracing)
+        yield
+        self._sample = None
+
+    @pytest.hookimpl(hookwrapper=True, trylast=True)
+    def pytest_runtest_makereport(self, item: 'Item', call: 'CallInfo[None]') -> Generator[None, Any, None]:
+        yield
+        if call.when != 'teardown' or self._sample is None:
+            return
+        usage, rss, collections, pause, tracing = self._sample
+        test_data = get_test_item_data(item)
+        if tracing:
+            test_data.traced_memory_peak = tracemalloc.get_traced_memory()[1]
+        test_data.gc_collections = self._gc.collections - collections
+        test_data.gc_pause = self._gc.pause - pause
+        end_rss = current_rss()
+        if rss is not None and end_rss is not None:
+            test_data.rss_delta = end_rss - rss
+        if usage is not None:
+            end_usage = resource.getrusage(resource.RUSAGE_SELF)
+            test_data.cpu_user = end_usage.ru_utime - usage.ru_utime
+            test_data.cpu_system = end_usage.ru_stime - usage.ru_stime
+            test_data.peak_rss = end_usage.ru_maxrss * _MAXRSS_UNIT
@@ -0,0 +1,38 @@
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    from pytest_stats.test_item_data import TestItemData
+
+
+def total_duration(test_data: 'TestItemData') -> float:
+    start = getattr(test_data, 'test_start_protocol', None)
+    end = getattr(test_data, 'test_end_protocol', None)
+    if start is not None and end is not None:
+        return end - start
+    return sum(getattr(test_data, f'test_duration_{when}', 0.0) for when in ('setup', 'call', 'teardown'))
+
+
+class RunSummary:
+    """ running aggregates of the reported tests, so a summary doesn't require keeping the tests around """
+
+    def __init__(self) -> None:
+        self.outcomes: Dict[str, int] = {}
+        self.tests = 0
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+        self.slowest_test: Optional[str] = None
+
+    def add(self, test_data: 'TestItemData') -> None:
+        self.tests += 1
+        outcome = test_data.outcome
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        duration = total_duration(test_data)
+        self.total_duration += duration
+        if self.slowest_test is None or duration > self.max_duration:
+            self.max_duration = duration
+            self.slowest_test = getattr(test_data, 'fullname', getattr(test_data, 'name', None))
+
+    def __str__(self: 'RunSummary') -> str:
+        outcomes = ', '.join(f'{outcome}: {count}' for (outcome, count) in sorted(self.outcomes.items()))
+        return (f'tests: {self.tests} ({outcomes}), total duration: {self.total_duration:.3f}s, '
+                f'max duration: {self.max_duration:.3f}s ({self.slowest_test})')
@@ -0,0 +1,72 @@
+import bisect
+import hashlib
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    from _pytest.main import Session
+    from pytest_stats.test_item_data import TestItemData
+
+SAMPLER_KEY = 'stats_sampler'
+# upper bounds, in seconds, of the duration histogram buckets - 1ms doubling up to ~65s
+HISTOGRAM_BOUNDS = tuple(0.001 * 2 ** i for i in range(17))
+_HISTOGRAM_KEYS = tuple(f'{bound:g}' for bound in HISTOGRAM_BOUNDS) + ('+Inf',)
+
+
+def duration(test_data: 'TestItemData') -> float:
+    """ setup + call + teardown """
+    return sum(getattr(test_data, f'test_duration_{when}', None) or 0.0 for when in ('setup', 'call', 'teardown'))
+
+
+class Sampler:
+    """
+    Decides which tests keep their full detail: failures, reruns, tests slower than slow_threshold seconds, and a
+    rate fraction of the rest, chosen by a hash of their fullname so the same tests are sampled in every run.
+    The other tests are only summed up into summary - counts by outcome and a duration histogram
+    """
+
+    def __init__(self, rate: float, slow_threshold: float) -> None:
+        self.rate = rate
+        self.slow_threshold = slow_threshold
+        self._hash_threshold = int(rate * 2 ** 64)
+        self.summary: Dict[str, Any] = {
+            'rate': rate, 'detailed': 0, 'summarized': 0, 'duration': 0.0, 'outcomes': {},
+            'histogram': dict.fromkeys(_HISTOGRAM_KEYS, 0),
+        }
+
+    def sampled(self, fullname: str) -> bool:
+        digest = hashlib.blake2b(fullname.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big') < self._hash_threshold
+
+    def keep(self, test_data: 'TestItemData') -> bool:
+        return (test_data.outcome in ('failed', 'error')
+                or bool(getattr(test_data, 'rerun_number', 0))
+                or duration(test_data) >= self.slow_threshold
+                or self.sampled(getattr(test_data, 'fullname', '')))
+
+    def summarize(self, test_data: 'TestItemData') -> None:
+        test_duration = duration(test_data)
+        summary = self.summary
+        summary['summarized'] += 1
+        summary['duration'] += test_duration
+        outcomes = summary['outcomes']
+        outcomes[test_data.outcome] = outcomes.get(test_data.outcome, 0) + 1
+        summary['histogram'][_HISTOGRAM_KEYS[bisect.bisect_left(HISTOGRAM_BOUNDS, test_duration)]] += 1
+
+    def merge(self, summary: Dict[str, Any]) -> None:
+        """ adds the summary of another sampler, e.g. of an xdist worker """
+        for field in ('detailed', 'summarized', 'duration'):
+            self.summary[field] += summary.get(field, 0)
+        for field in ('outcomes', 'histogram'):
+            counts = self.summary[field]
+            for key, count in summary.get(field, {}).items():
+                counts[key] = counts.get(key, 0) + count
+
+
+def sampler(session: 'Session') -> Optional[Sampler]:
+    return session.stash.get(SAMPLER_KEY, None)  # type: ignore[arg-type]
+
+
+def keeps_detail(session: 'Session', test_data: 'TestItemData') -> bool:
+    """ whether the test is reported in full - always, unless sampling is on """
+    session_sampler = sampler(session)
+    return session_sampler is None or session_sampler.keep(test_data)
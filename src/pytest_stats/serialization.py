@@ -0,0 +1,59 @@
+import json
+from typing import Any, Dict, List, Sequence, Tuple, get_type_hints
+
+from pytest_stats.test_item_data import TestItemData, TEST_ITEM_FIELDS
+from pytest_stats.test_session_data import TestSessionData
+
+TEST_SESSION_FIELDS: Tuple[str, ...] = tuple(get_type_hints(TestSessionData))
+_OPTIONAL_ITEM_FIELDS = {field for (field, hint) in get_type_hints(TestItemData).items()
+                         if type(None) in getattr(hint, '__args__', ())}
+_MARKS_POSITION = TEST_ITEM_FIELDS.index('marks')
+
+
+def to_json_value(value: Any) -> Any:
+    """ json.dumps default - mark sets become sorted lists, anything else unknown is stringified """
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return str(value)
+
+
+def item_record(test_data: 'TestItemData', record_type: str = 'test') -> Dict[str, Any]:
+    record: Dict[str, Any] = {'type': record_type}
+    for field in TEST_ITEM_FIELDS:
+        record[field] = getattr(test_data, field, None)
+    record.update(test_data.custom_fields)
+    return record
+
+
+def session_record(session_data: 'TestSessionData', record_type: str) -> Dict[str, Any]:
+    """ the known session fields, followed by any environment data added through pytest_stats_env_data """
+    record: Dict[str, Any] = {'type': record_type}
+    for field in TEST_SESSION_FIELDS:
+        record[field] = getattr(session_data, field, None)
+    for field, value in vars(session_data).items():
+        record.setdefault(field, value)
+    return record
+
+
+def json_safe(record: Dict[str, Any]) -> Dict[str, Any]:
+    return json.loads(json.dumps(record, default=to_json_value))
+
+
+def item_values(test_data: 'TestItemData') -> List[Any]:
+    """ compact positional form of a test - the values of TEST_ITEM_FIELDS, followed by the custom attributes """
+    values: List[Any] = [getattr(test_data, field, None) for field in TEST_ITEM_FIELDS]
+    values[_MARKS_POSITION] = sorted(values[_MARKS_POSITION] or ())
+    custom_fields = test_data.custom_fields
+    values.append(json_safe(custom_fields) if custom_fields else None)
+    return values
+
+
+def item_from_values(values: Sequence[Any]) -> 'TestItemData':
+    test_data = TestItemData()
+    for field, value in zip(TEST_ITEM_FIELDS, values):
+        if value is not None or field in _OPTIONAL_ITEM_FIELDS:
+            setattr(test_data, field, value)
+    test_data.marks = set(values[_MARKS_POSITION])
+    for field, value in (values[len(TEST_ITEM_FIELDS)] or {}).items():
+        setattr(test_data, field, value)
+    return test_data
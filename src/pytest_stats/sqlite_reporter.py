@@ -0,0 +1,141 @@
+import json
+import logging
+import sqlite3
+import threading
+from typing import TYPE_CHECKING, Optional, Sequence, List, Tuple, Any, Dict
+
+from pytest_stats.failures import failure_digest
+from pytest_stats.reporters_registry import ResultsReporter
+from pytest_stats.serialization import TEST_SESSION_FIELDS, to_json_value
+
+if TYPE_CHECKING:
+    from pytest_stats.test_item_data import TestItemData
+    from pytest_stats.test_session_data import TestSessionData
+
+logger = logging.getLogger(__name__)
+
+TEST_COLUMNS = (
+    'test_id', 'fullname', 'name', 'rerun_number', 'xdist_worker_id', 'test_start_protocol', 'test_end_protocol',
+    'test_start_setup', 'test_end_setup', 'test_duration_setup', 'result_setup',
+    'test_start_call', 'test_end_call', 'test_duration_call', 'result_call',
+    'test_start_teardown', 'test_end_teardown', 'test_duration_teardown', 'result_teardown', 'test_output',
+    'cpu_user', 'cpu_system', 'rss_delta', 'peak_rss', 'traced_memory_peak', 'gc_collections', 'gc_pause',
+)
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY, session_id TEXT, xdist_worker_id TEXT, status TEXT, start_time REAL, end_time REAL,
+    collected_tests INTEGER, failed_tests INTEGER, fail_msg TEXT, stack_trace TEXT, env TEXT);
+CREATE TABLE IF NOT EXISTS tests (
+    id INTEGER PRIMARY KEY, session_ref INTEGER REFERENCES sessions(id), session_id TEXT, session_start REAL,
+    {', '.join(TEST_COLUMNS)});
+CREATE TABLE IF NOT EXISTS marks (test_ref INTEGER REFERENCES tests(id), mark TEXT);
+CREATE TABLE IF NOT EXISTS failures (
+    test_ref INTEGER REFERENCES tests(id), fail_msg TEXT, stack_trace TEXT, digest TEXT);
+CREATE TABLE IF NOT EXISTS failure_texts (digest TEXT PRIMARY KEY, fail_msg TEXT, stack_trace TEXT);
+CREATE TABLE IF NOT EXISTS fixtures (
+    test_ref INTEGER REFERENCES tests(id), name TEXT, scope TEXT, phase TEXT, start REAL, duration REAL, cached INTEGER);
+CREATE INDEX IF NOT EXISTS tests_fullname_session_start ON tests(fullname, session_start);
+CREATE INDEX IF NOT EXISTS tests_session_id ON tests(session_id);
+CREATE INDEX IF NOT EXISTS marks_mark ON marks(mark);
+CREATE INDEX IF NOT EXISTS sessions_session_id ON sessions(session_id);
+"""
+_INSERT_TEST = (f"INSERT INTO tests (id, session_ref, session_id, session_start, {', '.join(TEST_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * (len(TEST_COLUMNS) + 4))})")
+FIXTURE_COLUMNS = ('name', 'scope', 'phase', 'start', 'duration', 'cached')
+_INSERT_FIXTURE = (f"INSERT INTO fixtures (test_ref, {', '.join(FIXTURE_COLUMNS)}) "
+                   f"VALUES ({', '.join('?' * (len(FIXTURE_COLUMNS) + 1))})")
+# columns added after the tables were first released, added to older databases by _add_missing_columns
+_MIGRATED_COLUMNS = {'tests': TEST_COLUMNS, 'failures': ('digest',)}
+_SESSION_COLUMNS = ('status', 'end_time', 'collected_tests', 'failed_tests', 'fail_msg', 'stack_trace')
+
+
+class SqliteReporter(ResultsReporter):
+    """
+    Keeps the sessions and their tests in a local SQLite database (WAL mode), with the marks and failures normalized
+    to their own tables. Every failure text is stored once in failure_texts, failures reference it by digest.
+    Tests arrive in batches (see report_tests), each batch is written in a single transaction.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._session_ref: Optional[int] = None
+        self._session_start: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def report_session_start(self, session_data: 'TestSessionData') -> None:
+        self._connection = sqlite3.connect(self.path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.executescript(SCHEMA)
+        self._add_missing_columns()
+        env = {k: v for (k, v) in vars(session_data).items() if k not in TEST_SESSION_FIELDS}
+        self._session_start = getattr(session_data, 'start_time', None)
+        cursor = self._connection.execute(
+            'INSERT INTO sessions (session_id, xdist_worker_id, start_time, env) VALUES (?, ?, ?, ?)',
+            (getattr(session_data, 'session_id', None), getattr(session_data, 'xdist_worker_id', None),
+             self._session_start, json.dumps(env, default=to_json_value)))
+        self._session_ref = cursor.lastrowid
+        logger.debug('writing stats to %s, session row %s', self.path, self._session_ref)
+
+    def report_test(self, test_data: 'TestItemData') -> None:
+        self.report_tests(batch=[test_data])
+
+    def report_tests(self, batch: Sequence['TestItemData']) -> None:
+        assert self._connection is not None, 'report_session_start was not called'
+        with self._lock:
+            self._connection.execute('BEGIN IMMEDIATE')
+            try:
+                first_id = self._connection.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM tests').fetchone()[0]
+                tests, marks, failures, failure_texts, fixtures = self._rows(first_id, batch)
+                self._connection.executemany(_INSERT_TEST, tests)
+                self._connection.executemany('INSERT INTO marks (test_ref, mark) VALUES (?, ?)', marks)
+                self._connection.executemany(
+                    'INSERT OR IGNORE INTO failure_texts (digest, fail_msg, stack_trace) VALUES (?, ?, ?)',
+                    failure_texts)
+                self._connection.executemany(
+                    'INSERT INTO failures (test_ref, fail_msg, digest) VALUES (?, ?, ?)', failures)
+                self._connection.executemany(_INSERT_FIXTURE, fixtures)
+                self._connection.execute('COMMIT')
+            except BaseException:
+                self._connection.execute('ROLLBACK')
+                raise
+
+    def report_session_finish(self, session_data: 'TestSessionData') -> None:
+        assert self._connection is not None, 'report_session_start was not called'
+        with self._lock:
+            self._connection.execute(
+                f"UPDATE sessions SET {', '.join(f'{column} = ?' for column in _SESSION_COLUMNS)} WHERE id = ?",
+                tuple(getattr(session_data, column, None) for column in _SESSION_COLUMNS) + (self._session_ref,))
+            self._connection.close()
+            self._connection = None
+
+    def _add_missing_columns(self) -> None:
+        """ databases created by older versions lack the newer columns """
+        assert self._connection is not None
+        for table, columns in _MIGRATED_COLUMNS.items():
+            existing = {row[1] for row in self._connection.execute(f'PRAGMA table_info({table})')}
+            for column in columns:
+                if column not in existing:
+                    self._connection.execute(f'ALTER TABLE {table} ADD COLUMN {column}')
+        self._connection.execute('CREATE INDEX IF NOT EXISTS failures_digest ON failures(digest)')
+
+    def _rows(self, first_id: int, batch: Sequence['TestItemData']) -> Tuple[List[Tuple[Any, ...]], ...]:
+        tests: List[Tuple[Any, ...]] = []
+        marks: List[Tuple[Any, ...]] = []
+        failures: List[Tuple[Any, ...]] = []
+        failure_texts: Dict[str, Tuple[Any, ...]] = {}
+        fixtures: List[Tuple[Any, ...]] = []
+        for test_ref, test_data in enumerate(batch, start=first_id):
+            values = tuple(getattr(test_data, 'id' if column == 'test_id' else column, None) for column in TEST_COLUMNS)
+            tests.append((test_ref, self._session_ref, getattr(test_data, 'session_id', None), self._session_start)
+                         + values)
+            marks.extend((test_ref, mark) for mark in getattr(test_data, 'marks', ()))
+            fail_msg, stack_trace = getattr(test_data, 'fail_msg', None), getattr(test_data, 'stack_trace', None)
+            if fail_msg is not None or stack_trace is not None:
+                digest = getattr(test_data, 'failure_digest', None) or failure_digest(fail_msg, stack_trace)
+                failure_texts.setdefault(digest, (digest, fail_msg, stack_trace))
+                failures.append((test_ref, fail_msg, digest))
+            fixtures.extend((test_ref,) + tuple(record.get(column) for column in FIXTURE_COLUMNS)
+                            for record in getattr(test_data, 'fixtures', ()))
+        return tests, marks, failures, list(failure_texts.values()), fixtures
@@ -0,0 +1,71 @@
+import traceback
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Tuple
+
+if TYPE_CHECKING:
+    from _pytest._code import ExceptionInfo
+    from _pytest.config import Config
+
+# filename, line number, function name
+Frame = Tuple[str, int, str]
+
+
+def truncate(text: str, max_size: int) -> str:
+    """ max_size 0 keeps the whole text """
+    if not max_size or len(text) <= max_size:
+        return text
+    return f'{text[:max_size]}... [{len(text) - max_size} characters truncated]'
+
+
+class StackTrace:
+    """ the frame summaries of a failure - the text is rendered once, and only when it's read """
+    __slots__ = ('frames', 'max_size', '_text')
+
+    def __init__(self, frames: Tuple[Frame, ...], max_size: int = 0) -> None:
+        self.frames = frames
+        self.max_size = max_size
+        self._text: Optional[str] = None
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__}: {len(self.frames)} frames>'
+
+    @property
+    def key(self) -> str:
+        """ identifies the frames without rendering them """
+        return '\n'.join(f'{filename}:{lineno}:{name}' for (filename, lineno, name) in self.frames)
+
+    def render(self) -> str:
+        if self._text is None:
+            summaries = [traceback.FrameSummary(filename, lineno, name) for (filename, lineno, name) in self.frames]
+            self._text = truncate('\n'.join(traceback.format_list(summaries)), self.max_size)
+        return self._text
+
+
+def capture_options(config: 'Config') -> Dict[str, Any]:
+    """ the capture_stack_trace keyword arguments set by the command line options """
+    return {'max_depth': config.option.stats_stack_depth, 'cut_internal': config.option.stats_stack_cut_internal,
+            'max_size': config.option.stats_failure_max_size}
+
+
+def _walk(tb: Optional[TracebackType]) -> Iterator[Frame]:
+    while tb is not None:
+        yield tb.tb_frame.f_code.co_filename, tb.tb_lineno, tb.tb_frame.f_code.co_name
+        tb = tb.tb_next
+
+
+def capture_stack_trace(excinfo: 'ExceptionInfo[BaseException]', *, max_depth: int = 0, cut_internal: bool = False,
+                        max_size: int = 0) -> StackTrace:
+    """
+    keeps the innermost max_depth frames (0 for all of them). cut_internal drops the frames of pytest and pluggy,
+    and the ones hidden by __tracebackhide__, the way pytest cuts the tracebacks it shows
+    """
+    if cut_internal:
+        from _pytest.python import filter_traceback  # pylint: disable=import-outside-toplevel
+        entries = excinfo.traceback.filter(excinfo)
+        entries = entries.filter(filter_traceback) or entries
+        frames = tuple((entry.frame.code.raw.co_filename, entry.lineno + 1, entry.name) for entry in entries)
+    else:
+        frames = tuple(_walk(excinfo.tb))
+    if max_depth:
+        frames = frames[-max_depth:]
+    return StackTrace(frames, max_size)
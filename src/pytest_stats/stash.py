@@ -0,0 +1,25 @@
+from typing import TYPE_CHECKING
+
+from pytest_stats.test_item_data import TestItemData
+
+if TYPE_CHECKING:
+    from _pytest.main import Session
+    from _pytest.nodes import Item
+    from pytest_stats.reporters_registry import ReportersRegistry
+    from pytest_stats.test_session_data import TestSessionData
+
+TEST_DATA_KEY = 'test_data'
+# seconds spent loading the initial conftest files
+CONFTEST_LOAD_KEY = 'stats_conftest_load'
+
+
+def get_test_item_data(item: 'Item') -> TestItemData:
+    return item.stash.get(TEST_DATA_KEY, TestItemData())  # type: ignore[arg-type]
+
+
+def get_test_session_data(session: 'Session') -> 'TestSessionData':
+    return session.stash['session_data']  # type: ignore[index]
+
+
+def reporters(session: 'Session') -> 'ReportersRegistry':
+    return session.stash['stats_reporters']  # type: ignore[index]
@@ -1,8 +1,41 @@
-from copy import copy
-from typing import Optional, Set
+from typing import AbstractSet, Optional, Dict, Any, List, Tuple, Union, TYPE_CHECKING
+
+from pytest_stats.captured_output import Section, render_sections
+from pytest_stats.stack_traces import StackTrace, capture_stack_trace, truncate
+
+if TYPE_CHECKING:
+    from _pytest._code import ExceptionInfo
+
+TEST_ITEM_FIELDS: Tuple[str, ...] = (
+    'name', 'test_start_protocol', 'test_end_protocol',
+    'test_start_setup', 'test_end_setup', 'test_duration_setup', 'result_setup',
+    'session_id', 'fullname', 'id', 'rerun_number',
+    'test_start_call', 'test_end_call', 'test_duration_call', 'result_call',
+    'test_start_teardown', 'test_end_teardown', 'test_duration_teardown', 'result_teardown',
+    'test_output', 'xdist_worker_id', 'marks', 'fail_msg', 'stack_trace', 'failure_digest', 'fixtures',
+    'cpu_user', 'cpu_system', 'rss_delta', 'peak_rss', 'traced_memory_peak', 'gc_collections', 'gc_pause',
+)
+# sampled with --stats-resource-usage, None otherwise
+RESOURCE_FIELDS = TEST_ITEM_FIELDS[TEST_ITEM_FIELDS.index('cpu_user'):]
+_RESOURCE_FIELDS = frozenset(RESOURCE_FIELDS)
+_STEP_FIELDS = {
+    when: (f'test_start_{when}', f'test_end_{when}', f'test_duration_{when}', f'result_{when}')
+    for when in ('setup', 'call', 'teardown')
+}
+_UNSET = object()
 
 
 class TestItemData:
+    """
+    Fixed schema record of a single test. The fields live in slots and there's no instance __dict__ - custom
+    attributes (e.g. set by users through get_test_item_data) go to a mapping that is only created for the tests that
+    have them.
+    The stack trace of a failure is kept as frame summaries and the captured output as (section, text) pairs, they're
+    only rendered when stack_trace and test_output are first read
+    """
+    __slots__ = TEST_ITEM_FIELDS + ('_pending_stack_trace', '_output_sections', '_custom')
+    __test__ = False
+
     name: str
     test_start_protocol: float
     test_end_protocol: float
@@ -13,7 +46,7 @@ class TestItemData:
     session_id: str
     fullname: str
     id: str
-    rerun_number: str
+    rerun_number: int
     test_start_call: float
     test_end_call: float
     test_duration_call: float
@@ -24,18 +57,142 @@ class TestItemData:
     result_teardown: str
     test_output: str
     xdist_worker_id: Optional[str]
-    marks: Set[str]
+    marks: AbstractSet[str]
     fail_msg: Optional[str]
     stack_trace: Optional[str]
+    failure_digest: Optional[str]
+    fixtures: List[Dict[str, Any]]
+    cpu_user: Optional[float]
+    cpu_system: Optional[float]
+    rss_delta: Optional[int]
+    peak_rss: Optional[int]
+    traced_memory_peak: Optional[int]
+    gc_collections: Optional[int]
+    gc_pause: Optional[float]
+
+    def __init__(self) -> None:
+        self._pending_stack_trace: Optional[StackTrace] = None
+        self._output_sections: Optional[List[Section]] = None
+        self._custom: Optional[Dict[str, Any]] = None
+
+    def __getattr__(self, name: str) -> Any:
+        # only called for unset attributes - a pending stack trace or output is rendered on its first read
+        if name == 'stack_trace' and self._pending_stack_trace is not None:
+            self.stack_trace = self._pending_stack_trace.render()
+            self._pending_stack_trace = None
+            return self.stack_trace
+        if name == 'test_output' and self._output_sections is not None:
+            self.test_output = render_sections(self._output_sections)
+            return self.test_output
+        if name in _RESOURCE_FIELDS:
+            return None
+        if not name.startswith('_') and self._custom is not None and name in self._custom:
+            return self._custom[name]
+        raise AttributeError(f'{self.__class__.__name__!r} object has no attribute {name!r}')
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in _SLOTS:
+            object.__setattr__(self, name, value)
+        elif self._custom is None:
+            self._custom = {name: value}
+        else:
+            self._custom[name] = value
+
+    def __delattr__(self, name: str) -> None:
+        if name in _SLOTS:
+            object.__delattr__(self, name)
+        elif self._custom is not None and name in self._custom:
+            del self._custom[name]
+        else:
+            raise AttributeError(name)
+
+    def __copy__(self) -> 'TestItemData':
+        clone = self.__class__.__new__(self.__class__)
+        for field in _SLOTS:
+            try:
+                object.__setattr__(clone, field, object.__getattribute__(self, field))
+            except AttributeError:
+                pass
+        if self._custom is not None:
+            clone._custom = dict(self._custom)
+        return clone
 
     def __str__(self: 'TestItemData') -> str:
-        d = copy(vars(self))
+        d = self.as_dict()
         if 'test_output' in d:
             d.pop('test_output')
         return f'Test::{self.name}:: {d}>'
 
+    @property
+    def outcome(self) -> str:
+        """ overall outcome - errors in setup or teardown take precedence over the call result """
+        setup, call, teardown = (getattr(self, f'result_{when}', None) for when in ('setup', 'call', 'teardown'))
+        if 'failed' in (setup, teardown):
+            return 'error'
+        if call == 'failed':
+            return 'failed'
+        if 'skipped' in (setup, call):
+            return 'skipped'
+        return 'passed' if call == 'passed' else 'unknown'
+
+    def as_dict(self) -> Dict[str, Any]:
+        """ all the fields that were set, followed by custom attributes """
+        d = {field: value for field in TEST_ITEM_FIELDS if (value := getattr(self, field, _UNSET)) is not _UNSET}
+        d.update(self.custom_fields)
+        return d
+
+    @property
+    def custom_fields(self) -> Dict[str, Any]:
+        """ the custom attributes, which aren't part of TEST_ITEM_FIELDS """
+        return dict(self._custom) if self._custom else {}
+
     def set_step_status(self, when: str, start: float, end: float, duration: float, outcome: str) -> None:
-        setattr(self, f'test_start_{when}', start)
-        setattr(self, f'test_end_{when}', end)
-        setattr(self, f'test_duration_{when}', duration)
-        setattr(self, f'result_{when}', outcome)
+        start_field, end_field, duration_field, result_field = _STEP_FIELDS[when]
+        setattr(self, start_field, start)
+        setattr(self, end_field, end)
+        setattr(self, duration_field, duration)
+        setattr(self, result_field, outcome)
+
+    @property
+    def stack_trace_source(self) -> Union[str, StackTrace, None]:
+        """ the stack trace, without rendering it when it's pending """
+        try:
+            return object.__getattribute__(self, 'stack_trace')  # type: ignore[no-any-return]
+        except AttributeError:
+            return self._pending_stack_trace
+
+    def set_stack_trace(self, stack_trace: Union[str, StackTrace, None]) -> None:
+        """ a StackTrace is rendered when stack_trace is first read """
+        if isinstance(stack_trace, StackTrace):
+            try:
+                del self.stack_trace
+            except AttributeError:
+                pass
+            self._pending_stack_trace = stack_trace
+        else:
+            self._pending_stack_trace = None
+            self.stack_trace = stack_trace
+
+    @property
+    def output_sections(self) -> Optional[List[Section]]:
+        """ the captured output as (section, text) pairs, None when it wasn't captured """
+        return self._output_sections
+
+    def set_output(self, sections: List[Section]) -> None:
+        """ test_output is rendered from the sections when it's first read """
+        try:
+            del self.test_output
+        except AttributeError:
+            pass
+        self._output_sections = sections
+
+    def set_failure(self, excinfo: 'ExceptionInfo[BaseException]', with_stack_trace: bool = True, *,
+                    max_depth: int = 0, cut_internal: bool = False, max_size: int = 0) -> None:
+        """ see capture_stack_trace for max_depth and cut_internal, max_size caps the message and the stack trace """
+        self.fail_msg = truncate(str(excinfo.value), max_size)
+        if with_stack_trace:
+            self.set_stack_trace(capture_stack_trace(excinfo, max_depth=max_depth, cut_internal=cut_internal,
+                                                     max_size=max_size))
+
+
+_SLOTS = frozenset(TestItemData.__slots__)
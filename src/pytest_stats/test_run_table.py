@@ -0,0 +1,125 @@
+import math
+import sys
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union, AbstractSet
+
+from pytest_stats.marks import MarkCache
+from pytest_stats.test_item_data import RESOURCE_FIELDS, TestItemData
+
+FLOAT_COLUMNS = (
+    'test_start_protocol', 'test_end_protocol',
+    'test_start_setup', 'test_end_setup', 'test_duration_setup',
+    'test_start_call', 'test_end_call', 'test_duration_call',
+    'test_start_teardown', 'test_end_teardown', 'test_duration_teardown',
+)
+STRING_COLUMNS = (
+    'name', 'session_id', 'fullname', 'id', 'result_setup', 'result_call', 'result_teardown', 'xdist_worker_id',
+    'failure_digest',
+)
+# the resource fields are None when not sampled - NaN in their columns
+RESOURCE_COLUMNS = RESOURCE_FIELDS
+_INT_RESOURCE_COLUMNS = frozenset({'rss_delta', 'peak_rss', 'traced_memory_peak', 'gc_collections'})
+OBJECT_COLUMNS = ('marks', 'fail_msg', 'stack_trace', 'test_output', 'fixtures', 'custom_fields')
+_NO_RERUN = -1
+_UNSET = object()
+
+
+class TestRunTable:
+    """
+    Columnar, array backed storage of the tests of a run.
+    Timestamps, durations and resource usage are kept in array('d') columns (NaN when missing), strings are interned
+    and equal mark sets share a single frozenset, so holding a large run costs a fraction of the matching TestItemData
+    objects. Pending stack traces and captured output are kept unrendered. Captured output is dropped unless
+    keep_output is set.
+    """
+    __test__ = False
+
+    def __init__(self, keep_output: bool = False) -> None:
+        self._keep_output = keep_output
+        self._floats: Dict[str, 'array[float]'] = {column: array('d') for column in FLOAT_COLUMNS + RESOURCE_COLUMNS}
+        self._strings: Dict[str, List[Optional[str]]] = {column: [] for column in STRING_COLUMNS}
+        self._rerun_numbers: 'array[int]' = array('l')
+        self._objects: Dict[str, List[Any]] = {column: [] for column in OBJECT_COLUMNS}
+        self._index: Dict[str, int] = {}
+        self._mark_sets = MarkCache()
+
+    def __len__(self) -> int:
+        return len(self._rerun_numbers)
+
+    def __iter__(self) -> Iterator[TestItemData]:
+        return (self.row(i) for i in range(len(self)))
+
+    def append(self, test_data: TestItemData) -> int:
+        row = len(self)
+        for column, values in self._floats.items():
+            value = getattr(test_data, column, None)
+            values.append(math.nan if value is None else value)
+        for column, strings in self._strings.items():
+            value = getattr(test_data, column, None)
+            strings.append(sys.intern(value) if isinstance(value, str) else value)
+        self._rerun_numbers.append(getattr(test_data, 'rerun_number', _NO_RERUN))
+        self._objects['marks'].append(
+            self._mark_sets.intern(frozenset(test_data.marks or ())) if hasattr(test_data, 'marks') else _UNSET)
+        self._objects['fail_msg'].append(getattr(test_data, 'fail_msg', _UNSET))
+        self._objects['stack_trace'].append(_unrendered(test_data.stack_trace_source, test_data, 'stack_trace'))
+        self._objects['test_output'].append(
+            _unrendered(test_data.output_sections, test_data, 'test_output') if self._keep_output else _UNSET)
+        self._objects['fixtures'].append(getattr(test_data, 'fixtures', _UNSET))
+        self._objects['custom_fields'].append(test_data.custom_fields or _UNSET)
+        test_id = getattr(test_data, 'id', None)
+        if test_id is not None:
+            self._index[test_id] = row
+        return row
+
+    def column(self, name: str) -> Union['array[float]', Sequence[Optional[str]]]:
+        if name in self._floats:
+            return self._floats[name]
+        return self._strings[name]
+
+    def index_of(self, test_id: str) -> Optional[int]:
+        return self._index.get(test_id)
+
+    def get(self, test_id: str) -> Optional[TestItemData]:
+        row = self.index_of(test_id)
+        return None if row is None else self.row(row)
+
+    def marks(self, row: int) -> AbstractSet[str]:
+        marks = self._objects['marks'][row]
+        return frozenset() if marks is _UNSET else marks
+
+    def row(self, row: int) -> TestItemData:
+        """
+        rebuilds the TestItemData of a row. Fields that were never set are left unset - string fields that were set to
+        None too, except xdist_worker_id
+        """
+        test_data = TestItemData()
+        for column, values in self._floats.items():
+            if not math.isnan(values[row]):
+                setattr(test_data, column, int(values[row]) if column in _INT_RESOURCE_COLUMNS else values[row])
+        for column, strings in self._strings.items():
+            if strings[row] is not None or column == 'xdist_worker_id':
+                setattr(test_data, column, strings[row])
+        if self._rerun_numbers[row] != _NO_RERUN:
+            test_data.rerun_number = self._rerun_numbers[row]
+        marks, fail_msg, stack_trace, output, fixtures, custom_fields = (
+            objects[row] for objects in self._objects.values())
+        if marks is not _UNSET:
+            test_data.marks = set(marks)
+        if fail_msg is not _UNSET:
+            test_data.fail_msg = fail_msg
+        if stack_trace is not _UNSET:
+            test_data.set_stack_trace(stack_trace)
+        if isinstance(output, list):
+            test_data.set_output(output)
+        elif output is not _UNSET:
+            test_data.test_output = output
+        if fixtures is not _UNSET:
+            test_data.fixtures = fixtures
+        for name, value in ({} if custom_fields is _UNSET else custom_fields).items():
+            setattr(test_data, name, value)
+        return test_data
+
+
+def _unrendered(source: Any, test_data: TestItemData, field: str) -> Any:
+    """ the pending source of a lazily rendered field, or the field itself - nothing pending means nothing to render """
+    return getattr(test_data, field, _UNSET) if source is None else source
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Dict, Any
 
 
 class TestSessionData:
@@ -11,6 +11,13 @@ class TestSessionData:
     end_time: float
     fail_msg: Optional[str]
     stack_trace: Optional[str]
+    workers: Optional[Dict[str, Dict[str, Any]]]
+    fixtures: Optional[Dict[str, Dict[str, Any]]]
+    reporter_stats: Optional[Dict[str, Dict[str, Any]]]
+    failure_signatures: Optional[Dict[str, int]]
+    collection: Optional[Dict[str, Any]]
+    sampling: Optional[Dict[str, Any]]
+    utilization: Optional[Dict[str, Any]]
 
     def __str__(self: 'TestSessionData') -> str:
         return f'<{self.__class__.__name__}: {str(vars(self))}>'
@@ -0,0 +1,93 @@
+from array import array
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from pytest_stats.duration_ordering import lpt_partition
+
+if TYPE_CHECKING:
+    from _pytest.main import Session
+    from pytest_stats.test_item_data import TestItemData
+
+UTILIZATION_KEY = 'stats_utilization'
+THROUGHPUT_WINDOWS = 10
+
+
+class Utilization:
+    """
+    Sums up how busy the xdist workers were, from the protocol start and end of their tests: busy and idle time per
+    worker, the makespan (first test start to last test end), the tail (from the first worker running out of tests to
+    the end), the throughput in tests/sec over THROUGHPUT_WINDOWS windows, and the ideal makespan - the recorded
+    durations packed into the workers longest first (LPT)
+    """
+
+    def __init__(self) -> None:
+        self._workers: Dict[str, Dict[str, Any]] = {}
+        self._durations = array('d')
+        self._ends = array('d')
+
+    def add(self, test_data: 'TestItemData') -> None:
+        start, end = getattr(test_data, 'test_start_protocol', None), getattr(test_data, 'test_end_protocol', None)
+        if start is not None and end is not None:
+            self.add_span(getattr(test_data, 'xdist_worker_id', None), start, end)
+
+    def add_span(self, worker_id: Optional[str], start: float, end: float) -> None:
+        """ a test protocol of the worker, from start to end """
+        worker_id = worker_id or 'master'
+        worker = self._workers.get(worker_id)
+        if worker is None:
+            worker = self._workers[worker_id] = {'tests': 0, 'busy': 0.0, 'first_start': start, 'last_end': end}
+        worker['tests'] += 1
+        worker['busy'] += end - start
+        worker['first_start'] = min(worker['first_start'], start)
+        worker['last_end'] = max(worker['last_end'], end)
+        self._durations.append(end - start)
+        self._ends.append(end)
+
+    def summary(self) -> Optional[Dict[str, Any]]:
+        if not self._workers:
+            return None
+        run_start = min(worker['first_start'] for worker in self._workers.values())
+        run_end = max(worker['last_end'] for worker in self._workers.values())
+        makespan = run_end - run_start
+        workers = {
+            worker_id: {
+                'tests': worker['tests'], 'busy': worker['busy'], 'idle': makespan - worker['busy'],
+                'tail': run_end - worker['last_end'],
+                'utilization': worker['busy'] / makespan if makespan else 1.0,
+            } for (worker_id, worker) in sorted(self._workers.items())
+        }
+        busy = sum(worker['busy'] for worker in workers.values())
+        window = makespan / THROUGHPUT_WINDOWS
+        counts = [0] * THROUGHPUT_WINDOWS
+        for end in self._ends:
+            counts[min(int((end - run_start) / window), THROUGHPUT_WINDOWS - 1) if window else 0] += 1
+        bins = lpt_partition([(duration, duration) for duration in self._durations], len(workers))
+        return {
+            'workers': workers,
+            'makespan': makespan,
+            'busy': busy,
+            'idle': makespan * len(workers) - busy,
+            'utilization': busy / (makespan * len(workers)) if makespan else 1.0,
+            'tail': run_end - min(worker['last_end'] for worker in self._workers.values()),
+            'throughput_window': window,
+            'throughput': [count / window for count in counts] if window else [],
+            'ideal_makespan': max(sum(durations) for durations in bins),
+        }
+
+
+def utilization(session: 'Session') -> Utilization:
+    tracker = session.stash.get(UTILIZATION_KEY, None)  # type: ignore[arg-type]
+    if tracker is None:
+        tracker = session.stash[UTILIZATION_KEY] = Utilization()  # type: ignore[index]
+    return tracker
+
+
+def format_utilization(summary: Dict[str, Any]) -> str:
+    lines = [f"makespan: {summary['makespan']:.3f}s (ideal: {summary['ideal_makespan']:.3f}s), "
+             f"utilization: {summary['utilization']:.1%}, idle: {summary['idle']:.3f}s, "
+             f"tail: {summary['tail']:.3f}s"]
+    lines.extend(f"{worker_id}: {worker['tests']} tests, busy: {worker['busy']:.3f}s, idle: {worker['idle']:.3f}s, "
+                 f"tail: {worker['tail']:.3f}s ({worker['utilization']:.1%})"
+                 for (worker_id, worker) in summary['workers'].items())
+    lines.append(f"throughput (tests/sec per {summary['throughput_window']:.3f}s): "
+                 + ', '.join(f'{rate:.1f}' for rate in summary['throughput']))
+    return '\r\n '.join(lines)
@@ -0,0 +1,107 @@
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Generator, Optional
+
+import pytest
+
+from pytest_stats.failures import dedupe_failure
+from pytest_stats.marks import get_marks
+from pytest_stats.sampling import keeps_detail, sampler
+from pytest_stats.stack_traces import capture_options
+from pytest_stats.stash import get_test_item_data, get_test_session_data, reporters
+from pytest_stats.serialization import item_values, item_from_values, session_record, json_safe
+from pytest_stats.utilization import utilization
+
+if TYPE_CHECKING:
+    from _pytest.config import Config
+    from _pytest.main import Session
+    from _pytest.nodes import Item
+    from _pytest.reports import TestReport
+    from _pytest.runner import CallInfo
+
+logger = logging.getLogger(__name__)
+REPORT_ATTRIBUTE = 'pytest_stats_item'
+# (worker id, protocol start, protocol end) of the tests the sampler drops, for the controller's utilization
+SPAN_ATTRIBUTE = 'pytest_stats_span'
+WORKER_OUTPUT_KEY = 'pytest_stats_session'
+
+
+def register(config: 'Config') -> None:
+    if hasattr(config, 'workerinput'):
+        config.pluginmanager.register(WorkerForwarder(), 'pytest_stats_xdist_worker')
+    else:
+        config.pluginmanager.register(ControllerAggregator(), 'pytest_stats_xdist_controller')
+
+
+class WorkerForwarder:
+    """
+    Runs on the xdist workers. Every test is attached in its compact form to its teardown report, which xdist
+    already sends to the controller, and the worker's session data goes back with the worker output.
+    The tests the sampler drops only send the span of their protocol
+    """
+
+    @pytest.hookimpl(hookwrapper=True, tryfirst=True)
+    def pytest_runtest_makereport(self, item: 'Item', call: 'CallInfo[None]') -> Generator[None, Any, None]:
+        output = yield
+        if call.when != 'teardown':
+            return
+        test_data = get_test_item_data(item)
+        if call.excinfo is not None and getattr(test_data, 'fail_msg', None) is None:
+            test_data.set_failure(call.excinfo, **capture_options(item.config))
+        test_data.test_end_protocol = call.stop
+        if not keeps_detail(item.session, test_data):
+            setattr(output.get_result(), SPAN_ATTRIBUTE, [
+                test_data.xdist_worker_id, getattr(test_data, 'test_start_protocol', call.start), call.stop])
+            return
+        if getattr(test_data, 'marks', None) is None:
+            # sampled tests get their marks once they're known to be kept, at the end of their protocol
+            test_data.marks = get_marks(item)
+        setattr(output.get_result(), REPORT_ATTRIBUTE, item_values(test_data))
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session: 'Session') -> None:
+        worker_output: Dict[str, Any] = session.config.workeroutput  # type: ignore[attr-defined]
+        worker_output[WORKER_OUTPUT_KEY] = json_safe(session_record(get_test_session_data(session), 'worker'))
+
+
+class ControllerAggregator:
+    """
+    Runs on the xdist controller. Reports the tests sent by the workers (with their failures deduplicated across the
+    workers) and merges the workers' sessions into TestSessionData.workers, keyed by worker id, and their sampling
+    summaries into the controller's.
+    """
+
+    def __init__(self) -> None:
+        self._session: Optional['Session'] = None
+
+    def pytest_sessionstart(self, session: 'Session') -> None:
+        self._session = session
+
+    def pytest_runtest_logreport(self, report: 'TestReport') -> None:
+        if self._session is None:
+            return
+        values = getattr(report, REPORT_ATTRIBUTE, None)
+        if values is None:
+            span = getattr(report, SPAN_ATTRIBUTE, None)
+            if span is not None:
+                utilization(self._session).add_span(*span)
+            return
+        test_data = item_from_values(values)
+        if test_data.fail_msg is not None or test_data.stack_trace_source is not None:
+            dedupe_failure(self._session, test_data)
+        utilization(self._session).add(test_data)
+        reporters(self._session).report_test(test_data=test_data)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node: Any, error: Any) -> None:  # pylint:disable=unused-argument
+        worker_session = getattr(node, 'workeroutput', {}).get(WORKER_OUTPUT_KEY)
+        if worker_session is None or self._session is None:
+            return
+        session_data = get_test_session_data(self._session)
+        if session_data.workers is None:
+            session_data.workers = {}
+        worker_id = worker_session.get('xdist_worker_id') or node.gateway.id
+        session_data.workers[worker_id] = worker_session
+        session_sampler = sampler(self._session)
+        if session_sampler is not None and worker_session.get('sampling') is not None:
+            session_sampler.merge(worker_session['sampling'])
+        logger.debug('got session data of worker %s', worker_id)
@@ -0,0 +1,83 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from assertpy import assert_that
+
+from pytest_stats.async_dispatcher import AsyncDispatcher
+from pytest_stats.reporters_registry import ReportersRegistry
+from pytest_stats.test_item_data import TestItemData
+
+
+def _test_data(name: str) -> TestItemData:
+    test_data = TestItemData()
+    test_data.name = name
+    return test_data
+
+
+def _blocking_dispatch(dispatched: list, release: threading.Event):
+    def dispatch(test_data):
+        release.wait(timeout=5)
+        dispatched.append(test_data.name)
+
+    return dispatch
+
+
+def test_all_submitted_tests_are_dispatched_on_close():
+    dispatched = []
+    dispatcher = AsyncDispatcher(lambda test_data: dispatched.append(test_data.name), workers=2)
+    for name in ['test1', 'test2', 'test3']:
+        dispatcher.submit(_test_data(name))
+    dispatcher.close()
+    assert_that(dispatched).contains_only('test1', 'test2', 'test3')
+    assert_that(dispatcher.counters).has_submitted(3).has_dispatched(3).has_dropped(0)
+
+
+def test_submitted_data_is_a_snapshot():
+    dispatched = []
+    dispatcher = AsyncDispatcher(dispatched.append)
+    test_data = _test_data('test1')
+    dispatcher.submit(test_data)
+    dispatcher.close()
+    assert_that(dispatched[0]).is_not_same_as(test_data).has_name('test1')
+
+
+def test_drop_policy_discards_tests_when_queue_is_full():
+    dispatched = []
+    release = threading.Event()
+    dispatcher = AsyncDispatcher(_blocking_dispatch(dispatched, release), max_size=1, backpressure='drop')
+    for name in ['test1', 'test2', 'test3', 'test4']:
+        dispatcher.submit(_test_data(name))
+    release.set()
+    dispatcher.close()
+    assert_that(dispatcher.counters.dropped).is_greater_than(0)
+    assert_that(len(dispatched) + dispatcher.counters.dropped).is_equal_to(4)
+
+
+def test_spill_policy_dispatches_overflow_on_flush():
+    dispatched = []
+    release = threading.Event()
+    dispatcher = AsyncDispatcher(_blocking_dispatch(dispatched, release), max_size=1, backpressure='spill')
+    for name in ['test1', 'test2', 'test3', 'test4']:
+        dispatcher.submit(_test_data(name))
+    release.set()
+    dispatcher.close()
+    assert_that(dispatcher.counters.spilled).is_greater_than(0)
+    assert_that(dispatched).contains_only('test1', 'test2', 'test3', 'test4')
+    assert_that(dispatcher.counters).has_dispatched(4).has_max_depth(1)
+
+
+def test_unknown_backpressure_policy_is_rejected():
+    with pytest.raises(ValueError):
+        AsyncDispatcher(lambda test_data: None, backpressure='explode')
+
+
+def test_registry_reports_tests_asynchronously():
+    registry = ReportersRegistry()
+    mock_reporter = MagicMock()
+    registry.register(mock_reporter)
+    registry.enable_async_dispatch(max_size=10)
+    registry.report_test(test_data=_test_data('test1'))
+    registry.flush()
+    mock_reporter.report_test.assert_called_once()
+    assert_that(registry.dispatcher_counters).has_dispatched(1)
@@ -0,0 +1,30 @@
+from assertpy import assert_that
+
+from pytest_stats.captured_output import capture_sections, render_sections, truncate_middle
+from pytest_stats.test_item_data import TestItemData
+
+
+def test_truncate_middle_keeps_head_and_tail():
+    assert_that(truncate_middle('abcdef', 0)).is_equal_to('abcdef')
+    assert_that(truncate_middle('abcdef', 6)).is_equal_to('abcdef')
+    assert_that(truncate_middle('abcdefghij', 4)).is_equal_to('ab\n... [6 characters truncated] ...\nij')
+
+
+def test_sections_are_truncated_separately():
+    sections = capture_sections([('Captured stdout call', 'x' * 10), ('Captured log call', 'short')], max_size=6)
+    assert_that(sections).is_equal_to([('Captured stdout call', 'xxx\n... [4 characters truncated] ...\nxxx'),
+                                       ('Captured log call', 'short')])
+
+
+def test_output_is_rendered_when_read():
+    test_data = TestItemData()
+    test_data.set_output([('Captured stdout call', 'hello'), ('Captured log call', 'INFO log')])
+    assert_that(test_data.output_sections).is_length(2)
+    assert_that(test_data.test_output).is_equal_to(render_sections(test_data.output_sections))
+    assert_that(test_data.test_output).is_equal_to(
+        '----- Captured stdout call -----\nhello\n----- Captured log call -----\nINFO log')
+    assert_that(test_data.test_output).is_same_as(test_data.test_output)
+
+
+def test_no_output_without_sections():
+    assert_that(hasattr(TestItemData(), 'test_output')).is_false()
@@ -0,0 +1,60 @@
+import json
+from unittest.mock import MagicMock
+
+from assertpy import assert_that
+
+from pytest_stats.checkpoint import recover
+from pytest_stats.reporters_registry import ReportersRegistry
+from pytest_stats.serialization import item_values
+from pytest_stats.test_item_data import TestItemData
+
+
+def _test_values(name: str, outcome: str, end: float):
+    test_data = TestItemData()
+    test_data.name = name
+    test_data.marks = frozenset()
+    test_data.set_step_status(when='call', start=end - 1, end=end, duration=1.0, outcome=outcome)
+    test_data.test_end_protocol = end
+    return item_values(test_data)
+
+
+def _write_log(path, *records):
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+        f.write('{"type": "te')  # the record being written when the process died
+
+
+def _replay(path):
+    registry = ReportersRegistry()
+    reporter = MagicMock()
+    registry.register(reporter)
+    status = recover(str(path), registry)
+    return status, reporter
+
+
+def test_orphaned_log_is_replayed_as_crashed(tmp_path):
+    path = tmp_path / 'checkpoint.jsonl'
+    _write_log(path,
+               {'type': 'session_start', 'session_id': 'session1', 'start_time': 100.0, 'wazoo': 'Test'},
+               {'type': 'test', 'values': _test_values('test1', 'passed', 110.0)},
+               {'type': 'heartbeat', 'session_id': 'session1', 'start_time': 100.0, 'time': 130.0},
+               {'type': 'test', 'values': _test_values('test2', 'failed', 120.0)})
+    status, reporter = _replay(path)
+    assert_that(status).is_equal_to('CRASHED')
+    assert_that([call.kwargs['test_data'].name for call in reporter.report_test.call_args_list]) \
+        .is_equal_to(['test1', 'test2'])
+    session_data = reporter.report_session_finish.call_args.kwargs['session_data']
+    assert_that(vars(session_data)).contains_entry(
+        {'session_id': 'session1'}, {'wazoo': 'Test'}, {'status': 'CRASHED'}, {'failed_tests': 1}, {'end_time': 130.0})
+
+
+def test_interrupted_session(tmp_path):
+    path = tmp_path / 'checkpoint.jsonl'
+    _write_log(path,
+               {'type': 'session_start', 'session_id': 'session1', 'start_time': 100.0},
+               {'type': 'interrupted', 'time': 105.0})
+    status, reporter = _replay(path)
+    assert_that(status).is_equal_to('INTERRUPTED')
+    reporter.report_test.assert_not_called()
+    assert_that(reporter.report_session_finish.call_args.kwargs['session_data'].end_time).is_equal_to(105.0)
@@ -0,0 +1,54 @@
+import json
+
+from assertpy import assert_that
+
+from pytest_stats.chrome_trace_reporter import ChromeTraceReporter
+from pytest_stats.test_item_data import TestItemData
+from pytest_stats.test_session_data import TestSessionData
+
+
+def _test_data(name, worker_id, start):
+    test_data = TestItemData()
+    test_data.name = name
+    test_data.fullname = f'test_file.py::{name}'
+    test_data.xdist_worker_id = worker_id
+    test_data.test_start_protocol, test_data.test_end_protocol = start, start + 1.0
+    test_data.set_step_status('setup', start, start + 0.5, 0.5, 'passed')
+    test_data.set_step_status('call', start + 0.5, start + 1.0, 0.5, 'passed')
+    test_data.fixtures = [
+        {'name': 'db', 'scope': 'session', 'phase': 'setup', 'start': start, 'duration': 0.25, 'cached': False},
+        {'name': 'tmp', 'scope': 'function', 'phase': 'setup', 'start': None, 'duration': 0.0, 'cached': True},
+    ]
+    return test_data
+
+
+def test_trace_has_a_track_per_worker_with_nested_spans(tmp_path):
+    path = str(tmp_path / 'trace.json')
+    reporter = ChromeTraceReporter(path)
+    session_data = TestSessionData()
+    session_data.session_id = 'session_id'
+    reporter.report_session_start(session_data=session_data)
+    reporter.report_test(test_data=_test_data('test_a', 'gw0', 10.0))
+    reporter.report_test(test_data=_test_data('test_b', 'gw1', 10.0))
+    reporter.report_test(test_data=_test_data('test_c', 'gw0', 11.0))
+    reporter.report_session_finish(session_data=session_data)
+
+    with open(path, encoding='utf-8') as f:
+        events = json.load(f)
+    tracks = {e['args']['name']: e['tid'] for e in events if e['name'] == 'thread_name'}
+    assert_that(tracks).is_equal_to({'gw0': 1, 'gw1': 2})
+    spans = [(e['tid'], e['cat'], e['name'], e['ts'], e['dur']) for e in events if e['ph'] == 'X']
+    assert_that(spans).contains(
+        (1, 'test', 'test_a', 10_000_000.0, 1_000_000.0), (1, 'phase', 'setup', 10_000_000.0, 500_000.0),
+        (1, 'phase', 'call', 10_500_000.0, 500_000.0), (1, 'fixture', 'db', 10_000_000.0, 250_000.0),
+        (2, 'test', 'test_b', 10_000_000.0, 1_000_000.0), (1, 'test', 'test_c', 11_000_000.0, 1_000_000.0))
+    assert_that([name for (_, _, name, _, _) in spans]).does_not_contain('tmp')
+    counters = [(e['ts'], e['args']) for e in events if e['ph'] == 'C']
+    assert_that(counters).contains((10_000_000.0, {'gw0': 1}), (11_000_000.0, {'gw0': 0}),
+                                   (11_000_000.0, {'gw1': 0}))
+
+
+def test_nothing_is_written_without_events(tmp_path):
+    reporter = ChromeTraceReporter(str(tmp_path / 'trace.json'))
+    reporter.report_session_finish(session_data=TestSessionData())
+    assert_that(str(tmp_path / 'trace.json')).does_not_exist()
@@ -0,0 +1,108 @@
+import json
+
+import pytest
+from assertpy import assert_that
+
+from pytest_stats import duration_stats
+from pytest_stats.__main__ import main
+from pytest_stats.compare import compare, read_sessions
+
+
+def _record(session_id, fullname, call, result='passed', start=0.0):
+    return {'session_id': session_id, 'session_start': start, 'fullname': fullname, 'test_duration_setup': 0.0,
+            'test_duration_call': call, 'test_duration_teardown': 0.0, 'result_setup': 'passed',
+            'result_call': result, 'result_teardown': 'passed'}
+
+
+@pytest.fixture(params=['numpy', 'pure python'], autouse=True)
+def bulk(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(duration_stats, '_numpy', lambda: None)
+
+
+def test_sessions_are_ordered_by_start_and_keep_the_last_run():
+    sessions = read_sessions([_record('new', 'a.py::test_a', 1.0, start=2.0),
+                              _record('old', 'a.py::test_a', 1.0, start=1.0),
+                              _record('old', 'a.py::test_a', 3.0, result='failed', start=1.0)])
+    assert_that(list(sessions)).is_equal_to(['old', 'new'])
+    assert_that(sessions['old']).is_equal_to({'a.py::test_a': (3.0, True)})
+
+
+def test_deltas_failures_and_fixes():
+    sessions = read_sessions([
+        _record('base', 'a.py::test_slower', 1.0), _record('base', 'a.py::test_broken', 1.0),
+        _record('base', 'b.py::test_fixed', 1.0, result='failed'), _record('base', 'b.py::test_removed', 1.0),
+        _record('head', 'a.py::test_slower', 2.0, start=1.0),
+        _record('head', 'a.py::test_broken', 1.0, result='failed', start=1.0),
+        _record('head', 'b.py::test_fixed', 0.5, start=1.0), _record('head', 'b.py::test_added', 1.0, start=1.0)])
+    comparison = compare(sessions)
+    assert_that(comparison._asdict()).contains_entry(
+        {'baseline_sessions': ['base']}, {'candidate_sessions': ['head']}, {'new_failures': ['a.py::test_broken']},
+        {'fixed': ['b.py::test_fixed']}, {'added': 1}, {'removed': 1})
+    assert_that([test.fullname for test in comparison.tests]).is_equal_to(
+        ['a.py::test_slower', 'a.py::test_broken', 'b.py::test_fixed'])
+    assert_that([(module.module, module.delta) for module in comparison.modules]).is_equal_to(
+        [('a.py', 1.0), ('b.py', -0.5)])
+    # a single baseline run can't tell noise apart - the thresholds decide
+    assert_that([test.fullname for test in comparison.slowdowns]).is_equal_to(['a.py::test_slower'])
+
+
+def test_noisy_slowdowns_are_not_significant():
+    records = [_record(f'base{i}', f'test_{name}', duration, start=i)
+               for i, (steady, noisy) in enumerate([(1.0, 0.5), (1.01, 1.5), (0.99, 1.0)])
+               for name, duration in (('steady', steady), ('noisy', noisy))]
+    records += [_record('head', 'test_steady', 1.5, start=9), _record('head', 'test_noisy', 1.5, start=9)]
+    comparison = compare(read_sessions(records))
+    assert_that([test.fullname for test in comparison.slowdowns]).is_equal_to(['test_steady'])
+    assert_that(comparison.tests[0].baseline_runs).is_equal_to(3)
+
+
+def test_unknown_session():
+    assert_that(compare).raises(ValueError).when_called_with(
+        read_sessions([_record('s1', 'test_a', 1.0)]), candidates=['s2']).contains('s2')
+
+
+def test_main_gates_on_regressions(tmp_path, capsys):
+    path = tmp_path / 'stats.jsonl'
+    lines = [{'type': 'session_start', 'session_id': 's1', 'start_time': 1.0},
+             {'type': 'test', **_record('s1', 'test_a', 1.0)},
+             {'type': 'session_start', 'session_id': 's2', 'start_time': 2.0},
+             {'type': 'test', **_record('s2', 'test_a', 1.0, result='failed')}]
+    path.write_text('\n'.join(json.dumps(line) for line in lines))
+    assert_that(main(['compare', str(path)])).is_equal_to(1)
+    assert_that(capsys.readouterr().out).contains('new failures (1)', 'test_a')
+    assert_that(main(['compare', str(path), '--fail-on', 'slowdowns', '--json'])).is_equal_to(0)
+    assert_that(json.loads(capsys.readouterr().out)).contains_entry({'new_failures': ['test_a']})
+    assert_that(main(['compare', str(path), '--candidate', 's3'])).is_equal_to(2)
+
+
+def test_json_output_is_strict_with_a_single_baseline_run(tmp_path, capsys):
+    path = tmp_path / 'stats.jsonl'
+    lines = [{'type': 'session_start', 'session_id': 's1', 'start_time': 1.0},
+             {'type': 'test', **_record('s1', 'test_a', 1.0)},
+             {'type': 'test', **_record('s1', 'test_b', 0.0)},
+             {'type': 'session_start', 'session_id': 's2', 'start_time': 2.0},
+             {'type': 'test', **_record('s2', 'test_a', 2.0)},
+             {'type': 'test', **_record('s2', 'test_b', 1.0)}]
+    path.write_text('\n'.join(json.dumps(line) for line in lines))
+    assert_that(main(['compare', str(path), '--json'])).is_equal_to(1)
+
+    def reject(constant):
+        raise ValueError(constant)
+
+    output = json.loads(capsys.readouterr().out, parse_constant=reject)
+    assert_that(output['slowdowns']).extracting('fullname', 'score').contains(('test_a', None))
+    assert_that(output['tests']).extracting('fullname', 'ratio').contains(('test_b', None))
+
+
+def test_unreadable_history_is_a_usage_error(tmp_path, capsys):
+    assert_that(main(['compare', str(tmp_path / 'missing.jsonl')])).is_equal_to(2)
+    assert_that(capsys.readouterr().err).contains('missing.jsonl')
+    corrupt = tmp_path / 'stats.db'
+    corrupt.write_bytes(b'SQLite format 3\x00' + b'\x00' * 100)
+    assert_that(main(['compare', str(corrupt)])).is_equal_to(2)
+    broken = tmp_path / 'stats.jsonl'
+    broken.write_text('{"type": "session_start"')
+    assert_that(main(['compare', str(broken)])).is_equal_to(2)
@@ -58,3 +58,62 @@ class TestDefaultTextReporter:
             for test in tests:
                 assert_that(output).contains(str(test))
 
+
+    def test_report_session_finished_prints_running_summary(self, caplog):
+        session_data = TestSessionData()
+        self.reporter.report_session_start(session_data=session_data)
+        for name, outcome, duration in [('test1', 'passed', 1.0), ('test2', 'failed', 3.0), ('test3', 'passed', 2.0)]:
+            self.reporter.report_test(test_data=_test_data(name, outcome, duration))
+        caplog.clear()
+        self.reporter.report_session_finish(session_data=session_data)
+        assert_that(caplog.text).contains('tests: 3 (failed: 1, passed: 2)') \
+            .contains('total duration: 6.000s') \
+            .contains('max duration: 3.000s (test_module.py::test2)')
+
+
+    def test_report_session_finished_prints_utilization(self, caplog):
+        session_data = TestSessionData()
+        self.reporter.report_session_start(session_data=session_data)
+        session_data.utilization = {
+            'workers': {'gw0': {'tests': 2, 'busy': 3.0, 'idle': 1.0, 'tail': 1.0, 'utilization': 0.75}},
+            'makespan': 4.0, 'busy': 3.0, 'idle': 1.0, 'utilization': 0.75, 'tail': 1.0, 'throughput_window': 0.4,
+            'throughput': [2.5, 0.0], 'ideal_makespan': 3.0}
+        self.reporter.report_session_finish(session_data=session_data)
+        assert_that(caplog.text).contains('makespan: 4.000s (ideal: 3.000s), utilization: 75.0%') \
+            .contains('gw0: 2 tests, busy: 3.000s') \
+            .contains('throughput (tests/sec per 0.400s): 2.5, 0.0')
+
+
+class TestStreamingDefaultTextReporter:
+    def test_tests_are_not_kept_and_written_in_chunks(self, caplog):
+        reporter = DefaultTextReporter(stream=True, chunk_size=2)
+        reporter.report_session_start(session_data=TestSessionData())
+        tests = [_test_data(name, 'passed', 1.0) for name in ['test1', 'test2', 'test3']]
+        caplog.clear()
+        for test in tests[:2]:
+            reporter.report_test(test_data=test)
+        assert_that(caplog.text).contains(str(tests[0])).contains(str(tests[1]))
+        reporter.report_test(test_data=tests[2])
+        assert_that(caplog.text).does_not_contain(str(tests[2]))
+        reporter.report_session_finish(session_data=TestSessionData())
+        assert_that(caplog.text).contains(str(tests[2])).contains('tests: 3 (passed: 3)')
+        assert_that(reporter._tests).is_none()
+
+    def test_tests_are_written_to_file(self, tmp_path, caplog):
+        output = tmp_path / 'tests.log'
+        reporter = DefaultTextReporter(stream=True, output_path=str(output), chunk_size=2)
+        reporter.report_session_start(session_data=TestSessionData())
+        tests = [_test_data(name, 'passed', 1.0) for name in ['test1', 'test2', 'test3']]
+        for test in tests:
+            reporter.report_test(test_data=test)
+        reporter.report_session_finish(session_data=TestSessionData())
+        assert_that(output.read_text().splitlines()).is_equal_to([str(test) for test in tests])
+        assert_that(caplog.text).does_not_contain(str(tests[0])).contains('tests: 3 (passed: 3)')
+
+
+def _test_data(name: str, outcome: str, duration: float) -> TestItemData:
+    test_data = TestItemData()
+    test_data.name = name
+    test_data.fullname = f'test_module.py::{name}'
+    test_data.set_step_status(when='call', start=0.0, end=duration, duration=duration, outcome=outcome)
+    return test_data
@@ -0,0 +1,14 @@
+from assertpy import assert_that
+
+from pytest_stats.duration_ordering import lpt_partition
+
+
+def test_lpt_partition_balances_the_bins():
+    durations = [('a', 7.0), ('b', 5.0), ('c', 4.0), ('d', 3.0), ('e', 2.0), ('f', 1.0)]
+    partitions = lpt_partition(durations, 2)
+    loads = sorted(sum(dict(durations)[job] for job in partition) for partition in partitions)
+    assert_that(loads).is_equal_to([11.0, 11.0])
+
+
+def test_lpt_partition_with_more_bins_than_jobs():
+    assert_that(lpt_partition([('a', 1.0)], 3)).is_equal_to([['a'], [], []])
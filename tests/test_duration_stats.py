@@ -0,0 +1,67 @@
+import json
+
+import pytest
+from assertpy import assert_that
+
+from pytest_stats import duration_stats
+from pytest_stats.duration_stats import DurationStatsEngine
+from pytest_stats.history import iter_history
+
+
+def _record(fullname, call, result='passed', setup=0.0, teardown=0.0):
+    return {'fullname': fullname, 'test_duration_setup': setup, 'test_duration_call': call,
+            'test_duration_teardown': teardown, 'result_setup': 'passed', 'result_call': result,
+            'result_teardown': 'passed'}
+
+
+@pytest.fixture(params=['numpy', 'pure python'])
+def engine(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(duration_stats, '_numpy', lambda: None)
+    return DurationStatsEngine(window=5)
+
+
+def test_statistics_are_computed_per_test(engine):
+    engine.add_all(_record('test_a', call) for call in [1.0, 2.0, 3.0, 4.0, 5.0])
+    engine.add(_record('test_b', 1.0, result='failed'))
+    engine.add(_record('test_b', 3.0))
+    stats = engine.stats()
+    assert_that(stats['test_a']._asdict()).contains_entry(
+        {'runs': 5}, {'mean': 3.0}, {'variance': 2.0}, {'p50': 3.0}, {'last': 5.0}, {'failure_rate': 0.0})
+    assert_that(stats['test_a'].p90).is_close_to(4.6, 1e-9)
+    assert_that(stats['test_b']._asdict()).contains_entry({'runs': 2}, {'mean': 2.0}, {'failure_rate': 0.5})
+
+
+def test_only_the_last_window_runs_are_used(engine):
+    engine.add_all(_record('test_a', call) for call in [100.0, 1.0, 1.0, 1.0, 1.0, 1.0])
+    assert_that(engine.stats()['test_a']._asdict()).contains_entry({'runs': 5}, {'mean': 1.0})
+
+
+def test_statistics_are_updated_incrementally(engine):
+    engine.add(_record('test_a', 1.0))
+    engine.add(_record('test_b', 1.0))
+    first = engine.stats()['test_b']
+    engine.add(_record('test_a', 3.0))
+    stats = engine.stats()
+    assert_that(stats['test_a'].mean).is_equal_to(2.0)
+    assert_that(stats['test_b']).is_same_as(first)
+
+
+def test_phase_and_top():
+    engine = DurationStatsEngine(phase='setup')
+    engine.add(_record('test_a', 1.0, setup=5.0))
+    engine.add(_record('test_b', 9.0, setup=1.0))
+    assert_that([s.fullname for s in engine.top(key='mean', count=1)]).is_equal_to(['test_a'])
+
+
+def test_history_is_read_from_jsonl(tmp_path):
+    path = tmp_path / 'stats.jsonl'
+    lines = [{'type': 'session_start', 'session_id': 's1', 'start_time': 10.0},
+             {'type': 'test', 'session_id': 's1', **_record('test_a', 1.0)},
+             {'type': 'session_finish', 'session_id': 's1'}]
+    path.write_text('\n'.join(json.dumps(line) for line in lines))
+    records = list(iter_history(str(path)))
+    assert_that(records).is_length(1)
+    assert_that(records[0]).contains_entry({'session_start': 10.0}).contains_entry({'test_duration_call': 1.0})
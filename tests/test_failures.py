@@ -0,0 +1,48 @@
+from unittest.mock import MagicMock
+
+from assertpy import assert_that
+
+from pytest_stats.failures import FailureTable, dedupe_failure, failure_digest, failure_table
+from pytest_stats.test_item_data import TestItemData
+
+
+def _session() -> MagicMock:
+    session = MagicMock()
+    session.stash = {'stats_reporters': MagicMock()}
+    return session
+
+
+def _failed_test(fail_msg: str, stack_trace: str) -> TestItemData:
+    test_data = TestItemData()
+    test_data.fail_msg = fail_msg
+    test_data.stack_trace = stack_trace
+    return test_data
+
+
+def test_digest_depends_on_message_and_trace():
+    assert_that(failure_digest('boom', 'trace')).is_equal_to(failure_digest('boom', 'trace')).is_length(16)
+    assert_that(failure_digest('boom', 'trace')).is_not_equal_to(failure_digest('boom', 'other trace'))
+    assert_that(failure_digest('boom', None)).is_not_equal_to(failure_digest('boom', 'None'.replace('N', 'n')))
+
+
+def test_table_keeps_a_single_failure_per_text():
+    table = FailureTable()
+    first, first_new = table.add('boom', 'trace')
+    second, second_new = table.add('boom', 'trace')
+    table.add('bang', 'trace')
+    assert_that(second).is_same_as(first)
+    assert_that((first_new, second_new)).is_equal_to((True, False))
+    assert_that(table).is_length(2)
+    assert_that(table.signature_counts()).is_equal_to({first.digest: 2, failure_digest('bang', 'trace'): 1})
+
+
+def test_dedupe_shares_the_text_and_reports_new_failures_once():
+    session = _session()
+    tests = [_failed_test('boom', ''.join(['tr', 'ace'])) for _ in range(3)]
+    for test_data in tests:
+        dedupe_failure(session, test_data)
+    assert_that({id(test_data.stack_trace) for test_data in tests}).is_length(1)
+    assert_that({test_data.failure_digest for test_data in tests}).is_equal_to({failure_digest('boom', 'trace')})
+    failure = failure_table(session).get(failure_digest('boom', 'trace'))
+    assert_that(failure.count).is_equal_to(3)
+    session.stash['stats_reporters'].report_failure.assert_called_once_with(failure=failure)
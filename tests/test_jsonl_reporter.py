@@ -0,0 +1,112 @@
+import gzip
+import json
+import time
+
+from assertpy import assert_that
+
+from pytest_stats.failures import FailureTable
+from pytest_stats.jsonl_reporter import JsonLinesReporter
+from pytest_stats.jsonl_writer import JsonLinesWriter
+from pytest_stats.test_item_data import TestItemData
+from pytest_stats.test_session_data import TestSessionData
+
+
+def _read_lines(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def _session_data() -> TestSessionData:
+    session_data = TestSessionData()
+    session_data.session_id = 'session_id'
+    session_data.wazoo = 'Test'
+    return session_data
+
+
+def test_reporter_writes_session_and_test_records(tmp_path):
+    path = str(tmp_path / 'stats.jsonl')
+    reporter = JsonLinesReporter(path)
+    test_data = TestItemData()
+    test_data.name = 'test1'
+    test_data.marks = {'b_mark', 'a_mark'}
+    reporter.report_session_start(session_data=_session_data())
+    reporter.report_test(test_data=test_data)
+    reporter.report_session_finish(session_data=_session_data())
+
+    records = _read_lines(path)
+    assert_that([record['type'] for record in records]).is_equal_to(['session_start', 'test', 'session_finish'])
+    assert_that(records[0]).contains_entry({'session_id': 'session_id'}).contains_entry({'wazoo': 'Test'})
+    assert_that(records[1]).contains_entry({'name': 'test1'}).contains_entry({'marks': ['a_mark', 'b_mark']}) \
+        .contains_entry({'fail_msg': None})
+
+
+def test_stack_traces_are_written_once_per_failure(tmp_path):
+    path = str(tmp_path / 'stats.jsonl')
+    reporter = JsonLinesReporter(path)
+    failure, _ = FailureTable().add('boom', 'trace')
+    test_data = TestItemData()
+    test_data.name = 'test1'
+    test_data.fail_msg, test_data.stack_trace, test_data.failure_digest = 'boom', 'trace', failure.digest
+    reporter.report_session_start(session_data=_session_data())
+    reporter.report_failure(failure=failure)
+    reporter.report_test(test_data=test_data)
+    reporter.report_session_finish(session_data=_session_data())
+
+    failure_record, test_record = _read_lines(path)[1:3]
+    assert_that(failure_record).is_equal_to(
+        {'type': 'failure', 'digest': failure.digest, 'fail_msg': 'boom', 'stack_trace': 'trace'})
+    assert_that(test_record).contains_entry({'failure_digest': failure.digest}).contains_entry({'stack_trace': None})
+
+
+def test_writer_buffers_until_flush_every_records(tmp_path):
+    path = tmp_path / 'stats.jsonl'
+    writer = JsonLinesWriter(str(path), flush_every=2, flush_interval=60)
+    writer.write({'record': 1})
+    assert_that(path.read_text()).is_empty()
+    writer.write({'record': 2})
+    assert_that(_read_lines(path)).is_equal_to([{'record': 1}, {'record': 2}])
+    writer.close()
+
+
+def test_writer_flushes_pending_records_after_flush_interval(tmp_path):
+    path = tmp_path / 'stats.jsonl'
+    writer = JsonLinesWriter(str(path), flush_every=100, flush_interval=0.05)
+    writer.write({'record': 1})
+    assert_that(path.read_text()).is_empty()
+    deadline = time.monotonic() + 5
+    while not path.read_text() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert_that(_read_lines(path)).is_equal_to([{'record': 1}])
+    writer.close()
+
+
+def test_writer_rotates_by_size(tmp_path):
+    path = tmp_path / 'stats.jsonl'
+    writer = JsonLinesWriter(str(path), max_bytes=30, backups=2)
+    for index in range(4):
+        writer.write({'record': index, 'padding': 'x' * 10})
+    writer.close()
+    assert_that(_read_lines(f'{path}.2')).is_equal_to([{'record': 2, 'padding': 'x' * 10}])
+    assert_that(_read_lines(f'{path}.1')).is_equal_to([{'record': 3, 'padding': 'x' * 10}])
+    assert_that(str(tmp_path / 'stats.jsonl.3')).does_not_exist()
+
+
+def test_writer_rotates_by_bytes_not_characters(tmp_path):
+    path = tmp_path / 'stats.jsonl'
+    path.write_text(json.dumps({'record': 0, 'text': 'é' * 10}, ensure_ascii=False) + '\n', encoding='utf-8')
+    line = json.dumps({'record': 1, 'text': 'é' * 10}) + '\n'
+    # the limit is reached exactly when the existing file and the new line are counted in bytes
+    writer = JsonLinesWriter(str(path), max_bytes=path.stat().st_size + len(line.encode('utf-8')), backups=1)
+    writer.write({'record': 1, 'text': 'é' * 10})
+    writer.close()
+    assert_that(_read_lines(f'{path}.1')).extracting('record').is_equal_to([0, 1])
+    assert_that(str(path)).does_not_exist()
+
+
+def test_writer_can_gzip(tmp_path):
+    path = tmp_path / 'stats.jsonl.gz'
+    writer = JsonLinesWriter(str(path), compress=True, fsync=True, flush_every=1)
+    writer.write({'record': 1})
+    writer.close()
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        assert_that(json.loads(f.readline())).is_equal_to({'record': 1})
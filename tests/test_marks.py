@@ -0,0 +1,33 @@
+import pytest
+from assertpy import assert_that
+
+from pytest_stats.marks import MarkCache, create_mark_string, mark_cache
+
+
+@pytest.mark.parametrize('mark,expected', [
+    (pytest.mark.cool_marker.mark, 'cool_marker'),
+    (pytest.mark.mark_with(1, 'a').mark, 'mark_with(1, a)'),
+    (pytest.mark.mark_with(1, b=2).mark, 'mark_with(1, b=2)'),
+])
+def test_create_mark_string(mark, expected):
+    assert_that(create_mark_string(mark)).is_equal_to(expected)
+
+
+def test_marks_are_rendered_once_per_mark():
+    cache = MarkCache()
+    mark = pytest.mark.mark_with(name='team').mark
+    assert_that(cache.render(mark)).is_same_as(cache.render(mark))
+    assert_that(cache.render(pytest.mark.mark_with(name='other').mark)).is_equal_to('mark_with(name=other)')
+
+
+def test_equal_mark_sets_are_shared():
+    cache = MarkCache()
+    marks = cache.intern(frozenset({'a', 'b'}))
+    assert_that(cache.intern(frozenset({'b', 'a'}))).is_same_as(marks)
+    assert_that(MarkCache().intern(frozenset({'b', 'a'}))).is_not_same_as(marks)
+
+
+def test_the_cache_belongs_to_the_config(pytester):
+    config = pytester.parseconfig()
+    assert_that(mark_cache(config)).is_same_as(mark_cache(config)).is_not_same_as(
+        mark_cache(pytester.parseconfig()))
@@ -1,8 +1,12 @@
+import json
+import sqlite3
+
 import pytest
 from _pytest.config import ExitCode
 from _pytest.pytester import Pytester
 from assertpy import assert_that, soft_assertions
 
+from pytest_stats.collector import PLUGIN_NAME as COLLECTOR_PLUGIN
 from pytest_stats.default_text_reporter import DefaultTextReporter
 from tests.dummy_test_reporter import DummyTestReporter
 
@@ -24,19 +28,36 @@ class TestPlugin:
         result = self._pytester.runpytest("--collect-stats")
         result.assert_outcomes(passed=1)
 
-    def test_all_hooks_are_registered(self, request):
+    def test_all_hooks_are_registered(self):
+        config = self._pytester.parseconfigure('--collect-stats')
         with soft_assertions():
-            assert_that(self._get_hook_implementations(hooked_function='pytest_addoption', request=request)).is_length(
-                1)
+            assert_that(self._get_hook_implementations(config, 'pytest_addoption', 'pytest_stats')).is_length(1)
             assert_that(
-                self._get_hook_implementations(hooked_function='pytest_runtest_protocol', request=request)).is_length(1)
+                self._get_hook_implementations(config, 'pytest_runtest_protocol', COLLECTOR_PLUGIN)).is_length(1)
             assert_that(
-                self._get_hook_implementations(hooked_function='pytest_runtest_makereport', request=request)).is_length(
-                1)
+                self._get_hook_implementations(config, 'pytest_runtest_makereport', COLLECTOR_PLUGIN)).is_length(1)
+
+    def test_collection_hooks_are_not_registered_when_stats_are_off(self):
+        config = self._pytester.parseconfigure()
+        assert_that(config.pluginmanager.has_plugin(COLLECTOR_PLUGIN)).is_false()
+        assert_that(self._get_hook_implementations(config, 'pytest_runtest_protocol', 'pytest_stats')).is_empty()
+
+    def test_registering_a_reporter_turns_stats_on(self):
+        self._pytester.makeconftest(
+            """
+            import pytest
+            from tests.dummy_test_reporter import DummyTestReporter
+            @pytest.hookimpl()
+            def pytest_stats_register_reporters(reporters):
+                reporters.register(DummyTestReporter())
+            """
+        )
+        config = self._pytester.parseconfigure()
+        assert_that(config.pluginmanager.has_plugin(COLLECTOR_PLUGIN)).is_true()
 
     @staticmethod
-    def _get_hook_implementations(hooked_function, request):
-        return [x for x in getattr(request.config.hook, hooked_function)._hookimpls if x.plugin_name == 'pytest_stats']
+    def _get_hook_implementations(config, hooked_function, plugin_name):
+        return [x for x in getattr(config.hook, hooked_function).get_hookimpls() if x.plugin_name == plugin_name]
 
     @pytest.fixture
     def hookrecorder(self, request, pytester: pytest.Pytester):
@@ -55,7 +76,7 @@ class TestPlugin:
                 logging.info('assertion done!')
         """
         )
-        res = self._pytester.runpytest('--log-cli-level=INFO')
+        res = self._pytester.runpytest('--log-cli-level=INFO', '--collect-stats')
         # noinspection PyUnresolvedReferences
         assert_that(str(res.stdout)).contains("assertion done!")
 
@@ -70,7 +91,7 @@ class TestPlugin:
                 logging.info('assertion done!')
         """
         )
-        res = self._pytester.runpytest()
+        res = self._pytester.runpytest('--collect-stats')
         # noinspection PyUnresolvedReferences
         assert_that(str(res.stdout)).contains("assertion done!")
 
@@ -90,7 +111,7 @@ class TestPlugin:
                 pass
         """
         )
-        res = self._pytester.runpytest()
+        res = self._pytester.runpytest('--collect-stats')
         # noinspection PyUnresolvedReferences
         hook_call = next(filter(lambda x: x._name == 'pytest_stats_env_data', res.reprec.calls))
         session_data = hook_call.session_data
@@ -210,7 +231,7 @@ class TestPlugin:
             """
             
             def pytest_sessionfinish(session: 'Session',exitstatus) -> None:
-                print(f'Registered reporters: {session.stash["stats_reporters"]._reporters.pop().__class__.__name__ }')
+                print(f'Registered reporters: {session.stash["stats_reporters"].reporters[0].__class__.__name__ }')
 
         """)
         self._pytester.makepyfile(
@@ -219,14 +240,14 @@ class TestPlugin:
                 pass
         """
         )
-        res = self._pytester.runpytest()
+        res = self._pytester.runpytest('--collect-stats')
         assert_that(str(res.stdout)).contains(f"Registered reporters: {DefaultTextReporter.__name__}")
 
     def test_default_text_reporter_is_not_registered_when_sending_disable_text_reporter_to_pytest(self):
         self._pytester.makeconftest(
             """          
             def pytest_sessionfinish(session: 'Session',exitstatus) -> None:
-                print(f'Registered reporters: {session.stash["stats_reporters"]._reporters}')
+                print(f'Registered reporters: {session.stash["stats_reporters"].reporters}')
         """)
         self._pytester.makepyfile(
             """          
@@ -234,8 +255,8 @@ class TestPlugin:
                 pass
         """
         )
-        res = self._pytester.runpytest('--disable-default-text-reporter', '--log-cli-level=DEBUG')
-        assert_that(str(res.stdout)).contains("Registered reporters: set()") \
+        res = self._pytester.runpytest('--collect-stats', '--disable-default-text-reporter', '--log-cli-level=DEBUG')
+        assert_that(str(res.stdout)).contains("Registered reporters: []") \
             .contains('--disable-default-text-reporter flag was used - not using default reporter')
 
     def test_all_mandatory_fields_are_reported_per_session(self):
@@ -279,7 +300,7 @@ class TestPlugin:
                 def report_test(self, test_data):
                     hints = {a:b for (a,b) in \
                     typing.get_type_hints(test_data).items() if type(None) not in typing.get_args(b)}
-                    assert_that(hints.keys()).is_subset_of(vars(test_data).keys())
+                    assert_that(hints.keys()).is_subset_of(test_data.as_dict().keys())
                     print('Assertion Done!')
 
 
@@ -349,7 +370,7 @@ class TestPlugin:
             class MyTestReporter(DummyTestReporter):
 
                 def report_test(self, test_data):
-                    assert_that(vars(test_data).keys()).is_equal_to(typing.get_type_hints(test_data).keys())
+                    assert_that(test_data.as_dict().keys()).is_equal_to(typing.get_type_hints(test_data).keys())
                     print('Assertion Done!')
 
 
@@ -462,7 +483,7 @@ class TestPlugin:
                 reporters.register(DummyTestReporter())
                              
             def pytest_sessionfinish(session: 'Session',exitstatus) -> None:
-                reporters = session.stash['stats_reporters']._reporters
+                reporters = session.stash['stats_reporters'].reporters
                 print(f'Registered reporters: {reporters}, number of reporters: {len(reporters)}')
         """)
         self._pytester.makepyfile(
@@ -516,3 +537,842 @@ class TestPlugin:
         )
         res = self._pytester.runpytest('--log-cli-level=INFO')
         assert_that(str(res.stdout)).contains('Assertion Done!')
+
+    def test_fields_no_reporter_requires_are_not_collected(self):
+        self._pytester.makeconftest(
+            """
+            import logging
+            import pytest
+            from assertpy import assert_that
+            from tests.dummy_test_reporter import DummyTestReporter
+            class MyTestReporter(DummyTestReporter):
+                required_fields = frozenset({'marks'})
+                def report_test(self, test_data):
+                    fields = test_data.as_dict()
+                    assert_that(fields).contains_key('marks', 'fail_msg').does_not_contain_key('test_output',
+                                                                                                'stack_trace')
+                    logging.info('Assertion Done!')
+
+            @pytest.hookimpl()
+            def pytest_stats_register_reporters(reporters):
+                reporters.register(MyTestReporter())
+        """)
+        self._pytester.makepyfile(
+            """
+            def test_failing():
+                assert False
+            """
+        )
+        res = self._pytester.runpytest('--log-cli-level=INFO', '--disable-default-text-reporter')
+        assert_that(str(res.stdout)).contains('Assertion Done!')
+
+    def test_fixture_timings_are_collected(self):
+        self._pytester.makeconftest(
+            """
+            import logging
+            import time
+            import pytest
+            from assertpy import assert_that
+            from tests.dummy_test_reporter import DummyTestReporter
+            class MyTestReporter(DummyTestReporter):
+                def __init__(self):
+                    self.fixtures = {}
+                def report_test(self, test_data):
+                    self.fixtures[test_data.name] = [(f['name'], f['phase'], f['cached']) for f in test_data.fixtures]
+                    if test_data.name == 'test_one':
+                        slow = [f for f in test_data.fixtures if f['name'] == 'slow' and f['phase'] == 'setup'][0]
+                        assert_that(slow['duration']).is_greater_than_or_equal_to(0.05)
+                def report_session_finish(self, session_data):
+                    assert_that(self.fixtures['test_one']).contains(('slow', 'setup', False), ('db', 'setup', False),
+                                                                    ('slow', 'teardown', False))
+                    assert_that(self.fixtures['test_two']).contains(('db', 'setup', True), ('db', 'teardown', False))
+                    assert_that(session_data.fixtures).contains_key('db').does_not_contain_key('slow')
+                    assert_that(session_data.fixtures['db']).contains_entry({'setups': 1}, {'cached_hits': 1})
+                    logging.info('Assertion Done!')
+
+            @pytest.fixture(scope='session')
+            def db():
+                yield 'db'
+
+            @pytest.fixture
+            def slow():
+                time.sleep(0.05)
+                yield
+                time.sleep(0.01)
+
+            @pytest.hookimpl()
+            def pytest_stats_register_reporters(reporters):
+                reporters.register(MyTestReporter())
+        """)
+        self._pytester.makepyfile(
+            """
+            def test_one(db, slow):
+                pass
+            def test_two(db):
+                pass
+            """
+        )
+        res = self._pytester.runpytest('--log-cli-level=INFO', '--disable-default-text-reporter')
+        res.assert_outcomes(passed=2)
+        assert_that(str(res.stdout)).contains('Assertion Done!')
+
+    def test_shared_failures_are_deduplicated(self):
+        self._pytester.makeconftest(
+            """
+            import logging
+            import pytest
+            from assertpy import assert_that
+            from tests.dummy_test_reporter import DummyTestReporter
+            class MyTestReporter(DummyTestReporter):
+                def __init__(self):
+                    self.failures = []
+                    self.tests = []
+                def report_failure(self, failure):
+                    self.failures.append(failure)
+                def report_test(self, test_data):
+                    if test_data.fail_msg is not None:
+                        self.tests.append(test_data)
+                def report_session_finish(self, session_data):
+                    broken = [test_data for test_data in self.tests if 'broken' in test_data.fail_msg]
+                    assert_that(broken).is_length(3)
+                    assert_that({test_data.failure_digest for test_data in broken}).is_length(1)
+                    assert_that({id(test_data.stack_trace) for test_data in broken}).is_length(1)
+                    assert_that(self.failures).is_length(2)
+                    assert_that(sorted(session_data.failure_signatures.values())).is_equal_to([1, 3])
+                    logging.info('Assertion Done!')
+
+            @pytest.fixture
+            def shared():
+                raise RuntimeError('broken fixture')
+
+            @pytest.hookimpl()
+            def pytest_stats_register_reporters(reporters):
+                reporters.register(MyTestReporter())
+        """)
+        self._pytester.makepyfile(
+            """
+            import pytest
+            @pytest.mark.parametrize('i', range(3))
+            def test_shared(shared, i):
+                pass
+            def test_own():
+                assert False, 'own failure'
+            """
+        )
+        res = self._pytester.runpytest('--log-cli-level=INFO', '--disable-default-text-reporter')
+        res.assert_outcomes(errors=3, failed=1)
+        assert_that(str(res.stdout)).contains('Assertion Done!')
+
+    def test_stack_traces_are_cut_and_capped(self):
+        self._pytester.makeconftest(
+            """
+            import logging
+            import pytest
+            from assertpy import assert_that
+            from tests.dummy_test_reporter import DummyTestReporter
+            class MyTestReporter(DummyTestReporter):
+                def report_test(self, test_data):
+                    assert_that(test_data.stack_trace).contains('in test_failing', 'in helper') \
+                        .does_not_contain('pluggy', '_pytest')
+                    assert_that(test_data.fail_msg).starts_with('xxxxx').contains('characters truncated')
+                    logging.info('Assertion Done!')
+
+            @pytest.hookimpl()
+            def pytest_stats_register_reporters(reporters):
+                reporters.register(MyTestReporter())
+        """)
+        self._pytester.makepyfile(
+            """
+            def helper():
+                raise ValueError('x' * 1000)
+            def test_failing():
+                helper()
+            """
+        )
+        res = self._pytester.runpytest('--log-cli-level=INFO', '--disable-default-text-reporter',
+                                       '--stats-stack-cut-internal', '--stats-failure-max-size=500')
+        res.assert_outcomes(failed=1)
+        assert_that(str(res.stdout)).contains('Assertion Done!')
+
+    def test_output_of_failures_only_is_captured_and_truncated(self):
+        self._pytester.makeconftest(
+            """
+            import logging
+            import pytest
+            from assertpy import assert_that
+            from tests.dummy_test_reporter import DummyTestReporter
+            class MyTestReporter(DummyTestReporter):
+                def __init__(self):
+                    self.outputs = {}
+                def report_test(self, test_data):
+                    self.outputs[test_data.name] = test_data.output_sections
+                def report_session_finish(self, session_data):
+                    assert_that(self.outputs['test_passing']).is_none()
+                    title, text = self.outputs['test_failing'][0]
+                    assert_that(title).is_equal_to('Captured stdout call')
+                    assert_that(text).starts_with('head').ends_with('tail\\n').contains('characters truncated')
+                    assert_that(len(text)).is_less_than(200)
+                    logging.info('Assertion Done!')
+
+            @pytest.hookimpl()
+            def pytest_stats_register_reporters(reporters):
+                reporters.register(MyTestReporter())
+        """)
+        self._pytester.makepyfile(
+            """
+            def test_passing():
+                print('x' * 1000)
+            def test_failing():
+                print('head' + 'x' * 1000 + 'tail')
+                assert False
+            """
+        )
+        res = self._pytester.runpytest('--log-cli-level=INFO', '--disable-default-text-reporter',
+                                       '--stats-output-capture=failures', '--stats-output-max-size=100')
+        res.assert_outcomes(passed=1, failed=1)
+        assert_that(str(res.stdout)).contains('Assertion Done!')
+
+    def test_collection_is_profiled(self):
+        self._pytester.makeconftest(
+            """
+            import logging
+            import pytest
+            from assertpy import assert_that
+            from tests.dummy_test_reporter import DummyTestReporter
+            class MyTestReporter(DummyTestReporter):
+                def report_collection(self, collectors):
+                    self.collectors = {record['nodeid']: record for record in collectors}
+                def report_session_finish(self, session_data):
+                    slow = self.collectors['test_slow_import.py']
+                    assert_that(slow).contains_entry({'node_type': 'Module'}, {'items': 2}, {'outcome': 'passed'})
+                    assert_that(slow['import_duration']).is_greater_than_or_equal_to(0.1)
+                    assert_that(slow['duration']).is_greater_than_or_equal_to(slow['import_duration'])
+                    assert_that(self.collectors['test_fast.py']['import_duration']).is_less_than(0.1)
+                    assert_that(self.collectors['test_broken.py']).contains_entry({'outcome': 'failed'})
+                    assert_that(session_data.collection).contains_entry({'items': 3})
+                    assert_that(session_data.collection['slowest'][0]).is_equal_to('test_slow_import.py')
+                    assert_that(session_data.collection['conftest_duration']).is_greater_than(0)
+                    logging.info('Assertion Done!')
+
+            @pytest.hookimpl()
+            def pytest_stats_register_reporters(reporters):
+                reporters.register(MyTestReporter())
+        """)
+        self._pytester.makepyfile(
+            test_slow_import="""
+                import time
+                time.sleep(0.1)
+                def test_one():
+                    pass
+                def test_two():
+                    pass
+            """,
+            test_fast="""
+                def test_three():
+                    pass
+            """,
+            test_broken="""
+                import no_such_module
+            """,
+        )
+        res = self._pytester.runpytest('--log-cli-level=INFO', '--disable-default-text-reporter',
+                                       '--continue-on-collection-errors')
+        res.assert_outcomes(passed=3, errors=1)
+        assert_that(str(res.stdout)).contains('Assertion Done!')
+
+    def test_crashed_session_is_recovered_from_its_checkpoint(self):
+        self._pytester.makepyfile(
+            """
+            import os
+            def test_passing():
+                pass
+            def test_failing():
+                assert False
+            def test_crashing():
+                os._exit(1)
+            """
+        )
+        res = self._pytester.runpytest_subprocess('--stats-checkpoint=checkpoint.jsonl',
+                                                  '--disable-default-text-reporter', '-p', 'no:cacheprovider')
+        assert_that(res.ret).is_equal_to(1)
+        assert_that(str(self._pytester.path / 'checkpoint.jsonl')).exists()
+        res = self._pytester.runpytest_subprocess('--stats-recover=checkpoint.jsonl', '--stats-jsonl=stats.jsonl',
+                                                  '--disable-default-text-reporter', '-p', 'no:cacheprovider')
+        assert_that(res.ret).is_equal_to(ExitCode.OK)
+        assert_that(str(res.stdout)).contains('as a CRASHED session')
+        assert_that(str(self._pytester.path / 'checkpoint.jsonl.recovered')).exists()
+        with open(self._pytester.path / 'stats.jsonl', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        assert_that([r['name'] for r in records if r['type'] == 'test']).is_equal_to(['test_passing', 'test_failing'])
+        assert_that(records[-1]).contains_entry({'type': 'session_finish'}, {'status': 'CRASHED'},
+                                                {'failed_tests': 1})
+
+    def test_checkpoint_is_removed_when_the_session_finishes(self):
+        self._pytester.makepyfile(
+            """
+            def test_passing():
+                pass
+            """
+        )
+        res = self._pytester.runpytest('--stats-checkpoint=checkpoint.jsonl', '--disable-default-text-reporter')
+        assert_that(res.ret).is_equal_to(ExitCode.OK)
+        assert_that(str(self._pytester.path / 'checkpoint.jsonl')).does_not_exist()
+
+    def test_passing_tests_are_sampled(self):
+        self._pytester.makeconftest(
+            """
+            import logging
+            import pytest
+            from assertpy import assert_that
+            from pytest_stats.sampling import Sampler
+            from tests.dummy_test_reporter import DummyTestReporter
+            class MyTestReporter(DummyTestReporter):
+                def __init__(self):
+                    self.tests = {}
+                def report_test(self, test_data):
+                    self.tests[test_data.fullname] = test_data
+                def report_session_finish(self, session_data):
+                    sampled = {name for name in self.tests if Sampler(0.2, slow_threshold=1.0).sampled(name)}
+                    failing = 'test_passing_tests_are_sampled.py::test_failing'
+                    assert_that(set(self.tests)).is_equal_to(sampled | {failing})
+                    assert_that(self.tests[failing].marks).contains('cool_marker')
+                    assert_that(session_data.sampling).contains_entry(
+                        {'detailed': len(self.tests)}, {'summarized': 51 - len(self.tests)})
+                    assert_that(sum(session_data.sampling['histogram'].values())).is_equal_to(51 - len(self.tests))
+                    logging.info('Assertion Done!')
+
+            @pytest.hookimpl()
+            def pytest_stats_register_reporters(reporters):
+                reporters.register(MyTestReporter())
+        """)
+        self._pytester.makepyfile(
+            """
+            import pytest
+            @pytest.mark.parametrize('i', range(50))
+            def test_passing(i):
+                pass
+            @pytest.mark.cool_marker
+            def test_failing():
+                assert False
+            """
+        )
+        res = self._pytester.runpytest('--log-cli-level=INFO', '--disable-default-text-reporter',
+                                       '--stats-sample-rate=0.2')
+        res.assert_outcomes(passed=50, failed=1)
+        assert_that(str(res.stdout)).contains('Assertion Done!')
+
+    def test_utilization_covers_all_tests(self):
+        self._pytester.makeconftest(
+            """
+            import logging
+            import pytest
+            from assertpy import assert_that
+            from tests.dummy_test_reporter import DummyTestReporter
+            class MyTestReporter(DummyTestReporter):
+                def report_session_finish(self, session_data):
+                    utilization = session_data.utilization
+                    assert_that(utilization['workers']).contains_only('master')
+                    assert_that(utilization['workers']['master']['tests']).is_equal_to(3)
+                    assert_that(utilization['makespan']).is_greater_than_or_equal_to(utilization['busy'])
+                    assert_that(utilization['ideal_makespan']).is_close_to(utilization['busy'], 1e-9)
+                    assert_that(utilization['throughput']).is_length(10)
+                    logging.info('Assertion Done!')
+
+            @pytest.hookimpl()
+            def pytest_stats_register_reporters(reporters):
+                reporters.register(MyTestReporter())
+        """)
+        self._pytester.makepyfile(
+            """
+            import time
+            def test_one():
+                time.sleep(0.01)
+            def test_two():
+                pass
+            def test_failing():
+                assert False
+            """
+        )
+        # the passing tests aren't reported - they're still counted
+        res = self._pytester.runpytest('--log-cli-level=INFO', '--disable-default-text-reporter',
+                                       '--stats-sample-rate=0.0', '--stats-sample-slow=10')
+        res.assert_outcomes(passed=2, failed=1)
+        assert_that(str(res.stdout)).contains('Assertion Done!')
+
+    def test_aggregated_utilization_covers_the_sampled_out_tests(self):
+        self._pytester.makeconftest(
+            """
+            import pytest
+            from assertpy import assert_that
+            from tests.dummy_test_reporter import DummyTestReporter
+            class MyTestReporter(DummyTestReporter):
+                def report_session_finish(self, session_data):
+                    controller = session_data.utilization['workers'].values()
+                    assert_that(sum(worker['tests'] for worker in controller)).is_equal_to(3)
+                    assert_that(session_data.utilization['busy']).is_greater_than_or_equal_to(0.15)
+                    print('Assertion Done!')
+
+            @pytest.hookimpl()
+            def pytest_stats_register_reporters(reporters):
+                reporters.register(MyTestReporter())
+            """)
+        self._pytester.makepyfile(
+            """
+            import time
+            def test_one():
+                time.sleep(0.05)
+            def test_two():
+                time.sleep(0.05)
+            def test_failing():
+                time.sleep(0.05)
+                assert False
+            """
+        )
+        # the workers only send the span of the passing tests
+        res = self._pytester.runpytest('-n', '2', '--stats-xdist-aggregate', '-s', '--stats-sample-rate=0.0',
+                                       '--stats-sample-slow=10')
+        res.assert_outcomes(passed=2, failed=1)
+        assert_that(str(res.stdout)).contains('Assertion Done!')
+
+    def test_aggregated_sampling_sums_up_the_workers(self):
+        self._pytester.makeconftest(
+            """
+            import pytest
+            from assertpy import assert_that
+            from tests.dummy_test_reporter import DummyTestReporter
+            class MyTestReporter(DummyTestReporter):
+                def report_session_finish(self, session_data):
+                    assert_that(session_data.sampling).contains_entry(
+                        {'detailed': 1}, {'summarized': 4}, {'outcomes': {'passed': 4}})
+                    assert_that(sum(session_data.sampling['histogram'].values())).is_equal_to(4)
+                    print('Assertion Done!')
+
+            @pytest.hookimpl()
+            def pytest_stats_register_reporters(reporters):
+                reporters.register(MyTestReporter())
+            """)
+        self._pytester.makepyfile(
+            """
+            import pytest
+            @pytest.mark.parametrize('x', range(4))
+            def test_param(x):
+                pass
+            def test_failing():
+                assert False
+            """
+        )
+        res = self._pytester.runpytest('-n', '2', '--stats-xdist-aggregate', '-s', '--stats-sample-rate=0.0')
+        res.assert_outcomes(passed=4, failed=1)
+        assert_that(str(res.stdout)).contains('Assertion Done!')
+
+    def test_resource_usage_is_sampled(self):
+        self._pytester.makeconftest(
+            """
+            import logging
+            import pytest
+            from assertpy import assert_that
+            from tests.dummy_test_reporter import DummyTestReporter
+            class MyTestReporter(DummyTestReporter):
+                def report_test(self, test_data):
+                    assert_that(test_data.cpu_user).is_greater_than(0)
+                    assert_that(test_data.cpu_system).is_not_none()
+                    assert_that(test_data.traced_memory_peak).is_greater_than(1_000_000)
+                    assert_that(test_data.gc_collections).is_greater_than_or_equal_to(1)
+                    assert_that(test_data.gc_pause).is_greater_than(0)
+                    logging.info('Assertion Done!')
+
+            @pytest.hookimpl()
+            def pytest_stats_register_reporters(reporters):
+                reporters.register(MyTestReporter())
+        """)
+        self._pytester.makepyfile(
+            """
+            import gc
+            def test_busy():
+                data = [bytearray(2_000_000)]
+                sum(range(1_000_000))
+                gc.collect()
+            """
+        )
+        res = self._pytester.runpytest('--log-cli-level=INFO', '--stats-resource-usage', '--stats-tracemalloc')
+        res.assert_outcomes(passed=1)
+        assert_that(str(res.stdout)).contains('Assertion Done!')
+
+    def test_resource_usage_reaches_the_xdist_controller(self):
+        self._pytester.makeconftest(
+            """
+            import pytest
+            from assertpy import assert_that
+            from tests.dummy_test_reporter import DummyTestReporter
+            class MyTestReporter(DummyTestReporter):
+                def report_test(self, test_data):
+                    assert_that(test_data.cpu_user).is_greater_than(0)
+                    assert_that(test_data.cpu_system).is_not_none()
+                    assert_that(test_data.peak_rss).is_greater_than(0)
+                    assert_that(test_data.gc_collections).is_greater_than_or_equal_to(1)
+                    print('Assertion Done!')
+
+            @pytest.hookimpl()
+            def pytest_stats_register_reporters(reporters):
+                reporters.register(MyTestReporter())
+        """)
+        self._pytester.makepyfile(
+            """
+            import gc
+            def test_busy():
+                sum(range(1_000_000))
+                gc.collect()
+            """
+        )
+        res = self._pytester.runpytest('-n', '2', '-s', '--stats-xdist-aggregate', '--stats-resource-usage')
+        res.assert_outcomes(passed=1)
+        assert_that(str(res.stdout)).contains('Assertion Done!')
+
+    def test_resource_usage_is_not_sampled_by_default(self):
+        self._pytester.makeconftest(
+            """
+            import logging
+            import pytest
+            from assertpy import assert_that
+            from tests.dummy_test_reporter import DummyTestReporter
+            class MyTestReporter(DummyTestReporter):
+                def report_test(self, test_data):
+                    assert_that(test_data.as_dict()).contains_entry({'cpu_user': None}, {'gc_collections': None})
+                    logging.info('Assertion Done!')
+
+            @pytest.hookimpl()
+            def pytest_stats_register_reporters(reporters):
+                reporters.register(MyTestReporter())
+        """)
+        self._pytester.makepyfile(
+            """
+            def test_passing():
+                pass
+            """
+        )
+        res = self._pytester.runpytest('--log-cli-level=INFO')
+        assert_that(str(res.stdout)).contains('Assertion Done!')
+
+    def test_items_with_the_same_marks_share_them(self):
+        self._pytester.makeconftest(
+            """
+            import logging
+            import pytest
+            from assertpy import assert_that
+            from tests.dummy_test_reporter import DummyTestReporter
+            class MyTestReporter(DummyTestReporter):
+                def __init__(self):
+                    self.marks = []
+                def report_test(self, test_data):
+                    self.marks.append(test_data.marks)
+                def report_session_finish(self, session_data):
+                    assert_that(self.marks[0]).is_equal_to({'class_mark', 'parametrize(x, range(0, 3))'})
+                    assert_that(self.marks[1]).is_same_as(self.marks[0])
+                    assert_that(self.marks[2]).is_same_as(self.marks[0])
+                    assert_that(self.marks[3]).is_equal_to({'class_mark'})
+                    logging.info('Assertion Done!')
+
+            @pytest.hookimpl()
+            def pytest_stats_register_reporters(reporters):
+                reporters.register(MyTestReporter())
+        """)
+        self._pytester.makepyfile(
+            """
+            import pytest
+            @pytest.mark.class_mark
+            class TestSomething:
+                @pytest.mark.parametrize('x', range(3))
+                def test_param(self, x):
+                    pass
+                def test_plain(self):
+                    pass
+            """
+        )
+        res = self._pytester.runpytest('--log-cli-level=INFO')
+        assert_that(str(res.stdout)).contains('Assertion Done!')
+
+    def test_reporters_are_built_once_and_timed(self):
+        self._pytester.makeconftest(
+            """
+            import logging
+            import pytest
+            from assertpy import assert_that
+            from tests.dummy_test_reporter import DummyTestReporter
+            class MyTestReporter(DummyTestReporter):
+                instances = 0
+                def __init__(self):
+                    MyTestReporter.instances += 1
+                def report_session_finish(self, session_data):
+                    assert_that(MyTestReporter.instances).is_equal_to(1)
+                    assert_that(session_data.reporter_stats['MyTestReporter']).contains_entry(
+                        {'calls': 4}, {'errors': 0}, {'detached': None})
+                    logging.info('Assertion Done!')
+
+            @pytest.hookimpl()
+            def pytest_stats_register_reporters(reporters):
+                reporters.register(MyTestReporter())
+        """)
+        self._pytester.makepyfile(
+            """
+            def test_one():
+                pass
+            def test_two():
+                pass
+            """
+        )
+        res = self._pytester.runpytest('--log-cli-level=INFO', '--disable-default-text-reporter')
+        assert_that(str(res.stdout)).contains('Assertion Done!')
+
+    def test_async_reporting_reports_all_tests_before_session_finish(self):
+        self._pytester.makeconftest(
+            """
+            import logging
+            import pytest
+            from assertpy import assert_that
+            from tests.dummy_test_reporter import DummyTestReporter
+            class MyTestReporter(DummyTestReporter):
+                def __init__(self):
+                    self.names = []
+
+                def report_test(self, test_data):
+                    self.names.append(test_data.name)
+
+                def report_session_finish(self, session_data):
+                    assert_that(self.names).contains_only('test_one', 'test_two', 'test_three')
+                    logging.info('Assertion Done!')
+
+            @pytest.hookimpl()
+            def pytest_stats_register_reporters(reporters:'ReportersRegistry'):
+                reporters.register(MyTestReporter())
+            """)
+        self._pytester.makepyfile(
+            """
+            def test_one():
+                pass
+            def test_two():
+                pass
+            def test_three():
+                pass
+            """
+        )
+        res = self._pytester.runpytest('--stats-async-reporting', '--stats-backpressure=spill', '--log-cli-level=INFO')
+        assert_that(str(res.stdout)).contains('Assertion Done!')
+
+    def test_batching_reporter_gets_all_tests_before_session_finish(self):
+        self._pytester.makeconftest(
+            """
+            import logging
+            import pytest
+            from assertpy import assert_that
+            from tests.dummy_test_reporter import DummyTestReporter
+            class MyTestReporter(DummyTestReporter):
+                def __init__(self):
+                    self.batch_sizes = []
+
+                def report_tests(self, batch):
+                    self.batch_sizes.append(len(batch))
+
+                def report_session_finish(self, session_data):
+                    assert_that(self.batch_sizes).is_equal_to([2, 1])
+                    logging.info('Assertion Done!')
+
+            @pytest.hookimpl()
+            def pytest_stats_register_reporters(reporters:'ReportersRegistry'):
+                reporters.register(MyTestReporter())
+            """)
+        self._pytester.makepyfile(
+            """
+            import pytest
+            @pytest.mark.parametrize('x', [1, 2, 3])
+            def test_param(x):
+                pass
+            """
+        )
+        res = self._pytester.runpytest('--stats-batch-size=2', '--log-cli-level=INFO')
+        assert_that(str(res.stdout)).contains('Assertion Done!')
+
+    def test_jsonl_reporter_writes_all_tests(self):
+        self._pytester.makepyfile(
+            """
+            def test_passing():
+                pass
+            def test_failing():
+                assert False
+            """
+        )
+        self._pytester.runpytest('--stats-jsonl=stats.jsonl', '--disable-default-text-reporter')
+        with open(self._pytester.path / 'stats.jsonl', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        collectors = [r for r in records if r['type'] == 'collector']
+        records = [r for r in records if r['type'] != 'collector']
+        with soft_assertions():
+            assert_that([r['nodeid'] for r in collectors]).contains('test_jsonl_reporter_writes_all_tests.py')
+            assert_that([r['type'] for r in records]) \
+                .is_equal_to(['session_start', 'test', 'failure', 'test', 'session_finish'])
+            assert_that(records[2]).contains_entry({'fail_msg': 'assert False'})
+            assert_that(records[3]).contains_entry({'name': 'test_failing'}).contains_entry({'result_call': 'failed'}) \
+                .contains_entry({'failure_digest': records[2]['digest']})
+            assert_that(records[4]).contains_entry({'status': 'TESTS_FAILED'})
+
+    def test_text_report_file_per_xdist_worker(self):
+        self._pytester.makepyfile(
+            """
+            import pytest
+            @pytest.mark.parametrize('x', range(6))
+            def test_param(x):
+                pass
+            """
+        )
+        res = self._pytester.runpytest('-n', '2', '--stats-text-report-mode=stream', '--stats-text-report-file=out.log',
+                                       '--stats-text-report-chunk=1')
+        assert_that(res.ret).is_equal_to(ExitCode.OK)
+        lines = [line for worker in ('gw0', 'gw1')
+                 for line in (self._pytester.path / f'out.{worker}.log').read_text(encoding='utf-8').splitlines()]
+        assert_that([line for line in lines if line.startswith('Test::')]).is_length(6)
+
+    def test_chrome_trace_has_the_test_spans(self):
+        self._pytester.makepyfile(
+            """
+            import pytest
+            @pytest.fixture
+            def resource():
+                yield
+            def test_passing(resource):
+                pass
+            """
+        )
+        res = self._pytester.runpytest('--stats-chrome-trace=trace.json', '--disable-default-text-reporter')
+        assert_that(res.ret).is_equal_to(ExitCode.OK)
+        with open(self._pytester.path / 'trace.json', encoding='utf-8') as f:
+            events = json.load(f)
+        assert_that([(e['cat'], e['name']) for e in events if e['ph'] == 'X']).contains_only(
+            ('test', 'test_passing'), ('phase', 'setup'), ('phase', 'call'), ('phase', 'teardown'),
+            ('fixture', 'resource'))
+
+    def test_sqlite_reporter_stores_all_tests(self):
+        self._pytester.makepyfile(
+            """
+            import pytest
+            @pytest.mark.parametrize('x', range(5))
+            def test_param(x):
+                pass
+            """
+        )
+        res = self._pytester.runpytest('--stats-sqlite=stats.db', '--stats-batch-size=2')
+        assert_that(res.ret).is_equal_to(ExitCode.OK)
+        with sqlite3.connect(self._pytester.path / 'stats.db') as connection:
+            assert_that(connection.execute('SELECT COUNT(*) FROM tests').fetchone()[0]).is_equal_to(5)
+            assert_that(connection.execute('SELECT status FROM sessions').fetchone()[0]).is_equal_to('OK')
+
+    def test_xdist_aggregate_reports_all_tests_from_the_controller(self):
+        pytest.importorskip('xdist')
+        self._pytester.makeconftest(
+            """
+            import os
+            import pytest
+            from assertpy import assert_that
+            from tests.dummy_test_reporter import DummyTestReporter
+            class MyTestReporter(DummyTestReporter):
+                def __init__(self):
+                    self.names = []
+
+                def report_test(self, test_data):
+                    self.names.append(test_data.name)
+                    assert_that(test_data.xdist_worker_id).starts_with('gw')
+
+                def report_session_finish(self, session_data):
+                    assert_that(self.names).contains_only('test_one', 'test_two', 'test_three', 'test_four')
+                    assert_that(session_data.workers).contains_only('gw0', 'gw1')
+                    assert_that(session_data.workers['gw0']).contains_entry({'status': 'OK'})
+                    print('Assertion Done!')
+
+            @pytest.hookimpl()
+            def pytest_stats_register_reporters(reporters:'ReportersRegistry'):
+                assert 'PYTEST_XDIST_WORKER' not in os.environ, 'reporters should only be created on the controller'
+                reporters.register(MyTestReporter())
+            """)
+        self._pytester.makepyfile(
+            """
+            def test_one():
+                pass
+            def test_two():
+                pass
+            def test_three():
+                pass
+            def test_four():
+                pass
+            """
+        )
+        res = self._pytester.runpytest('-n', '2', '--stats-xdist-aggregate', '-s')
+        assert_that(res.ret).is_equal_to(ExitCode.OK)
+        assert_that(str(res.stdout)).contains('Assertion Done!')
+
+    def test_stats_summary_prints_history_statistics(self):
+        self._pytester.makepyfile(
+            """
+            import time
+            def test_slow():
+                time.sleep(0.05)
+            def test_fast():
+                pass
+            """
+        )
+        for _ in range(2):
+            self._pytester.runpytest('--stats-sqlite=stats.db')
+        res = self._pytester.runpytest('--stats-summary=stats.db', '--stats-summary-top=1')
+        assert_that(res.ret).is_equal_to(ExitCode.OK)
+        assert_that(str(res.stdout)).contains('slowest tests by p90').contains('test_slow') \
+            .does_not_contain('test_fast')
+
+    def test_stats_summary_of_a_missing_history(self):
+        res = self._pytester.runpytest('--stats-summary=missing.db')
+        assert_that(res.ret).is_equal_to(ExitCode.USAGE_ERROR)
+        assert_that(str(res.stdout) + str(res.stderr)).contains('missing.db').does_not_contain('Traceback')
+
+    def test_tests_are_ordered_longest_first_by_history(self, monkeypatch):
+        self._pytester.makepyfile(
+            """
+            import os
+            import time
+            def test_fast():
+                pass
+            def test_slow():
+                time.sleep(0 if os.getenv('SECOND_RUN') else 0.1)
+            def test_medium():
+                time.sleep(0 if os.getenv('SECOND_RUN') else 0.05)
+            """
+        )
+        self._pytester.runpytest('--stats-sqlite=stats.db')
+        monkeypatch.setenv('SECOND_RUN', '1')
+        res = self._pytester.runpytest('--stats-order-by-duration=stats.db', '-v')
+        res.stdout.re_match_lines(['.*test_slow PASSED.*', '.*test_medium PASSED.*', '.*test_fast PASSED.*'])
+
+    def test_tests_are_not_reordered_without_history(self):
+        self._pytester.makepyfile(
+            """
+            def test_b():
+                pass
+            def test_a():
+                pass
+            """
+        )
+        res = self._pytester.runpytest('--stats-order-by-duration=missing.db', '-v')
+        res.stdout.re_match_lines(['.*test_b PASSED.*', '.*test_a PASSED.*'])
+
+    def test_lpt_xdist_groups(self):
+        pytest.importorskip('xdist')
+        self._pytester.makepyfile(
+            """
+            def test_a():
+                pass
+            def test_b():
+                pass
+            def test_c():
+                pass
+            """
+        )
+        self._pytester.runpytest('--stats-sqlite=stats.db')
+        res = self._pytester.runpytest('--stats-order-by-duration=stats.db', '--stats-xdist-lpt-groups',
+                                       '-n', '2', '--dist', 'loadgroup', '-v')
+        res.assert_outcomes(passed=3)
+        res.stdout.re_match_lines(['.*PASSED .*test_a@stats_lpt_[01] .*'])
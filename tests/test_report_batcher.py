@@ -0,0 +1,64 @@
+from unittest.mock import MagicMock
+
+from assertpy import assert_that
+
+from pytest_stats.report_batcher import ReportBatcher
+from pytest_stats.reporters_registry import ReportersRegistry
+from pytest_stats.test_item_data import TestItemData
+from tests.dummy_test_reporter import DummyTestReporter
+
+
+class BatchingReporter(DummyTestReporter):
+    def __init__(self):
+        self.batches = []
+
+    def report_tests(self, batch):
+        self.batches.append(list(batch))
+
+
+def test_batch_is_returned_when_full():
+    batcher = ReportBatcher(max_size=2)
+    reporter = MagicMock()
+    first, second = TestItemData(), TestItemData()
+    assert_that(batcher.add(reporter, first)).is_none()
+    assert_that(batcher.add(reporter, second)).is_equal_to([first, second])
+    assert_that(batcher.drain()).is_empty()
+
+
+def test_batch_is_returned_when_interval_elapsed():
+    now = [0.0]
+    batcher = ReportBatcher(max_size=100, max_interval=5.0, clock=lambda: now[0])
+    reporter = MagicMock()
+    batcher.add(reporter, TestItemData())
+    now[0] = 5.0
+    assert_that(batcher.add(reporter, TestItemData())).is_length(2)
+
+
+def test_drain_returns_partial_batches_per_reporter():
+    batcher = ReportBatcher(max_size=10)
+    reporter1, reporter2 = MagicMock(), MagicMock()
+    test_data = TestItemData()
+    batcher.add(reporter1, test_data)
+    batcher.add(reporter2, test_data)
+    assert_that(batcher.drain()).contains_only((reporter1, [test_data]), (reporter2, [test_data]))
+
+
+def test_only_reporters_overriding_report_tests_support_batches():
+    assert_that(BatchingReporter.supports_batches()).is_true()
+    assert_that(DummyTestReporter.supports_batches()).is_false()
+
+
+def test_registry_batches_tests_and_flushes_leftovers():
+    registry = ReportersRegistry()
+    batching_reporter = BatchingReporter()
+    per_item_reporter = MagicMock()
+    registry.register(batching_reporter)
+    registry.register(per_item_reporter)
+    registry.set_batch_window(max_size=2, max_interval=60)
+    tests = [TestItemData() for _ in range(3)]
+    for test_data in tests:
+        registry.report_test(test_data=test_data)
+    assert_that(batching_reporter.batches).is_equal_to([tests[:2]])
+    registry.flush()
+    assert_that(batching_reporter.batches).is_equal_to([tests[:2], tests[2:]])
+    assert_that(per_item_reporter.report_test.call_count).is_equal_to(3)
@@ -1,18 +1,21 @@
-from unittest.mock import MagicMock
+import time
+from unittest.mock import ANY, MagicMock
 
 import pytest
 from assertpy import assert_that
 
-from pytest_stats.reporters_registry import ReportersRegistry
+from pytest_stats.default_text_reporter import DefaultTextReporter
+from pytest_stats.reporters_registry import OPTIONAL_FIELDS, ReportersRegistry
 from pytest_stats.test_item_data import TestItemData
 from pytest_stats.test_session_data import TestSessionData
+from tests.dummy_test_reporter import DummyTestReporter
 
 
 def test_registering_a_reporter():
     registry = ReportersRegistry()
     mock_reporter = MagicMock()
     registry.register(reporter=mock_reporter)
-    assert_that(registry._reporters).is_equal_to({mock_reporter})
+    assert_that(registry.reporters).is_equal_to([mock_reporter])
 
 
 def test_report_session_start_doesnt_fail_when_there_are_no_registered_reporters():
@@ -39,6 +42,93 @@ def test_registry_calls_all_reporters(method, param_name, data_cls):
     getattr(mock_reporter2, method).assert_called_with(**{param_name: data})
 
 
+def test_optional_fields_are_collected_only_when_required():
+    class MarksReporter(DummyTestReporter):
+        required_fields = frozenset({'marks'})
+
+    registry = ReportersRegistry()
+    registry.register(MarksReporter())
+    assert_that([registry.collects(field) for field in OPTIONAL_FIELDS]).is_equal_to([True, False, False, False])
+    registry.register(DummyTestReporter())
+    assert_that([registry.collects(field) for field in OPTIONAL_FIELDS]).is_equal_to([True, True, True, True])
+
+
+def test_reporters_are_called_by_priority_then_registration_order():
+    calls = []
+    registry = ReportersRegistry()
+    for name, priority in (('first', 0), ('urgent', 10), ('second', 0)):
+        reporter = MagicMock()
+        reporter.report_session_start.side_effect = lambda session_data, name=name: calls.append(name)
+        registry.register(reporter, priority=priority)
+    registry.report_session_start(session_data=TestSessionData())
+    assert_that(calls).is_equal_to(['urgent', 'first', 'second'])
+
+
+def test_calls_to_a_reporter_are_serialized_across_dispatch_workers():
+    active, overlaps = [], []
+
+    def report_test(test_data):  # pylint:disable=unused-argument
+        active.append(1)
+        overlaps.append(len(active))
+        time.sleep(0.001)
+        active.pop()
+
+    reporter = MagicMock()
+    reporter.report_test.side_effect = report_test
+    registry = ReportersRegistry()
+    registry.register(reporter)
+    registry.enable_async_dispatch(workers=8)
+    for _ in range(200):
+        registry.report_test(test_data=TestItemData())
+    registry.flush()
+    assert_that(overlaps).is_length(200)
+    assert_that(max(overlaps)).is_equal_to(1)
+
+
+def test_default_text_reporter_keeps_every_test_with_dispatch_workers(tmp_path):
+    path = tmp_path / 'tests.txt'
+    reporter = DefaultTextReporter(stream=True, output_path=str(path), chunk_size=7)
+    registry = ReportersRegistry()
+    registry.register(reporter)
+    registry.enable_async_dispatch(workers=8)
+    registry.report_session_start(session_data=TestSessionData())
+    for i in range(2000):
+        test_data = TestItemData()
+        test_data.name = f'test_{i}'
+        test_data.set_step_status('call', 0.0, 0.0, 0.0, 'passed')
+        registry.report_test(test_data=test_data)
+    registry.flush()
+    registry.report_session_finish(session_data=TestSessionData())
+    assert_that(reporter._summary.tests).is_equal_to(2000)
+    assert_that(path.read_text(encoding='utf-8').splitlines()).is_length(2000)
+
+
+def test_failing_reporter_is_detached_after_max_failures():
+    registry = ReportersRegistry()
+    registry.set_circuit_breaker(max_failures=2, latency_budget=None)
+    failing, healthy = MagicMock(), MagicMock()
+    failing.report_test.side_effect = RuntimeError('boom')
+    registry.register(failing)
+    registry.register(healthy)
+    for _ in range(3):
+        registry.report_test(test_data=TestItemData())
+    assert_that(failing.report_test.call_count).is_equal_to(2)
+    assert_that(healthy.report_test.call_count).is_equal_to(3)
+    assert_that(registry.reporter_stats()).contains_entry(
+        {'MagicMock': {'calls': 2, 'total': ANY, 'max': ANY, 'errors': 2, 'detached': 'errors'}})
+
+
+def test_slow_reporter_is_detached_after_max_failures():
+    registry = ReportersRegistry()
+    registry.set_circuit_breaker(max_failures=1, latency_budget=0.0)
+    slow = MagicMock()
+    registry.register(slow)
+    registry.report_test(test_data=TestItemData())
+    registry.report_test(test_data=TestItemData())
+    assert_that(slow.report_test.call_count).is_equal_to(1)
+    assert_that(registry.reporter_stats()['MagicMock']).contains_entry({'detached': 'latency'}, {'errors': 0})
+
+
 def report_test_execution_status(self, test_data):
     for reporter in self._reporters:
         reporter.report_test_execution_status(test_data=test_data)
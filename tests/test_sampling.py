@@ -0,0 +1,53 @@
+from assertpy import assert_that
+
+from pytest_stats.sampling import Sampler, duration
+from pytest_stats.test_item_data import TestItemData
+
+
+def _test_data(fullname: str, outcome: str = 'passed', call_duration: float = 0.01, rerun_number: int = 0):
+    test_data = TestItemData()
+    test_data.fullname = fullname
+    test_data.rerun_number = rerun_number
+    test_data.set_step_status(when='setup', start=0.0, end=0.0, duration=0.0, outcome='passed')
+    test_data.set_step_status(when='call', start=0.0, end=call_duration, duration=call_duration, outcome=outcome)
+    return test_data
+
+
+def test_sample_is_stable_and_sized_by_the_rate():
+    names = [f'test_module.py::test_{i}' for i in range(2000)]
+    sampled = [name for name in names if Sampler(0.1, slow_threshold=1.0).sampled(name)]
+    assert_that(sampled).is_equal_to([name for name in names if Sampler(0.1, slow_threshold=1.0).sampled(name)])
+    assert_that(len(sampled)).is_between(150, 250)
+    assert_that([name for name in names if Sampler(0.0, slow_threshold=1.0).sampled(name)]).is_empty()
+
+
+def test_interesting_tests_are_always_kept():
+    sampler = Sampler(0.0, slow_threshold=1.0)
+    assert_that(sampler.keep(_test_data('a', outcome='failed'))).is_true()
+    assert_that(sampler.keep(_test_data('b', rerun_number=1))).is_true()
+    assert_that(sampler.keep(_test_data('c', call_duration=2.0))).is_true()
+    assert_that(sampler.keep(_test_data('d'))).is_false()
+
+
+def test_summarized_tests_are_counted_in_the_histogram():
+    sampler = Sampler(0.0, slow_threshold=1.0)
+    for test_data in (_test_data('a', call_duration=0.0015), _test_data('b', call_duration=0.0015),
+                      _test_data('c', call_duration=100.0)):
+        sampler.summarize(test_data)
+    assert_that(sampler.summary).contains_entry({'summarized': 3}, {'outcomes': {'passed': 3}})
+    assert_that(sampler.summary['duration']).is_close_to(100.003, 1e-9)
+    assert_that({key: count for (key, count) in sampler.summary['histogram'].items() if count}) \
+        .is_equal_to({'0.002': 2, '+Inf': 1})
+    assert_that(duration(_test_data('d', call_duration=0.5))).is_equal_to(0.5)
+
+
+def test_worker_summaries_are_merged():
+    worker, controller = Sampler(0.0, slow_threshold=1.0), Sampler(0.0, slow_threshold=1.0)
+    worker.summarize(_test_data('a', call_duration=0.0015))
+    worker.summarize(_test_data('b', outcome='skipped', call_duration=0.0015))
+    worker.summary['detailed'] += 1
+    controller.merge(worker.summary)
+    controller.merge(worker.summary)
+    assert_that(controller.summary).contains_entry({'detailed': 2}, {'summarized': 4},
+                                                   {'outcomes': {'passed': 2, 'skipped': 2}})
+    assert_that(controller.summary['histogram']['0.002']).is_equal_to(4)
@@ -0,0 +1,30 @@
+from assertpy import assert_that
+
+from pytest_stats.serialization import item_values, item_from_values, session_record
+from pytest_stats.test_item_data import TestItemData
+from pytest_stats.test_session_data import TestSessionData
+
+
+def test_item_values_round_trip():
+    test_data = TestItemData()
+    test_data.name = 'test1'
+    test_data.marks = {'b', 'a'}
+    test_data.xdist_worker_id = None
+    test_data.fail_msg = 'boom'
+    test_data.set_step_status(when='call', start=1.0, end=2.0, duration=1.0, outcome='failed')
+    test_data.foo = {'bar'}
+    rebuilt = item_from_values(item_values(test_data))
+    assert_that(rebuilt.as_dict()) \
+        .is_equal_to({**test_data.as_dict(), 'foo': ['bar'], 'stack_trace': None, 'failure_digest': None})
+    assert_that(hasattr(rebuilt, 'result_setup')).is_false()
+
+
+def test_session_record_keeps_env_data():
+    session_data = TestSessionData()
+    session_data.session_id = 'session_id'
+    session_data.wazoo = 'Test'
+    assert_that(session_record(session_data, 'session_start')) \
+        .contains_entry({'type': 'session_start'}) \
+        .contains_entry({'session_id': 'session_id'}) \
+        .contains_entry({'status': None}) \
+        .contains_entry({'wazoo': 'Test'})
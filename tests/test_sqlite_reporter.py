@@ -0,0 +1,130 @@
+import sqlite3
+
+import pytest
+from assertpy import assert_that
+
+from pytest_stats import history
+from pytest_stats.history import iter_history
+from pytest_stats.reporters_registry import ReportersRegistry
+from pytest_stats.sqlite_reporter import SqliteReporter
+from pytest_stats.test_item_data import TestItemData
+from pytest_stats.test_session_data import TestSessionData
+
+
+def _session_data(session_id: str) -> TestSessionData:
+    session_data = TestSessionData()
+    session_data.session_id = session_id
+    session_data.xdist_worker_id = None
+    session_data.start_time = 100.0
+    session_data.wazoo = 'Test'
+    return session_data
+
+
+def _test_data(name: str, fail_msg=None) -> TestItemData:
+    test_data = TestItemData()
+    test_data.name = name
+    test_data.fullname = f'test_module.py::{name}'
+    test_data.id = f'{test_data.fullname}-0'
+    test_data.session_id = 'session1'
+    test_data.marks = {'slow', 'smoke'}
+    test_data.fail_msg = fail_msg
+    test_data.stack_trace = 'trace' if fail_msg else None
+    test_data.set_step_status(when='call', start=1.0, end=3.0, duration=2.0, outcome='failed' if fail_msg else 'passed')
+    return test_data
+
+
+def _run_session(path: str, session_id: str, tests) -> None:
+    registry = ReportersRegistry()
+    registry.register(SqliteReporter(path))
+    registry.set_batch_window(max_size=2, max_interval=60)
+    session_data = _session_data(session_id)
+    registry.report_session_start(session_data=session_data)
+    for test_data in tests:
+        registry.report_test(test_data=test_data)
+    registry.flush()
+    session_data.status = 'OK'
+    session_data.end_time = 200.0
+    registry.report_session_finish(session_data=session_data)
+
+
+def test_session_and_tests_are_stored(tmp_path):
+    path = str(tmp_path / 'stats.db')
+    _run_session(path, 'session1', [_test_data('test1'), _test_data('test2', 'boom'), _test_data('test3')])
+    with sqlite3.connect(path) as connection:
+        assert_that(connection.execute('SELECT session_id, status, end_time, env FROM sessions').fetchall()) \
+            .is_equal_to([('session1', 'OK', 200.0, '{"wazoo": "Test"}')])
+        assert_that(connection.execute('SELECT fullname, test_duration_call, session_start FROM tests').fetchall()) \
+            .is_equal_to([('test_module.py::test1', 2.0, 100.0), ('test_module.py::test2', 2.0, 100.0),
+                          ('test_module.py::test3', 2.0, 100.0)])
+        assert_that(connection.execute('SELECT COUNT(*) FROM marks').fetchone()[0]).is_equal_to(6)
+        assert_that(connection.execute(
+            'SELECT t.name, f.fail_msg FROM failures f JOIN tests t ON t.id = f.test_ref').fetchall()) \
+            .is_equal_to([('test2', 'boom')])
+        assert_that(connection.execute('PRAGMA journal_mode').fetchone()[0]).is_equal_to('wal')
+
+
+def test_failure_texts_are_stored_once(tmp_path):
+    path = str(tmp_path / 'stats.db')
+    _run_session(path, 'session1', [_test_data('test1', 'boom'), _test_data('test2', 'boom'), _test_data('test3')])
+    with sqlite3.connect(path) as connection:
+        assert_that(connection.execute('SELECT fail_msg, stack_trace FROM failure_texts').fetchall()) \
+            .is_equal_to([('boom', 'trace')])
+        assert_that(connection.execute(
+            'SELECT COUNT(*), COUNT(DISTINCT f.digest) FROM failures f JOIN failure_texts t ON t.digest = f.digest'
+        ).fetchone()).is_equal_to((2, 1))
+
+
+def test_history_is_appended_across_sessions(tmp_path):
+    path = str(tmp_path / 'stats.db')
+    _run_session(path, 'session1', [_test_data('test1')])
+    _run_session(path, 'session2', [_test_data('test1')])
+    with sqlite3.connect(path) as connection:
+        assert_that(connection.execute('SELECT COUNT(*) FROM sessions').fetchone()[0]).is_equal_to(2)
+        assert_that(connection.execute(
+            "SELECT COUNT(*) FROM tests WHERE fullname = 'test_module.py::test1'").fetchone()[0]).is_equal_to(2)
+        plan = connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM tests WHERE fullname = 'x' ORDER BY session_start").fetchall()
+        assert_that(str(plan)).contains('tests_fullname_session_start')
+
+
+def test_fixture_timings_are_stored(tmp_path):
+    path = str(tmp_path / 'stats.db')
+    test_data = _test_data('test1')
+    test_data.fixtures = [
+        {'name': 'db', 'scope': 'session', 'phase': 'setup', 'start': 1.0, 'duration': 0.5, 'cached': False},
+        {'name': 'db', 'scope': 'session', 'phase': 'teardown', 'start': 4.0, 'duration': 0.1, 'cached': False},
+    ]
+    _run_session(path, 'session1', [test_data])
+    with sqlite3.connect(path) as connection:
+        assert_that(connection.execute('SELECT name, scope, phase, duration, cached FROM fixtures').fetchall()) \
+            .is_equal_to([('db', 'session', 'setup', 0.5, 0), ('db', 'session', 'teardown', 0.1, 0)])
+
+
+def test_missing_columns_are_added_to_older_databases(tmp_path):
+    path = str(tmp_path / 'stats.db')
+    with sqlite3.connect(path) as connection:
+        connection.execute('CREATE TABLE tests (id INTEGER PRIMARY KEY, session_ref INTEGER, session_id TEXT, '
+                           'session_start REAL, test_id TEXT, fullname TEXT)')
+        connection.execute('CREATE TABLE failures (test_ref INTEGER, fail_msg TEXT, stack_trace TEXT)')
+    test_data = _test_data('test1')
+    test_data.cpu_user = 0.25
+    _run_session(path, 'session1', [test_data])
+    with sqlite3.connect(path) as connection:
+        assert_that(connection.execute('SELECT fullname, cpu_user FROM tests').fetchall()) \
+            .is_equal_to([('test_module.py::test1', 0.25)])
+
+
+def test_history_reader_closes_the_connection(tmp_path, monkeypatch):
+    path = str(tmp_path / 'stats.db')
+    _run_session(path, 'session1', [_test_data('test1')])
+    connections = []
+    sqlite_connect = sqlite3.connect
+
+    def connect(*args, **kwargs):
+        connections.append(sqlite_connect(*args, **kwargs))
+        return connections[-1]
+
+    monkeypatch.setattr(history.sqlite3, 'connect', connect)
+    assert_that(list(iter_history(path))).extracting('fullname').is_equal_to(['test_module.py::test1'])
+    with pytest.raises(sqlite3.ProgrammingError):
+        connections[0].execute('SELECT 1')
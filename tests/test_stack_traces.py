@@ -0,0 +1,57 @@
+import pytest
+from _pytest._code import ExceptionInfo
+from assertpy import assert_that
+
+from pytest_stats.stack_traces import StackTrace, capture_stack_trace, truncate
+from pytest_stats.test_item_data import TestItemData
+
+
+def _inner():
+    raise ValueError('boom')
+
+
+def _outer():
+    _inner()
+
+
+def _excinfo() -> ExceptionInfo:
+    with pytest.raises(ValueError) as excinfo:
+        _outer()
+    return excinfo
+
+
+def test_truncate():
+    assert_that(truncate('abcdef', 0)).is_equal_to('abcdef')
+    assert_that(truncate('abcdef', 6)).is_equal_to('abcdef')
+    assert_that(truncate('abcdef', 2)).is_equal_to('ab... [4 characters truncated]')
+
+
+def test_frames_are_rendered_once():
+    stack_trace = capture_stack_trace(_excinfo())
+    assert_that([name for (_, _, name) in stack_trace.frames]).is_equal_to(['_excinfo', '_outer', '_inner'])
+    text = stack_trace.render()
+    assert_that(text).contains('in _inner\n', "raise ValueError('boom')")
+    assert_that(stack_trace.render()).is_same_as(text)
+
+
+def test_max_depth_keeps_the_innermost_frames():
+    stack_trace = capture_stack_trace(_excinfo(), max_depth=2, max_size=10)
+    assert_that([name for (_, _, name) in stack_trace.frames]).is_equal_to(['_outer', '_inner'])
+    assert_that(stack_trace.render()).ends_with('characters truncated]')
+
+
+def test_stack_trace_is_rendered_when_read():
+    test_data = TestItemData()
+    test_data.set_failure(_excinfo())
+    assert_that(test_data.fail_msg).is_equal_to('boom')
+    assert_that(test_data.stack_trace_source).is_instance_of(StackTrace)
+    assert_that(test_data.stack_trace).contains('in _inner')
+    assert_that(test_data.stack_trace_source).is_same_as(test_data.stack_trace)
+    assert_that(test_data.as_dict()).contains_key('stack_trace')
+
+
+def test_stack_trace_is_not_collected_when_not_required():
+    test_data = TestItemData()
+    test_data.set_failure(_excinfo(), with_stack_trace=False)
+    assert_that(test_data.stack_trace_source).is_none()
+    assert_that(hasattr(test_data, 'stack_trace')).is_false()
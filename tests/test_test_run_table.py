@@ -0,0 +1,142 @@
+import math
+import pickle
+import tracemalloc
+from copy import copy
+
+from assertpy import assert_that
+
+from pytest_stats.serialization import item_values
+from pytest_stats.stack_traces import StackTrace
+from pytest_stats.test_item_data import TestItemData
+from pytest_stats.test_run_table import TestRunTable
+
+
+def _test_data(name: str, duration: float = 0.5) -> TestItemData:
+    test_data = TestItemData()
+    test_data.name = name
+    test_data.fullname = f'test_module.py::{name}'
+    test_data.id = f'{test_data.fullname}-0'
+    test_data.rerun_number = 0
+    test_data.xdist_worker_id = None
+    test_data.marks = {'slow', 'mark_with(a=1)'}
+    test_data.fail_msg = None
+    test_data.stack_trace = None
+    test_data.test_output = 'chatty output'
+    test_data.set_step_status(when='call', start=1.0, end=1.0 + duration, duration=duration, outcome='passed')
+    return test_data
+
+
+def test_item_data_keeps_custom_attributes_without_an_instance_dict():
+    test_data = _test_data('test1')
+    assert_that(test_data.custom_fields).is_empty()
+    test_data.foo = 'bar'
+    assert_that(test_data.foo).is_equal_to('bar')
+    assert_that(test_data.as_dict()).contains_entry({'foo': 'bar'}).contains_entry({'name': 'test1'})
+    assert_that(hasattr(test_data, '__dict__')).is_false()
+    clone = copy(test_data)
+    clone.foo = 'baz'
+    assert_that(clone.as_dict()).contains_entry({'foo': 'baz'}).contains_entry({'name': 'test1'})
+    assert_that(test_data.foo).is_equal_to('bar')
+    del test_data.foo
+    assert_that(test_data.custom_fields).is_empty()
+
+
+def test_item_data_is_smaller_than_a_dict_based_record():
+    class DictRecord:  # the TestItemData of version 1.x
+        pass
+
+    fields = _test_data('test1').as_dict()
+
+    def allocated(make):
+        tracemalloc.start()
+        try:
+            records = [make() for _ in range(1000)]
+            for record in records:
+                for field, value in fields.items():
+                    setattr(record, field, value)
+                if isinstance(record, TestItemData):
+                    # reading every field must not build an instance dict
+                    record.as_dict()
+                    item_values(record)
+            return tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+    assert_that(allocated(TestItemData)).is_less_than(allocated(DictRecord) * 0.7)
+
+
+def test_item_data_can_be_pickled():
+    test_data = _test_data('test1')
+    test_data.foo = 'bar'
+    assert_that(pickle.loads(pickle.dumps(test_data)).as_dict()).is_equal_to(test_data.as_dict())
+
+
+def test_rows_are_rebuilt_from_columns():
+    table = TestRunTable()
+    test_data = _test_data('test1')
+    table.append(test_data)
+    expected = test_data.as_dict()
+    expected.pop('test_output')
+    assert_that(table.row(0).as_dict()).is_equal_to(expected)
+
+
+def test_rows_are_indexed_by_id():
+    table = TestRunTable()
+    for name in ['test1', 'test2']:
+        table.append(_test_data(name))
+    assert_that(table.get('test_module.py::test2-0')).has_name('test2')
+    assert_that(table.index_of('test_module.py::test1-0')).is_equal_to(0)
+    assert_that(table.get('missing')).is_none()
+    assert_that(len(table)).is_equal_to(2)
+
+
+def test_durations_are_stored_in_float_columns():
+    table = TestRunTable()
+    table.append(_test_data('test1', duration=2.0))
+    table.append(_test_data('test2', duration=3.0))
+    assert_that(list(table.column('test_duration_call'))).is_equal_to([2.0, 3.0])
+    assert_that(math.isnan(table.column('test_duration_setup')[0])).is_true()
+
+
+def test_equal_mark_sets_and_strings_are_shared():
+    table = TestRunTable()
+    table.append(_test_data('test1'))
+    table.append(_test_data('test2'))
+    assert_that(table.marks(0)).is_same_as(table.marks(1))
+    assert_that(table.column('result_call')[0]).is_same_as(table.column('result_call')[1])
+
+
+def test_output_is_kept_only_when_asked_for():
+    table = TestRunTable(keep_output=True)
+    table.append(_test_data('test1'))
+    assert_that(table.row(0)).has_test_output('chatty output')
+
+
+def test_unset_fields_stay_unset():
+    table = TestRunTable()
+    test_data = TestItemData()
+    test_data.name = 'test1'
+    test_data.xdist_worker_id = None
+    table.append(test_data)
+    assert_that(table.row(0).as_dict()).is_equal_to(test_data.as_dict())
+    assert_that(table.marks(0)).is_empty()
+
+
+def test_rows_keep_every_field():
+    table = TestRunTable(keep_output=True)
+    test_data = _test_data('test1')
+    test_data.failure_digest = 'abc123'
+    test_data.fixtures = [{'name': 'tmp_path', 'setup': 0.1}]
+    test_data.cpu_user, test_data.rss_delta, test_data.gc_collections = 1.5, -4096, 2
+    test_data.foo = 'bar'
+    test_data.set_stack_trace(StackTrace((('test_module.py', 3, 'test1'),)))
+    test_data.set_output([('Captured stdout call', 'chatty output')])
+    table.append(test_data)
+    # appending doesn't render the stack trace
+    assert_that(test_data.stack_trace_source).is_instance_of(StackTrace)
+    row = table.row(0)
+    assert_that(row.stack_trace_source).is_instance_of(StackTrace)
+    assert_that(row.output_sections).is_equal_to(test_data.output_sections)
+    assert_that(row.as_dict()).is_equal_to(test_data.as_dict())
+    assert_that(row.rss_delta).is_instance_of(int)
+    assert_that(row.cpu_system).is_none()
@@ -0,0 +1,36 @@
+from assertpy import assert_that
+
+from pytest_stats.test_item_data import TestItemData
+from pytest_stats.utilization import Utilization, format_utilization
+
+
+def _test_data(worker_id, start, end):
+    test_data = TestItemData()
+    test_data.xdist_worker_id = worker_id
+    test_data.test_start_protocol, test_data.test_end_protocol = start, end
+    return test_data
+
+
+def test_busy_idle_and_tail_per_worker():
+    tracker = Utilization()
+    for worker_id, start, end in [('gw0', 0.0, 6.0), ('gw0', 6.0, 10.0), ('gw1', 0.0, 2.0), ('gw1', 3.0, 4.0)]:
+        tracker.add(_test_data(worker_id, start, end))
+    summary = tracker.summary()
+    assert_that(summary).contains_entry({'makespan': 10.0}, {'busy': 13.0}, {'idle': 7.0}, {'tail': 6.0},
+                                        {'utilization': 0.65}, {'throughput_window': 1.0})
+    assert_that(summary['workers']['gw1']).is_equal_to(
+        {'tests': 2, 'busy': 3.0, 'idle': 7.0, 'tail': 6.0, 'utilization': 0.3})
+    assert_that(summary['throughput']).is_equal_to([0.0, 0.0, 1.0, 0.0, 1.0, 0.0, 1.0, 0.0, 0.0, 1.0])
+    # the 6s test on one worker, the others on the other
+    assert_that(summary['ideal_makespan']).is_equal_to(7.0)
+
+
+def test_tests_without_a_protocol_are_skipped():
+    tracker = Utilization()
+    assert_that(tracker.summary()).is_none()
+    tracker.add(TestItemData())
+    tracker.add(_test_data(None, 1.0, 1.0))
+    summary = tracker.summary()
+    assert_that(summary).contains_entry({'makespan': 0.0}, {'utilization': 1.0}, {'throughput': []})
+    assert_that(summary['workers']).contains_key('master')
+    assert_that(format_utilization(summary)).contains('makespan: 0.000s (ideal: 0.000s)', 'master: 1 tests')